@@ -12,7 +12,9 @@ The pipeline supports:
 """
 import os
 import sys
+import atexit
 import logging
+import logging.handlers
 import argparse
 from datetime import datetime
 from pathlib import Path
@@ -21,7 +23,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from download_models_data import download_models_data, download_historical_models_data
-from download_hf_profiles import download_hf_profiles
+from download_hf_profiles import download_hf_profiles, DEFAULT_CONCURRENCY, DEFAULT_RPM
+from scrape_hf_profile import DEFAULT_CACHE_DIR
 from clean_models_data import clean_models_parquet, process_historical_data
 from clean_hf_profiles import clean_hf_profiles
 
@@ -30,6 +33,9 @@ def setup_logging(log_dir=None, mode="pipeline"):
     """
     Configure logging to both file and console.
 
+    File output is buffered and written in batches of up to 1024 records, or
+    immediately when an error is logged.
+
     Args:
         log_dir: Directory to save log file (optional)
         mode: Mode name for log file naming
@@ -57,7 +63,15 @@ def setup_logging(log_dir=None, mode="pipeline"):
 
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+        # Buffer file writes and flush in batches (immediately on errors)
+        memory_handler = logging.handlers.MemoryHandler(
+            capacity=1024,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        )
+        logger.addHandler(memory_handler)
+        atexit.register(memory_handler.flush)
 
         logging.info("="*60)
         logging.info(f"Pipeline execution started - {mode.upper()} mode")
@@ -65,7 +79,8 @@ def setup_logging(log_dir=None, mode="pipeline"):
         logging.info("="*60)
 
 
-def run_download(project_root, historical=False, top_n=1000):
+def run_download(project_root, historical=False, top_n=1000, concurrency=DEFAULT_CONCURRENCY, rpm=DEFAULT_RPM,
+                 use_cache=True, max_age=None):
     """
     Run download mode to fetch data from HuggingFace.
 
@@ -73,6 +88,10 @@ def run_download(project_root, historical=False, top_n=1000):
         project_root: Root directory of the project
         historical: If True, download historical model data
         top_n: Number of top profiles to scrape (default: 1000)
+        concurrency: Maximum number of concurrent profile requests (default: 16)
+        rpm: Profile requests per minute (default: 120)
+        use_cache: If True, reuse profile pages cached on disk by earlier runs
+        max_age: Maximum age of cached profile pages in hours (default: never expire)
     """
     raw_data_dir = project_root / 'data' / 'raw'
     log_dir = raw_data_dir / 'logs'
@@ -115,7 +134,11 @@ def run_download(project_root, historical=False, top_n=1000):
             parquet_path=models_parquet_path,
             output_dir=raw_data_dir,
             top_n=top_n,
-            delay=0.5
+            delay=0.5,
+            concurrency=concurrency,
+            rpm=rpm,
+            cache_dir=DEFAULT_CACHE_DIR if use_cache else None,
+            max_age=max_age * 3600 if max_age is not None else None
         )
 
         logging.info("="*60)
@@ -131,6 +154,20 @@ def run_download(project_root, historical=False, top_n=1000):
         sys.exit(1)
 
 
+def _scan(directory, prefix, suffix):
+    """
+    List files in a directory whose names start with prefix and end with suffix.
+
+    Uses os.scandir, which gets file types from the directory listing itself
+    instead of building and stat-ing a Path for every entry.
+    """
+    with os.scandir(directory) as entries:
+        return [
+            Path(entry.path) for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith(suffix) and entry.is_file()
+        ]
+
+
 def check_required_data(raw_data_dir):
     """
     Check for required data files and provide helpful error messages.
@@ -157,7 +194,7 @@ def check_required_data(raw_data_dir):
     historical_dir = raw_data_dir / 'historical'
     has_historical = False
     if historical_dir.exists():
-        historical_files = list(historical_dir.glob('models-*.parquet'))
+        historical_files = _scan(historical_dir, 'models-', '.parquet')
         if historical_files:
             has_historical = True
         else:
@@ -172,7 +209,7 @@ def check_required_data(raw_data_dir):
         )
 
     # Check for profile data
-    profile_files = list(raw_data_dir.glob('profiles_top*.jsonl'))
+    profile_files = _scan(raw_data_dir, 'profiles_top', '.jsonl') if raw_data_dir.exists() else []
     if not profile_files:
         errors.append(
             f"Missing: Profile data (profiles_top*.jsonl)\n"
@@ -247,7 +284,7 @@ def run_clean(project_root):
             logging.info("-" * 60)
 
             author_output = output_dir / 'author_daily_downloads.parquet'
-            model_output = output_dir / 'daily_model_downloads.parquet'
+            model_output = output_dir / 'daily_model_downloads'
 
             process_historical_data(
                 data_paths['historical_dir'],
@@ -267,7 +304,7 @@ def run_clean(project_root):
             output_dir=output_dir
         )
 
-        logging.info(f"Created {len(created_files)} CSV files:")
+        logging.info(f"Created {len(created_files)} Parquet files:")
         for file in created_files:
             logging.info(f"  - {file.name}")
 
@@ -308,6 +345,9 @@ Examples:
   # Download top 500 profiles
   python run.py --download --top-n 500
 
+  # Download profiles with 32 concurrent requests
+  python run.py --download --concurrency 32
+
   # Clean downloaded data (default mode)
   python run.py --clean
 
@@ -341,6 +381,28 @@ Examples:
         default=1000,
         help='Number of top profiles to scrape (default: 1000, only with --download)'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Maximum number of concurrent profile requests (default: {DEFAULT_CONCURRENCY}, only with --download)'
+    )
+    parser.add_argument(
+        '--rpm',
+        type=float,
+        default=DEFAULT_RPM,
+        help=f'Profile requests per minute (default: {DEFAULT_RPM}, only with --download)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Refetch all profile pages instead of using the on-disk cache (only with --download)'
+    )
+    parser.add_argument(
+        '--max-age',
+        type=float,
+        help='Refetch cached profile pages older than this many hours (only with --download)'
+    )
 
     args = parser.parse_args()
 
@@ -357,7 +419,9 @@ Examples:
 
     # Execute appropriate mode
     if args.download:
-        run_download(project_root, historical=args.historical, top_n=args.top_n)
+        run_download(project_root, historical=args.historical, top_n=args.top_n,
+                     concurrency=args.concurrency, rpm=args.rpm,
+                     use_cache=not args.no_cache, max_age=args.max_age)
     elif args.clean:
         run_clean(project_root)
 
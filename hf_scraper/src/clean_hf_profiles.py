@@ -1,100 +1,338 @@
 #!/usr/bin/env python3
 """
-Script to parse HuggingFace profile data and export to CSV files.
+Script to parse HuggingFace profile data and export to Parquet files.
 
-This script processes HuggingFace profile JSON data and creates three CSV files:
-1. hf_profiles.csv - Master list with basic profile info
-2. hf_orgs.csv - Detailed organization data
-3. hf_users.csv - Detailed user data
+This script processes HuggingFace profile JSON data and creates four Parquet files
+(compressed with ZSTD):
+1. hf_profiles.parquet - Master list with basic profile info
+2. hf_orgs.parquet - Detailed organization data
+3. hf_users.parquet - Detailed user data
+4. hf_org_members.parquet - User-organization memberships
+
+Each input file's rows are streamed to the outputs with one ParquetWriter per
+file as soon as the file has been parsed, in row groups of up to BATCH_SIZE rows.
+
+JSONL files are parsed with pyarrow's JSON reader and flattened with Arrow
+compute kernels; the per-record Python parser is kept as a fallback for JSON
+arrays, single objects, and files with malformed records.
 """
 
+import os
 import json
-import csv
+import logging
 import argparse
-import sys
+import itertools
+import mmap
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Dict, Any, Optional
-
-
-def safe_get(data: Dict[str, Any], *keys, default=None) -> Any:
-    """Safely navigate nested dictionary keys."""
-    result = data
-    for key in keys:
-        if isinstance(result, dict):
-            result = result.get(key)
-        else:
-            return default
-        if result is None:
-            return default
-    return result
-
-
-def determine_profile_type(profile_data: Dict[str, Any]) -> str:
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as paj
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# orjson is much faster than the stdlib parser; fall back if it isn't installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+# Output schemas (one per Parquet file)
+PROFILE_SCHEMA = pa.schema([
+    ("profile_name", pa.string()),
+    ("hf_type", pa.string()),
+])
+
+ORG_SCHEMA = pa.schema([
+    ("profile_name", pa.string()),
+    ("Type", pa.string()),
+    ("isVerified", pa.bool_()),
+    ("type", pa.string()),
+    ("fullname", pa.string()),
+    ("name", pa.string()),
+    ("isHf", pa.bool_()),
+    ("details", pa.string()),
+    ("isEnterprise", pa.bool_()),
+    ("plan", pa.string()),
+    ("has_org_card", pa.bool_()),
+    ("followerCount", pa.int64()),
+    ("userCount", pa.int64()),
+    ("numDatasets", pa.int64()),
+    ("numModels", pa.int64()),
+    ("numSpaces", pa.int64()),
+    ("numPapers", pa.int64()),
+    ("orgEmailDomain", pa.string()),
+    ("org_display_name", pa.string()),
+    ("tags", pa.string()),
+    ("links", pa.string()),
+])
+
+USER_SCHEMA = pa.schema([
+    ("profile_name", pa.string()),
+    ("type", pa.string()),
+    ("isPro", pa.bool_()),
+    ("isHf", pa.bool_()),
+    ("isMod", pa.bool_()),
+    ("fullname", pa.string()),
+    ("profile_details", pa.string()),
+    ("homepage", pa.string()),
+    ("github", pa.string()),
+    ("bluesky", pa.string()),
+    ("linkedin", pa.string()),
+    ("twitter", pa.string()),
+    ("numOrgs", pa.int64()),
+    ("totalBlogPosts", pa.int64()),
+    ("communityScore", pa.int64()),
+    ("numberLikes", pa.int64()),
+    ("totalPosts", pa.int64()),
+    ("upvotes", pa.int64()),
+    ("numFollowers", pa.int64()),
+    ("numFollowingUsers", pa.int64()),
+    ("numFollowingOrgs", pa.int64()),
+    ("numModels", pa.int64()),
+    ("numDatasets", pa.int64()),
+    ("numSpaces", pa.int64()),
+    ("has_hardware_items", pa.bool_()),
+])
+
+MEMBER_SCHEMA = pa.schema([
+    ("name_user", pa.string()),
+    ("name_org", pa.string()),
+    ("userRole", pa.string()),
+])
+
+# Output column order, and the source fields each output copies verbatim
+# (data.org / data.u / data.u.signup / data), shared by both parsers
+_ORG_COLUMNS = tuple(ORG_SCHEMA.names)
+_USER_COLUMNS = tuple(USER_SCHEMA.names)
+
+_ORG_FIELDS = ("type", "fullname", "name", "isHf", "details", "isEnterprise", "plan")
+_ORG_DATA_FIELDS = ("followerCount", "userCount", "numDatasets", "numModels", "numSpaces",
+                    "numPapers", "orgEmailDomain")
+_USER_FIELDS = ("type", "isPro", "isHf", "isMod", "fullname")
+_SIGNUP_FIELDS = ("homepage", "github", "bluesky", "linkedin", "twitter")
+_USER_DATA_FIELDS = ("totalBlogPosts", "communityScore", "numberLikes", "totalPosts", "upvotes",
+                     "numFollowers", "numFollowingUsers", "numFollowingOrgs", "numModels",
+                     "numDatasets", "numSpaces")
+
+
+def _compile_row_appender(name: str, columns: tuple, sources: Dict[str, Dict[str, str]],
+                          computed: tuple):
     """
-    Determine if a profile is an organization, user, or unknown.
-
-    Returns:
-        - "org" if data.org field is present
-        - "user" if data.u field is present
-        - "unknown" if neither present
-        - "assumptions broken" if both present
+    Generate a factory for a function that appends one row to per-column lists.
+
+    Each column is either copied from a source dict (`sources` maps an argument
+    name to {column: source field}) or passed in by the caller (`computed`, one
+    argument per column, after the source dicts). The code is compiled once at
+    import; calling the factory with one list per column (in `columns` order)
+    binds each list's append method, so adding a row is a single call with no
+    per-field Python-level dispatch and no intermediate row object.
     """
-    has_org = safe_get(profile_data, "data", "org") is not None
-    has_user = safe_get(profile_data, "data", "u") is not None
-
-    if has_org and has_user:
-        return "assumptions broken"
-    elif has_org:
-        return "org"
-    elif has_user:
-        return "user"
-    else:
-        return "unknown"
-
+    expressions = {column: column for column in computed}
+    for arg, fields in sources.items():
+        for column, field in fields.items():
+            expressions[column] = f"{arg}_get({field!r})"
+
+    missing = set(columns) - set(expressions)
+    extra = set(expressions) - set(columns)
+    if missing or extra:
+        raise ValueError(f"{name}: unmapped columns {sorted(missing)}, unknown columns {sorted(extra)}")
+
+    appends = ", ".join(f"append_{i}" for i in range(len(columns)))
+    args = ", ".join([*sources, *computed])
+    getters = "".join(f"        {arg}_get = {arg}.get\n" for arg in sources)
+    values = "".join(f"        append_{i}({expressions[column]})\n" for i, column in enumerate(columns))
+    source = (
+        f"def make_{name}(column_lists):\n"
+        f"    {appends}, = [column.append for column in column_lists]\n"
+        f"    def {name}({args}):\n{getters}{values}"
+        f"    return {name}\n"
+    )
 
-def determine_org_type(tag_texts: list) -> str:
+    namespace = {}
+    exec(compile(source, f"<{name}>", "exec"), namespace)
+    return namespace[f"make_{name}"]
+
+
+# Row appender factories for the Python parser, one per output (see new_row_appenders)
+_ROW_APPENDERS = {
+    "profiles": _compile_row_appender(
+        "append_profile",
+        tuple(PROFILE_SCHEMA.names),
+        sources={},
+        computed=("profile_name", "hf_type"),
+    ),
+    "orgs": _compile_row_appender(
+        "append_org",
+        _ORG_COLUMNS,
+        sources={
+            "org": {field: field for field in _ORG_FIELDS},
+            "data": {field: field for field in _ORG_DATA_FIELDS},
+            "header_metadata": {"org_display_name": "org_display_name"},
+        },
+        computed=("profile_name", "Type", "isVerified", "has_org_card", "tags", "links"),
+    ),
+    "users": _compile_row_appender(
+        "append_user",
+        _USER_COLUMNS,
+        sources={
+            "user": {field: field for field in _USER_FIELDS},
+            "signup": {"profile_details": "details", **{field: field for field in _SIGNUP_FIELDS}},
+            "data": {field: field for field in _USER_DATA_FIELDS},
+        },
+        computed=("profile_name", "numOrgs", "has_hardware_items"),
+    ),
+    "members": _compile_row_appender(
+        "append_member",
+        tuple(MEMBER_SCHEMA.names),
+        sources={},
+        computed=("name_user", "name_org", "userRole"),
+    ),
+}
+
+# Integer counts under data (for either profile type)
+_COUNT_FIELDS = ("followerCount", "userCount", "numDatasets", "numModels", "numSpaces", "numPapers",
+                 "totalBlogPosts", "communityScore", "numberLikes", "totalPosts", "upvotes",
+                 "numFollowers", "numFollowingUsers", "numFollowingOrgs")
+
+# Input schema for the Arrow JSONL reader: only the fields the outputs need are
+# declared, everything else in the raw profile is ignored while parsing
+_TAG_TYPE = pa.list_(pa.struct([("text", pa.string())]))
+_LINK_TYPE = pa.list_(pa.struct([("url", pa.string())]))
+
+RAW_PROFILE_SCHEMA = pa.schema([
+    ("profile", pa.string()),
+    ("data", pa.struct([
+        ("org", pa.struct([
+            ("type", pa.string()),
+            ("fullname", pa.string()),
+            ("name", pa.string()),
+            ("isHf", pa.bool_()),
+            ("details", pa.string()),
+            ("isEnterprise", pa.bool_()),
+            ("plan", pa.string()),
+        ])),
+        ("u", pa.struct([
+            ("type", pa.string()),
+            ("isPro", pa.bool_()),
+            ("isHf", pa.bool_()),
+            ("isMod", pa.bool_()),
+            ("fullname", pa.string()),
+            ("signup", pa.struct([
+                ("details", pa.string()),
+                ("homepage", pa.string()),
+                ("github", pa.string()),
+                ("bluesky", pa.string()),
+                ("linkedin", pa.string()),
+                ("twitter", pa.string()),
+            ])),
+            ("orgs", pa.list_(pa.struct([
+                ("name", pa.string()),
+                ("userRole", pa.string()),
+            ]))),
+        ])),
+        ("organizationCard", pa.struct([
+            ("metadata", pa.struct([])),
+            ("contents", pa.string()),
+            ("html", pa.string()),
+        ])),
+        ("hardwareItems", pa.list_(pa.struct([]))),
+        ("orgEmailDomain", pa.string()),
+        *[(name, pa.int64()) for name in _COUNT_FIELDS],
+    ])),
+    ("header_metadata", pa.struct([
+        ("org_display_name", pa.string()),
+        ("tags", _TAG_TYPE),
+        ("links", _LINK_TYPE),
+    ])),
+])
+
+# Org type tags in priority order (matched case-insensitively), see determine_org_type
+ORG_TYPE_TAGS = (
+    ("university", "University"),
+    ("non-profit", "Non-Profit"),
+    ("company", "Company"),
+    ("community", "Community"),
+    ("government", "Government"),
+    ("classroom", "Classroom"),
+)
+
+# Maximum number of rows per Parquet row group
+BATCH_SIZE = 10_000
+
+# Log parsing progress every this many profiles (instead of one line per profile)
+PROGRESS_EVERY = 500
+
+# Output file name and schema for each row group collected during parsing
+OUTPUTS = {
+    "profiles": ("hf_profiles.parquet", PROFILE_SCHEMA),
+    "orgs": ("hf_orgs.parquet", ORG_SCHEMA),
+    "users": ("hf_users.parquet", USER_SCHEMA),
+    "members": ("hf_org_members.parquet", MEMBER_SCHEMA),
+}
+
+# Low-cardinality string columns to dictionary-encode in each output (other
+# columns, e.g. profile names, are mostly unique and gain nothing from it)
+DICTIONARY_COLUMNS = {
+    "profiles": ["hf_type"],
+    "orgs": ["Type", "type", "plan", "tags"],
+    "users": ["type"],
+    "members": ["name_org", "userRole"],
+}
+
+
+def determine_org_type(tags_lower: frozenset) -> str:
     """
     Determine organization type based on tags.
 
+    Args:
+        tags_lower: Set of lowercased tag texts
+
     Returns: University, Non-Profit, Company, Community, Government, Classroom, or empty string
     """
-    # Convert tags to lowercase for case-insensitive matching
-    tags_lower = [tag.lower() for tag in tag_texts]
-
     # Check in priority order
-    if "university" in tags_lower:
-        return "University"
-    elif "non-profit" in tags_lower:
-        return "Non-Profit"
-    elif "company" in tags_lower:
-        return "Company"
-    elif "community" in tags_lower:
-        return "Community"
-    elif "government" in tags_lower:
-        return "Government"
-    elif "classroom" in tags_lower:
-        return "Classroom"
-    else:
-        return ""
-
-
-def parse_org_profile(profile_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Parse organization profile data."""
-    data = profile_data.get("data", {})
-    org = data.get("org", {})
-    header_metadata = profile_data.get("header_metadata", {})
+    for tag, org_type in ORG_TYPE_TAGS:
+        if tag in tags_lower:
+            return org_type
+    return ""
+
+
+def parse_org_profile(
+    append_org: Callable,
+    profile_name: Optional[str],
+    org: Dict[str, Any],
+    data: Dict[str, Any],
+    header_metadata: Dict[str, Any]
+):
+    """
+    Parse organization profile data and append it as one hf_orgs row.
 
+    Args:
+        append_org: The "orgs" row appender (see new_row_appenders)
+        profile_name: Profile name
+        org: The profile's data.org dictionary
+        data: The profile's data dictionary
+        header_metadata: The profile's header_metadata dictionary
+    """
     # Extract tags
-    tags = header_metadata.get("tags", [])
+    tags = header_metadata.get("tags") or []
     tag_texts = [tag.get("text", "") for tag in tags if isinstance(tag, dict)]
     tags_str = ", ".join(tag_texts) if tag_texts else ""
 
-    # Determine org type and verification status
-    org_type = determine_org_type(tag_texts)
-    is_verified = "Verified" in tag_texts
+    # Determine org type and verification status (case-insensitive)
+    tags_lower = frozenset(tag.lower() for tag in tag_texts)
+    org_type = determine_org_type(tags_lower)
+    is_verified = "verified" in tags_lower
 
     # Extract links
-    links = header_metadata.get("links", [])
+    links = header_metadata.get("links") or []
     link_urls = [link.get("url", "") for link in links if isinstance(link, dict)]
     links_str = ", ".join(link_urls) if link_urls else ""
 
@@ -105,256 +343,690 @@ def parse_org_profile(profile_data: Dict[str, Any]) -> Dict[str, Any]:
         (isinstance(org_card, str) and len(org_card) > 0)
     )
 
-    return {
-        "profile_name": profile_data.get("profile", ""),
-        "Type": org_type,
-        "isVerified": is_verified,
-        "type": org.get("type", ""),
-        "fullname": org.get("fullname", ""),
-        "name": org.get("name", ""),
-        "isHf": org.get("isHf", ""),
-        "details": org.get("details", ""),
-        "isEnterprise": org.get("isEnterprise", ""),
-        "plan": org.get("plan", ""),
-        "has_org_card": has_org_card,
-        "followerCount": data.get("followerCount", ""),
-        "userCount": data.get("userCount", ""),
-        "numDatasets": data.get("numDatasets", ""),
-        "numModels": data.get("numModels", ""),
-        "numSpaces": data.get("numSpaces", ""),
-        "numPapers": data.get("numPapers", ""),
-        "orgEmailDomain": data.get("orgEmailDomain", ""),
-        "org_display_name": header_metadata.get("org_display_name", ""),
-        "tags": tags_str,
-        "links": links_str,
-    }
+    append_org(org, data, header_metadata, profile_name, org_type, is_verified, has_org_card, tags_str, links_str)
+
 
+def parse_user_profile(
+    append_user: Callable,
+    profile_name: Optional[str],
+    user: Dict[str, Any],
+    data: Dict[str, Any]
+):
+    """
+    Parse user profile data and append it as one hf_users row.
 
-def parse_user_profile(profile_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Parse user profile data."""
-    data = profile_data.get("data", {})
-    user = data.get("u", {})
-    signup = user.get("signup", {})
+    Args:
+        append_user: The "users" row appender (see new_row_appenders)
+        profile_name: Profile name
+        user: The profile's data.u dictionary
+        data: The profile's data dictionary
+    """
+    signup = user.get("signup") or {}
 
     # Calculate number of orgs
     orgs = user.get("orgs", [])
-    num_orgs = len(orgs) if isinstance(orgs, list) else ""
+    num_orgs = len(orgs) if isinstance(orgs, list) else None
 
     # Check if hardwareItems exists
     has_hardware_items = data.get("hardwareItems") is not None
 
-    return {
-        "profile_name": profile_data.get("profile", ""),
-        "type": user.get("type", ""),
-        "isPro": user.get("isPro", ""),
-        "isHf": user.get("isHf", ""),
-        "isMod": user.get("isMod", ""),
-        "fullname": user.get("fullname", ""),
-        "profile_details": signup.get("details", ""),
-        "homepage": signup.get("homepage", ""),
-        "github": signup.get("github", ""),
-        "bluesky": signup.get("bluesky", ""),
-        "linkedin": signup.get("linkedin", ""),
-        "twitter": signup.get("twitter", ""),
-        "numOrgs": num_orgs,
-        "totalBlogPosts": data.get("totalBlogPosts", ""),
-        "communityScore": data.get("communityScore", ""),
-        "numberLikes": data.get("numberLikes", ""),
-        "totalPosts": data.get("totalPosts", ""),
-        "upvotes": data.get("upvotes", ""),
-        "numFollowers": data.get("numFollowers", ""),
-        "numFollowingUsers": data.get("numFollowingUsers", ""),
-        "numFollowingOrgs": data.get("numFollowingOrgs", ""),
-        "numModels": data.get("numModels", ""),
-        "numDatasets": data.get("numDatasets", ""),
-        "numSpaces": data.get("numSpaces", ""),
-        "has_hardware_items": has_hardware_items,
-    }
+    append_user(user, signup, data, profile_name, num_orgs, has_hardware_items)
 
 
-def extract_org_memberships(profile_data: Dict[str, Any]) -> list:
+def extract_org_memberships(append_member: Callable, profile_name: Optional[str], user: Dict[str, Any]):
     """
-    Extract organization memberships from a user profile.
+    Extract organization memberships from a user profile, appending one
+    (name_user, name_org, userRole) row per membership.
 
-    Returns: List of dicts with name_user, name_org, userRole
+    Args:
+        append_member: The "members" row appender (see new_row_appenders)
+        profile_name: Profile name
+        user: The profile's data.u dictionary
     """
-    memberships = []
-    profile_name = profile_data.get("profile", "")
-    data = profile_data.get("data", {})
-    user = data.get("u", {})
     orgs = user.get("orgs", [])
+    if not isinstance(orgs, list):
+        return
 
-    if isinstance(orgs, list):
-        for org in orgs:
-            if isinstance(org, dict):
-                membership = {
-                    "name_user": profile_name,
-                    "name_org": org.get("name", ""),
-                    "userRole": org.get("userRole", "")
-                }
-                memberships.append(membership)
+    for org in orgs:
+        if isinstance(org, dict):
+            append_member(profile_name, org.get("name"), org.get("userRole"))
 
-    return memberships
 
+def classify_and_parse(profile_data: Dict[str, Any], appenders: Dict[str, Callable]) -> str:
+    """
+    Classify a profile and append its org or user rows in one pass over the profile.
 
-def append_to_csv(file_path: Path, data: Dict[str, Any], fieldnames: list):
-    """Append a row to a CSV file, creating it with headers if it doesn't exist."""
-    file_exists = file_path.exists()
+    Args:
+        profile_data: Dictionary containing the profile data
+        appenders: Row appenders keyed by output, from new_row_appenders
 
-    with open(file_path, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+    Returns:
+        - "org" if data.org field is present
+        - "user" if data.u field is present
+        - "unknown" if neither present
+        - "assumptions broken" if both present
+    """
+    profile = profile_data.get("profile")
+    data = profile_data.get("data") or {}
+    org = data.get("org")
+    user = data.get("u")
+
+    if org is not None:
+        if user is not None:
+            return "assumptions broken"
+        header_metadata = profile_data.get("header_metadata") or {}
+        parse_org_profile(appenders["orgs"], profile, org, data, header_metadata)
+        return "org"
 
-        if not file_exists:
-            writer.writeheader()
+    if user is not None:
+        parse_user_profile(appenders["users"], profile, user, data)
+        extract_org_memberships(appenders["members"], profile, user)
+        return "user"
 
-        writer.writerow(data)
+    return "unknown"
 
 
-def parse_hf_profile(profile_data: Dict[str, Any], output_dir: Path = Path(".")):
+def parse_hf_profile(profile_data: Dict[str, Any], appenders: Dict[str, Callable], counts: Counter):
     """
-    Parse a HuggingFace profile and append data to the appropriate CSV files.
+    Parse a HuggingFace profile and add its rows to the in-memory column lists.
 
     Args:
         profile_data: Dictionary containing the profile data
-        output_dir: Directory where CSV files will be created/updated
+        appenders: Row appenders keyed by output ("profiles", "orgs", "users", "members"),
+            from new_row_appenders
+        counts: Counter of profiles parsed so far, keyed by profile type
+    """
+    hf_type = classify_and_parse(profile_data, appenders)
+
+    # Add to master profiles list
+    profile_name = profile_data.get("profile")
+    if profile_name is None:
+        profile_name = "unknown"
+    appenders["profiles"](profile_name, hf_type)
+    counts[hf_type] += 1
+
+    if hf_type != "org" and hf_type != "user":
+        logger.debug(f"Skipped {profile_name}: type={hf_type}")
+
+
+def format_counts(counts: Counter) -> str:
+    """Summarise profile type counts, e.g. "1,000 profiles (600 orgs, 390 users, 10 skipped)"."""
+    total = sum(counts.values())
+    skipped = total - counts["org"] - counts["user"]
+    return f"{total:,} profiles ({counts['org']:,} orgs, {counts['user']:,} users, {skipped:,} skipped)"
+
+
+def count_profile_types(profiles: pa.Table) -> Counter:
+    """Count the rows of a profiles table by hf_type."""
+    return Counter({
+        item["values"]: item["counts"]
+        for item in pc.value_counts(profiles.column("hf_type")).to_pylist()
+    })
+
+
+def log_progress(counts: Counter, source):
+    """Log a progress line every PROGRESS_EVERY profiles."""
+    if sum(counts.values()) % PROGRESS_EVERY == 0:
+        logger.info(f"{source}: parsed {format_counts(counts)} so far")
+
+
+def _list_field(list_array: pa.ListArray, field: str, fill: Optional[str] = None,
+                lower: bool = False) -> pa.ListArray:
+    """Project one field of a list<struct> array, keeping the list shape."""
+    offsets = list_array.offsets
+    start, end = offsets[0].as_py(), offsets[-1].as_py()
+    values = pc.struct_field(list_array.values.slice(start, end - start), field)
+    if fill is not None:
+        values = pc.fill_null(values, fill)
+    if lower:
+        values = pc.utf8_lower(values)
+    return pa.ListArray.from_arrays(pc.subtract(offsets, start), values, mask=list_array.is_null())
+
+
+def _rows_containing(list_array: pa.ListArray, value: str) -> pa.BooleanArray:
+    """Return a per-row mask of list<string> rows that contain the given value."""
+    values = pc.list_flatten(list_array)
+    hits = pc.filter(pc.list_parent_indices(list_array), pc.equal(values, value))
+    return pc.is_in(pa.array(range(len(list_array)), pa.int64()), value_set=hits)
+
+
+def _joined(list_array: pa.ListArray) -> pa.StringArray:
+    """Join a list<string> array into comma-separated strings ("" for empty/missing)."""
+    return pc.fill_null(pc.binary_join(list_array, ", "), "")
+
+
+def arrow_org_table(raw: pa.Table) -> pa.Table:
+    """Build the hf_orgs table from raw org profiles with Arrow compute kernels."""
+    data = raw.column("data").combine_chunks()
+    header = raw.column("header_metadata").combine_chunks()
+    org = pc.struct_field(data, "org")
+
+    # Tags drive both the org type and the verification flag
+    tags = pc.struct_field(header, "tags")
+    tag_texts = _list_field(tags, "text", fill="")
+    tags_lower = _list_field(tags, "text", fill="", lower=True)
+    org_type = pc.case_when(
+        pc.make_struct(
+            *[_rows_containing(tags_lower, tag) for tag, _ in ORG_TYPE_TAGS],
+            field_names=[tag for tag, _ in ORG_TYPE_TAGS],
+        ),
+        *[org_type for _, org_type in ORG_TYPE_TAGS],
+        "",
+    )
+    link_urls = _list_field(pc.struct_field(header, "links"), "url", fill="")
+
+    # Organization card counts as present when it has any content (cards whose
+    # content isn't visible to Arrow are rejected by check_arrow_flattenable)
+    card = pc.struct_field(data, "organizationCard")
+    has_org_card = pc.and_(
+        pc.is_valid(card),
+        pc.or_(
+            pc.or_(pc.is_valid(pc.struct_field(card, "contents")), pc.is_valid(pc.struct_field(card, "html"))),
+            pc.is_valid(pc.struct_field(card, "metadata")),
+        ),
+    )
+
+    columns = {
+        "profile_name": raw.column("profile").combine_chunks(),
+        "Type": org_type,
+        "isVerified": _rows_containing(tags_lower, "verified"),
+        "has_org_card": has_org_card,
+        "org_display_name": pc.struct_field(header, "org_display_name"),
+        "tags": _joined(tag_texts),
+        "links": _joined(link_urls),
+    }
+    for name in _ORG_FIELDS:
+        columns[name] = pc.struct_field(org, name)
+    for name in _ORG_DATA_FIELDS:
+        columns[name] = pc.struct_field(data, name)
+
+    return pa.Table.from_arrays([columns[name] for name in _ORG_COLUMNS], schema=ORG_SCHEMA)
+
+
+def arrow_user_tables(raw: pa.Table):
     """
-    # Determine profile type
-    profile_name = profile_data.get("profile", "unknown")
-    hf_type = determine_profile_type(profile_data)
+    Build the hf_users and hf_org_members tables from raw user profiles.
 
-    # Write to master profiles CSV
-    master_csv = output_dir / "hf_profiles.csv"
-    master_data = {
-        "profile_name": profile_name,
-        "hf_type": hf_type
+    Returns:
+        Tuple of (users table, memberships table)
+    """
+    profile_names = raw.column("profile").combine_chunks()
+    data = raw.column("data").combine_chunks()
+    user = pc.struct_field(data, "u")
+    signup = pc.struct_field(user, "signup")
+    orgs = pc.struct_field(user, "orgs")
+
+    columns = {
+        "profile_name": profile_names,
+        "profile_details": pc.struct_field(signup, "details"),
+        "numOrgs": pc.list_value_length(orgs).cast(pa.int64()),
+        "has_hardware_items": pc.is_valid(pc.struct_field(data, "hardwareItems")),
     }
-    append_to_csv(master_csv, master_data, ["profile_name", "hf_type"])
-
-    # Write to appropriate detailed CSV based on type
-    if hf_type == "org":
-        org_data = parse_org_profile(profile_data)
-        org_csv = output_dir / "hf_orgs.csv"
-        org_fieldnames = [
-            "profile_name", "Type", "isVerified", "type", "fullname", "name", "isHf", "details",
-            "isEnterprise", "plan", "has_org_card", "followerCount", "userCount",
-            "numDatasets", "numModels", "numSpaces", "numPapers", "orgEmailDomain",
-            "org_display_name", "tags", "links"
-        ]
-        append_to_csv(org_csv, org_data, org_fieldnames)
-        print(f"✓ Processed organization: {profile_name}")
-
-    elif hf_type == "user":
-        user_data = parse_user_profile(profile_data)
-        user_csv = output_dir / "hf_users.csv"
-        user_fieldnames = [
-            "profile_name", "type", "isPro", "isHf", "isMod", "fullname",
-            "profile_details", "homepage", "github", "bluesky", "linkedin",
-            "twitter", "numOrgs", "totalBlogPosts", "communityScore", "numberLikes",
-            "totalPosts", "upvotes", "numFollowers", "numFollowingUsers",
-            "numFollowingOrgs", "numModels", "numDatasets", "numSpaces",
-            "has_hardware_items"
-        ]
-        append_to_csv(user_csv, user_data, user_fieldnames)
-
-        # Extract and write org memberships
-        memberships = extract_org_memberships(profile_data)
-        if memberships:
-            members_csv = output_dir / "hf_org_members.csv"
-            members_fieldnames = ["name_user", "name_org", "userRole"]
-            for membership in memberships:
-                append_to_csv(members_csv, membership, members_fieldnames)
-
-        print(f"✓ Processed user: {profile_name}")
-
-    else:
-        print(f"⚠ Skipped {profile_name}: type={hf_type}")
-
-
-def process_file(input_path: Path, output_dir: Path, verbose: bool = True):
+    for name in _USER_FIELDS:
+        columns[name] = pc.struct_field(user, name)
+    for name in _SIGNUP_FIELDS:
+        columns[name] = pc.struct_field(signup, name)
+    for name in _USER_DATA_FIELDS:
+        columns[name] = pc.struct_field(data, name)
+    users = pa.Table.from_arrays([columns[name] for name in _USER_COLUMNS], schema=USER_SCHEMA)
+
+    # One membership row per entry in u.orgs
+    memberships = pc.list_flatten(orgs)
+    members = pa.Table.from_arrays([
+        pc.take(profile_names, pc.list_parent_indices(orgs)),
+        pc.struct_field(memberships, "name"),
+        pc.struct_field(memberships, "userRole"),
+    ], schema=MEMBER_SCHEMA)
+
+    return users, members
+
+
+def check_arrow_flattenable(raw: pa.Table):
+    """
+    Raise pyarrow.ArrowInvalid if the Arrow kernels can't match the Python parser on a raw table.
+
+    The Arrow reader drops undeclared fields and reads a missing field as null,
+    but the Python parser looks at which keys are present: an organizationCard
+    with only undeclared (or null) fields still counts as a card, and a user
+    without an orgs key has 0 orgs while an explicit null gives null. Rows
+    like that are ambiguous once read, so the file goes to the Python parser.
+    """
+    data = raw.column("data")
+    org = pc.struct_field(data, "org")
+    user = pc.struct_field(data, "u")
+    card = pc.struct_field(data, "organizationCard")
+
+    card_fields_null = pc.and_(
+        pc.and_(pc.is_null(pc.struct_field(card, "contents")), pc.is_null(pc.struct_field(card, "html"))),
+        pc.is_null(pc.struct_field(card, "metadata")),
+    )
+    ambiguous_card = pc.and_(pc.and_(pc.is_valid(org), pc.is_null(user)), pc.and_(pc.is_valid(card), card_fields_null))
+    ambiguous_orgs = pc.and_(pc.and_(pc.is_valid(user), pc.is_null(org)), pc.is_null(pc.struct_field(user, "orgs")))
+
+    if pc.any(ambiguous_card).as_py() or pc.any(ambiguous_orgs).as_py():
+        raise pa.ArrowInvalid("organizationCard or u.orgs can't be told apart from a missing field")
+
+
+def read_jsonl_arrow(input_path: Path) -> pa.Table:
+    """
+    Read a JSONL profile file into a raw Arrow table with RAW_PROFILE_SCHEMA.
+
+    Raises pyarrow.ArrowInvalid if any record is malformed, doesn't match the
+    schema, or can't be flattened exactly like the Python parser would (see
+    check_arrow_flattenable), so the caller can fall back to the Python parser.
+    """
+    raw = paj.read_json(
+        input_path,
+        parse_options=paj.ParseOptions(
+            explicit_schema=RAW_PROFILE_SCHEMA,
+            unexpected_field_behavior="ignore",
+        ),
+    )
+    check_arrow_flattenable(raw)
+    return raw
+
+
+def arrow_profile_tables(raw: pa.Table, source: str, verbose: bool = True) -> Dict[str, pa.Table]:
+    """
+    Flatten a raw Arrow profile table into the output tables.
+
+    Args:
+        raw: Table read with read_jsonl_arrow (possibly several files concatenated)
+        source: Description of where the rows came from, for progress messages
+        verbose: Whether to log progress messages (default: True)
+
+    Returns:
+        Dictionary of tables keyed by output ("profiles", "orgs", "users", "members")
+    """
+    # Classify every profile at once, as in classify_and_parse
+    data = raw.column("data")
+    has_org = pc.is_valid(pc.struct_field(data, "org"))
+    has_user = pc.is_valid(pc.struct_field(data, "u"))
+    hf_type = pc.case_when(
+        pc.make_struct(pc.and_(has_org, has_user), has_org, has_user, field_names=["both", "org", "u"]),
+        "assumptions broken", "org", "user", "unknown",
+    )
+
+    profiles = pa.Table.from_arrays(
+        [pc.fill_null(raw.column("profile"), "unknown"), hf_type],
+        schema=PROFILE_SCHEMA,
+    )
+    orgs = arrow_org_table(raw.filter(pc.equal(hf_type, "org")))
+    users, members = arrow_user_tables(raw.filter(pc.equal(hf_type, "user")))
+
+    if verbose:
+        logger.info(f"{source}: parsed {format_counts(count_profile_types(profiles))}")
+
+    return {"profiles": profiles, "orgs": orgs, "users": users, "members": members}
+
+
+def process_jsonl_arrow(input_path: Path, verbose: bool = True) -> Dict[str, pa.Table]:
+    """
+    Parse a JSONL profile file with pyarrow and flatten it columnarly.
+
+    Raises pyarrow.ArrowInvalid if any record is malformed (see read_jsonl_arrow).
+
+    Args:
+        input_path: Path to the input JSONL file
+        verbose: Whether to log progress messages (default: True)
+
+    Returns:
+        Dictionary of tables keyed by output ("profiles", "orgs", "users", "members")
+    """
+    return arrow_profile_tables(read_jsonl_arrow(input_path), str(input_path), verbose=verbose)
+
+
+def detect_json_format(f) -> str:
+    """
+    Detect whether an open binary file holds a JSON array, JSONL, or a single object.
+
+    Peeks at the first non-whitespace byte and the first line instead of parsing
+    the whole file, then rewinds the file. A JSONL file whose first line is
+    malformed is reported as "object"; process_file falls back to reading it
+    line by line when it doesn't parse as one document.
+
+    Returns:
+        "array", "jsonl", or "object"
+    """
+    head = f.read(512).lstrip()
+    f.seek(0)
+
+    if head.startswith(b'['):
+        return "array"
+
+    # A JSONL file has a complete JSON document on its first non-empty line
+    first_line = b''
+    for line in f:
+        if line.strip():
+            first_line = line
+            break
+    f.seek(0)
+    try:
+        json_loads(first_line)
+        return "jsonl"
+    except json.JSONDecodeError:
+        return "object"
+
+
+def iter_jsonl_lines(f) -> Iterator[tuple]:
+    """
+    Yield (line number, line bytes) for each line of an open binary file.
+
+    Memory-maps the file and scans for newlines, so lines are sliced straight out
+    of the mapping rather than going through Python's buffered line reader. Falls
+    back to regular line iteration if the file can't be mapped (e.g. it's empty).
+    """
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        yield from enumerate(f, 1)
+        return
+
+    with mm:
+        start = 0
+        line_num = 0
+        size = len(mm)
+        while start < size:
+            end = mm.find(b'\n', start)
+            if end == -1:
+                end = size
+            line_num += 1
+            yield line_num, mm[start:end]
+            start = end + 1
+
+
+def process_file(input_path: Path, verbose: bool = True, use_arrow: bool = True) -> Dict[str, pa.Table]:
     """
     Process a JSON or JSONL file containing HuggingFace profiles.
 
+    This is a pure function (it writes nothing to disk) so that files can be
+    parsed in parallel worker processes.
+
     Args:
         input_path: Path to the input JSON or JSONL file
-        output_dir: Directory where CSV files will be created
-        verbose: Whether to print progress messages (default: True)
+        verbose: Whether to log progress messages (default: True)
+        use_arrow: Whether to try the Arrow reader for JSONL files first (default: True)
+
+    Returns:
+        Dictionary of tables keyed by output ("profiles", "orgs", "users", "members")
     """
-    output_dir.mkdir(parents=True, exist_ok=True)
+    columns = {key: [[] for _ in schema] for key, (_, schema) in OUTPUTS.items()}
+    appenders = new_row_appenders(columns)
+    counts = Counter()
+
+    with open(input_path, 'rb') as f:
+        file_format = detect_json_format(f)
+
+        data = None
+        if file_format == "object":
+            # A file that doesn't parse as one document is most likely JSONL whose
+            # first record is malformed, so it is read line by line instead
+            try:
+                data = json_loads(f.read())
+            except json.JSONDecodeError:
+                if verbose:
+                    logger.warning(f"{input_path} is not a single JSON document, parsing it as JSONL")
+                f.seek(0)
+                file_format = "jsonl"
+                use_arrow = False
+
+        if file_format == "jsonl" and use_arrow:
+            # Fast path: parse and flatten the whole file in Arrow
+            try:
+                return process_jsonl_arrow(input_path, verbose=verbose)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                if verbose:
+                    logger.warning(f"Arrow parse failed for {input_path}, using Python parser: {e}")
 
-    with open(input_path, 'r', encoding='utf-8') as f:
-        # Try to load the entire file as JSON first
-        try:
-            f.seek(0)
-            data = json.load(f)
+        if file_format == "jsonl":
+            # One JSON object per line
+            for line_num, line in iter_jsonl_lines(f):
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    profile = json_loads(line)
+                    parse_hf_profile(profile, appenders, counts)
+                except json.JSONDecodeError as e:
+                    if verbose:
+                        logger.warning(f"{input_path}: error parsing line {line_num}: {e}")
+                    continue
+
+                if verbose:
+                    log_progress(counts, input_path)
+        else:
+            if data is None:
+                data = json_loads(f.read())
 
             # Handle both single objects and arrays
             if isinstance(data, dict):
                 # Single JSON object
-                parse_hf_profile(data, output_dir)
+                parse_hf_profile(data, appenders, counts)
             elif isinstance(data, list):
                 # JSON array
                 for profile in data:
-                    parse_hf_profile(profile, output_dir)
+                    parse_hf_profile(profile, appenders, counts)
+                    if verbose:
+                        log_progress(counts, input_path)
             else:
                 if verbose:
-                    print(f"✗ Unexpected JSON format in {input_path}", file=sys.stderr)
+                    logger.warning(f"Unexpected JSON format in {input_path}")
 
-        except json.JSONDecodeError:
-            # If that fails, try JSONL (one JSON object per line)
-            f.seek(0)
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
+    if verbose:
+        logger.info(f"{input_path}: parsed {format_counts(counts)}")
 
-                try:
-                    profile = json.loads(line)
-                    parse_hf_profile(profile, output_dir)
-                except json.JSONDecodeError as e:
-                    if verbose:
-                        print(f"✗ Error parsing line {line_num}: {e}", file=sys.stderr)
+    return columns_to_tables(columns, input_path)
 
 
-def clean_hf_profiles(input_files: list, output_dir: Path):
+def new_row_appenders(columns: Dict[str, List[list]]) -> Dict[str, Callable]:
     """
-    Clean HuggingFace profile data from JSON/JSONL files and export to CSV.
+    Create row appenders that write into per-column lists.
 
     Args:
-        input_files: List of paths to JSON or JSONL files
-        output_dir: Directory where CSV files will be created
+        columns: Dictionary keyed by output of lists of column value lists, in schema column order
 
     Returns:
-        List of created CSV file paths
+        Dictionary of appender functions keyed by output
     """
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    return {key: _ROW_APPENDERS[key](columns[key]) for key in OUTPUTS}
+
+
+def _coerce_value(value, arrow_type: pa.DataType):
+    """Cast one value to an Arrow type (e.g. "12" to an int64), or return None if it can't be."""
+    try:
+        return pa.scalar(value).cast(arrow_type).as_py()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, OverflowError):
+        return None
+
+
+def column_array(values: list, field: pa.Field, source) -> pa.Array:
+    """
+    Convert one column of Python values to an Arrow array of the field's type.
+
+    Values that don't fit the type (a count scraped as a string, say) are cast
+    one by one, or nulled when they can't be, and logged, so a single off-type
+    record doesn't lose the rest of the file.
+
+    Args:
+        values: Column values, one per row
+        field: Output schema field
+        source: Where the rows came from, for log messages
+
+    Returns:
+        Arrow array with the field's type
+    """
+    try:
+        return pa.array(values, type=field.type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        pass
+
+    converted = []
+    for row, value in enumerate(values):
+        try:
+            pa.scalar(value, type=field.type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            coerced = _coerce_value(value, field.type)
+            action = "nulled" if coerced is None else f"converted to {coerced!r}"
+            logger.warning(f"{source}: row {row} {field.name}={value!r} is not {field.type}, {action}")
+            value = coerced
+        converted.append(value)
+    return pa.array(converted, type=field.type)
+
+
+def columns_to_tables(columns: Dict[str, List[list]], source) -> Dict[str, pa.Table]:
+    """Convert per-column lists from the Python parser into tables with the output schemas."""
+    return {
+        key: pa.Table.from_arrays(
+            [column_array(values, field, f"{source} ({key})") for values, field in zip(columns[key], schema)],
+            schema=schema,
+        )
+        for key, (_, schema) in OUTPUTS.items()
+    }
 
-    # Process each input file
+
+def existing_input_paths(input_files: list) -> List[Path]:
+    """Return the input files that exist, warning about any that don't."""
+    input_paths = []
     for input_path in input_files:
         input_path = Path(input_path)
         if not input_path.exists():
-            print(f"✗ Warning: File not found: {input_path}", file=sys.stderr)
+            logger.warning(f"File not found: {input_path}")
             continue
+        input_paths.append(input_path)
+    return input_paths
+
+
+def iter_file_tables(input_paths: List[Path], use_arrow: bool = True) -> Iterator[Dict[str, pa.Table]]:
+    """
+    Parse input files and yield each file's output tables, in input order.
+
+    Multiple files are parsed in worker processes; files that fail are reported
+    and skipped. `use_arrow` is passed through to process_file.
+    """
+    if len(input_paths) <= 1:
+        # Single file: parse in this process
+        for input_path in input_paths:
+            try:
+                yield process_file(input_path, True, use_arrow)
+            except Exception as e:
+                logger.error(f"Error processing {input_path}: {e}")
+        return
+
+    # Multiple files: parse each in its own worker process (JSON decoding is CPU-bound)
+    max_workers = min(len(input_paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(process_file, input_path, True, use_arrow) for input_path in input_paths]
+
+        # Yield in input order so output row order is deterministic
+        for input_path, future in zip(input_paths, futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Error processing {input_path}: {e}")
+                continue
+            yield result
+
+
+def write_outputs(file_tables: Iterable[Dict[str, pa.Table]], output_dir: Path) -> List[Path]:
+    """
+    Stream output tables to one ZSTD-compressed Parquet file per output.
+
+    Writers are opened when their first rows arrive, so empty outputs aren't created.
+    Logs a summary of the profiles written.
+
+    Args:
+        file_tables: Iterable of dictionaries of tables keyed by output
+        output_dir: Directory where Parquet files will be created
+
+    Returns:
+        List of created Parquet file paths
+    """
+    writers = {}
+    counts = Counter()
+    with ExitStack() as stack:
+        for tables in file_tables:
+            counts.update(count_profile_types(tables["profiles"]))
+            for key, table in tables.items():
+                if table.num_rows == 0:
+                    continue
+                if key not in writers:
+                    filename, schema = OUTPUTS[key]
+                    writers[key] = stack.enter_context(pq.ParquetWriter(
+                        output_dir / filename, schema, compression='zstd', compression_level=3,
+                        use_dictionary=DICTIONARY_COLUMNS[key]
+                    ))
+                writers[key].write_table(table, row_group_size=BATCH_SIZE)
+
+    logger.info(f"Wrote {format_counts(counts)}")
+
+    return [output_dir / filename for key, (filename, _) in OUTPUTS.items() if key in writers]
+
+
+def clean_hf_profiles_fast(input_paths: List[Path], output_dir: Path) -> List[Path]:
+    """
+    Clean profiles by reading every JSONL input into one Arrow table and flattening
+    it in a single vectorised pass.
+
+    Arrow's JSON reader is already multi-threaded, so this skips the per-file worker
+    processes (and pickling their tables back to the parent). Inputs that aren't
+    JSONL, or that Arrow can't read, go through the standard per-file path.
+
+    Args:
+        input_paths: List of existing JSON or JSONL file paths
+        output_dir: Directory where Parquet files will be created
 
+    Returns:
+        List of created Parquet file paths
+    """
+    raw_tables = []
+    fallback_paths = []
+    for input_path in input_paths:
+        with open(input_path, 'rb') as f:
+            file_format = detect_json_format(f)
+        if file_format != "jsonl":
+            fallback_paths.append(input_path)
+            continue
         try:
-            process_file(input_path, output_dir, verbose=True)
-        except Exception as e:
-            print(f"✗ Error processing {input_path}: {e}", file=sys.stderr)
+            raw_tables.append(read_jsonl_arrow(input_path))
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"Arrow parse failed for {input_path}, using Python parser: {e}")
+            fallback_paths.append(input_path)
+
+    file_tables = iter_file_tables(fallback_paths, use_arrow=False)
+    if raw_tables:
+        combined = arrow_profile_tables(pa.concat_tables(raw_tables), f"{len(raw_tables)} JSONL file(s)")
+        file_tables = itertools.chain([combined], file_tables)
+
+    return write_outputs(file_tables, output_dir)
+
+
+def clean_hf_profiles(input_files: list, output_dir: Path, fast: bool = False):
+    """
+    Clean HuggingFace profile data from JSON/JSONL files and export to Parquet.
+
+    Args:
+        input_files: List of paths to JSON or JSONL files
+        output_dir: Directory where Parquet files will be created
+        fast: If True, flatten all JSONL inputs in one Arrow pass (see clean_hf_profiles_fast)
+
+    Returns:
+        List of created Parquet file paths
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    input_paths = existing_input_paths(input_files)
 
-    # Return list of created files
-    created_files = [
-        output_dir / "hf_profiles.csv",
-        output_dir / "hf_orgs.csv",
-        output_dir / "hf_users.csv",
-        output_dir / "hf_org_members.csv"
-    ]
+    if fast:
+        return clean_hf_profiles_fast(input_paths, output_dir)
 
-    return [f for f in created_files if f.exists()]
+    return write_outputs(iter_file_tables(input_paths), output_dir)
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Parse HuggingFace profile data and export to CSV files.",
+        description="Parse HuggingFace profile data and export to Parquet files.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
@@ -366,6 +1038,9 @@ Examples:
 
   # Process multiple files
   python clean_hf_profiles.py data/*.json
+
+  # Flatten all JSONL files in a single Arrow pass
+  python clean_hf_profiles.py data/*.jsonl --fast
         """
     )
 
@@ -383,29 +1058,28 @@ Examples:
         "-o", "--output-dir",
         type=Path,
         default=default_output,
-        help=f"Directory where CSV files will be created (default: hf_scraper/data/processed)"
+        help=f"Directory where Parquet files will be created (default: hf_scraper/data/processed)"
+    )
+
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Read all JSONL inputs into one Arrow table and flatten them in a single pass"
     )
 
     args = parser.parse_args()
 
-    # Process each input file
-    total_files = len(args.input_files)
-    for i, input_path in enumerate(args.input_files, 1):
-        if not input_path.exists():
-            print(f"✗ Error: File not found: {input_path}", file=sys.stderr)
-            continue
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
 
-        print(f"\n[{i}/{total_files}] Processing {input_path}...")
-        try:
-            process_file(input_path, args.output_dir)
-        except Exception as e:
-            print(f"✗ Error processing {input_path}: {e}", file=sys.stderr)
-
-    print(f"\n✓ Done! CSV files created in: {args.output_dir.absolute()}")
-    print(f"  - hf_profiles.csv (master list)")
-    print(f"  - hf_orgs.csv (organization details)")
-    print(f"  - hf_users.csv (user details)")
-    print(f"  - hf_org_members.csv (user-org memberships)")
+    created_files = clean_hf_profiles(args.input_files, args.output_dir, fast=args.fast)
+
+    print(f"\n✓ Done! Parquet files created in: {args.output_dir.absolute()}")
+    for file in created_files:
+        print(f"  - {file.name}")
 
 
 if __name__ == "__main__":
@@ -9,35 +9,76 @@ Input: Parquet files in data/raw/ and data/raw/historical/
 Output: Cleaned Parquet files (compressed with ZSTD)
 """
 import duckdb
+import os
 from pathlib import Path
-import re
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# DuckDB COPY options per Parquet compression codec
+COMPRESSION_OPTIONS = {
+    'zstd': "COMPRESSION ZSTD, COMPRESSION_LEVEL 3",
+    'snappy': "COMPRESSION SNAPPY",
+    'none': "COMPRESSION UNCOMPRESSED",
+}
 
-def clean_models_parquet(parquet_path: Path, output_path: Path):
+# Matches DuckDB's default row group size so scans line up with its vectors
+ROW_GROUP_SIZE = 122880
+
+
+def parquet_copy_options(compression='zstd'):
+    """
+    Build the option list for a DuckDB COPY ... TO Parquet statement.
+
+    Args:
+        compression: One of the keys of COMPRESSION_OPTIONS
+
+    Returns:
+        Option string to place inside the COPY parentheses
+    """
+    return f"FORMAT PARQUET, {COMPRESSION_OPTIONS[compression]}, ROW_GROUP_SIZE {ROW_GROUP_SIZE}"
+
+
+def sql_quote(path):
+    """
+    Quote a path as a SQL string literal.
+
+    COPY ... TO does not accept a bound parameter as its target, so output
+    paths are quoted instead of interpolated raw.
+
+    Args:
+        path: File path
+
+    Returns:
+        Single-quoted SQL literal with embedded quotes escaped
+    """
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def clean_models_parquet(parquet_path: Path, output_path: Path, compression='zstd'):
     """
     Clean a single models.parquet file and export to Parquet.
 
     Args:
         parquet_path: Path to models.parquet file
         output_path: Path to save cleaned Parquet file
+        compression: Parquet compression codec (zstd, snappy or none)
 
     Returns:
         Path to the output Parquet file
     """
     logger.info(f"Cleaning models data from: {parquet_path}")
 
-    # Initialize DuckDB connection
-    conn = duckdb.connect()
+    conn = get_conn()
 
     # Create output directory if needed
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Read parquet and export to Parquet with basic cleaning
+    # Read parquet and export to Parquet with basic cleaning. Rows are clustered
+    # by author so the repeated author strings dictionary/RLE-encode compactly;
+    # consumers that need top-downloads order sort at query time.
     logger.info("Processing models.parquet...")
     conn.execute(f"""
         COPY (
@@ -54,12 +95,12 @@ def clean_models_parquet(parquet_path: Path, output_path: Path):
                 tags,
                 pipeline_tag,
                 library_name
-            FROM '{parquet_path}'
+            FROM read_parquet($source)
             WHERE id IS NOT NULL
-              AND SPLIT_PART(id, '/', 1) != ''
-            ORDER BY downloadsAllTime DESC
-        ) TO '{output_path}' (FORMAT PARQUET, COMPRESSION ZSTD)
-    """)
+              AND id != '' AND NOT starts_with(id, '/')  -- non-empty author, without splitting id
+            ORDER BY author, downloadsAllTime DESC
+        ) TO {sql_quote(output_path)} ({parquet_copy_options(compression)})
+    """, {'source': str(parquet_path)})
 
     file_size_mb = output_path.stat().st_size / (1024 * 1024)
     logger.info(f"Saved cleaned models data to: {output_path} ({file_size_mb:.2f} MB)")
@@ -77,21 +118,304 @@ def extract_date_from_filename(filename):
     Returns:
         Date string in YYYY-MM-DD format
     """
-    match = re.search(r'models-(\d{8})-', filename)
-    if match:
-        date_str = match.group(1)
+    # Fixed layout: 'models-' + YYYYMMDD + '-', so slice instead of running a regex
+    date_str = filename[7:15]
+    if (filename.startswith('models-') and filename[15:16] == '-'
+            and date_str.isascii() and date_str.isdigit()):
         return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
     return None
 
 
-def process_historical_data(data_dir, output_path=None, model_output_path=None):
+# Tracked metrics: name -> (raw parquet column, snapshot column, output suffix).
+# The suffix names the derived daily_*, total_daily_*, avg_daily_*_per_model and
+# total_cumulative_* columns.
+METRICS = {
+    'downloads': ('downloadsAllTime', 'downloadsAllTime', 'downloads'),
+    'likes': ('likes', 'likes', 'likes'),
+    'trending': ('trendingScore', 'trendingScore', 'trending_score'),
+    'downloads30': ('downloads', 'downloads30', 'downloads30'),
+}
+
+
+def parse_metrics(value):
+    """
+    Parse a comma-separated metric list, always keeping downloads.
+
+    Downloads drive the row filters and the summaries, so they are always
+    included.
+
+    Args:
+        value: Comma-separated metric names, or None for all metrics
+
+    Returns:
+        List of metric names in METRICS order
+    """
+    if not value:
+        return list(METRICS)
+    requested = {m.strip() for m in value.split(',') if m.strip()}
+    unknown = requested - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))} (choose from {', '.join(METRICS)})")
+    requested.add('downloads')
+    return [m for m in METRICS if m in requested]
+
+
+def build_snapshot_query(metrics, source_file=False):
+    """
+    Build the query that scans snapshot files bound to the $files parameter.
+
+    Every file is read in one read_parquet call; the snapshot date comes from
+    the filename column and the author from id (format: "author/model-name").
+
+    Args:
+        metrics: Metric names to read
+        source_file: Also keep the path each row was read from as source_file
+
+    Returns:
+        SQL SELECT statement
+    """
+    metric_columns = ",\n        ".join(
+        raw if raw == column else f"{raw} as {column}"
+        for raw, column, _ in (METRICS[m] for m in metrics)
+    )
+    if source_file:
+        metric_columns += ",\n        filename as source_file"
+    return rf"""
+    SELECT
+        CAST(strptime(regexp_extract(filename, 'models-(\d{{8}})-[^/\\]*$', 1), '%Y%m%d') AS DATE) as snapshot_date,
+        id,
+        SPLIT_PART(id, '/', 1) as author,
+        {metric_columns}
+    FROM read_parquet($files, filename=true, union_by_name=false)
+    WHERE id IS NOT NULL
+      AND downloadsAllTime IS NOT NULL
+      AND id != '' AND NOT starts_with(id, '/')  -- non-empty author, without splitting id
+"""
+
+
+# Ways to compute per-model day-over-day changes (see build_daily_model_query)
+DELTA_METHODS = ('lag', 'join')
+
+
+def build_daily_model_query(metrics, method='lag'):
+    """
+    Build the per-model day-over-day change query over all_snapshots.
+
+    'lag' diffs each model against its previous appearance with LAG; the named
+    window lets every LAG share one partition/sort pass. 'join' hash-joins each
+    row to the same model in the previous snapshot, which skips the window sort
+    and is faster on large, contiguous snapshot sets, but leaves the change
+    NULL when a model is missing from the previous snapshot.
+
+    Args:
+        metrics: Metric names to include
+        method: One of DELTA_METHODS
+
+    Returns:
+        SQL SELECT statement
+    """
+    snapshot_columns = [METRICS[m][1] for m in metrics]
+
+    if method == 'join':
+        daily_columns = [
+            f"t.{column} - p.{column} as daily_{suffix}"
+            for _, column, suffix in (METRICS[m] for m in metrics)
+        ]
+        columns = ",\n        ".join(
+            [f"t.{c}" for c in ["snapshot_date", "id", "author"] + snapshot_columns] + daily_columns
+        )
+        return f"""
+    WITH snapshot_dates AS (
+        SELECT snapshot_date, LAG(snapshot_date) OVER (ORDER BY snapshot_date) as prev_date
+        FROM (SELECT DISTINCT snapshot_date FROM all_snapshots)
+    )
+    SELECT
+        {columns}
+    FROM all_snapshots t
+    JOIN snapshot_dates d ON d.snapshot_date = t.snapshot_date
+    LEFT JOIN all_snapshots p ON p.id = t.id AND p.snapshot_date = d.prev_date
+"""
+
+    daily_columns = [
+        f"{column} - LAG({column}) OVER w as daily_{suffix}"
+        for _, column, suffix in (METRICS[m] for m in metrics)
+    ]
+    columns = ",\n        ".join(["snapshot_date", "id", "author"] + snapshot_columns + daily_columns)
+    return f"""
+    SELECT
+        {columns}
+    FROM all_snapshots
+    WINDOW w AS (PARTITION BY id ORDER BY snapshot_date)
+"""
+
+
+def build_author_query(metrics, source):
+    """
+    Build the author-level daily aggregation over a daily model downloads source.
+
+    Args:
+        metrics: Metric names to include
+        source: Table name or parenthesized subquery to aggregate
+
+    Returns:
+        SQL SELECT statement
+    """
+    aggregates = []
+    for _, column, suffix in (METRICS[m] for m in metrics):
+        aggregates += [
+            f"SUM(daily_{suffix}) as total_daily_{suffix}",
+            f"AVG(daily_{suffix}) as avg_daily_{suffix}_per_model",
+            f"SUM({column}) as total_cumulative_{suffix}",
+        ]
+    columns = ",\n        ".join(aggregates)
+    return f"""
+    SELECT
+        snapshot_date,
+        author,
+        COUNT(*) as n_models,  -- each model appears once per snapshot
+        {columns}
+    FROM {source}
+    WHERE daily_downloads IS NOT NULL
+      AND daily_downloads >= 0  -- Filter out negative values (data anomalies)
+    GROUP BY snapshot_date, author
+"""
+
+
+def memory_limit_mb(fraction=0.8):
+    """
+    Compute a DuckDB memory limit as a fraction of physical memory.
+
+    Args:
+        fraction: Share of physical memory DuckDB may use
+
+    Returns:
+        Memory limit in megabytes
+    """
+    total_bytes = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    return int(total_bytes * fraction / (1024 * 1024))
+
+
+# Shared in-memory DuckDB connection, created on first use by get_conn()
+_CONN = None
+
+
+def configure_conn(conn):
+    """
+    Configure a DuckDB connection for large datasets.
+
+    Args:
+        conn: DuckDB connection
+
+    Returns:
+        The same connection
+    """
+    conn.execute("SET preserve_insertion_order=false")
+    conn.execute(f"SET threads={os.cpu_count() or 4}")
+    conn.execute("SET parquet_metadata_cache=true")
+    conn.execute(f"SET memory_limit='{memory_limit_mb()}MB'")
+    return conn
+
+
+def get_conn():
+    """
+    Return the process-wide in-memory DuckDB connection.
+
+    Sharing one connection keeps a single worker pool and a warm Parquet
+    metadata cache across calls.
+
+    Returns:
+        Configured DuckDB connection
+    """
+    global _CONN
+    if _CONN is None:
+        _CONN = configure_conn(duckdb.connect())
+    return _CONN
+
+
+def close_conn():
+    """Close the shared DuckDB connection if it was opened."""
+    global _CONN
+    if _CONN is not None:
+        _CONN.close()
+        _CONN = None
+
+
+def sync_state_db(conn, files):
+    """
+    Bring the persistent all_snapshots table in line with the snapshot files on disk.
+
+    Files are keyed by resolved path, size and modification time. Rows from
+    files that are gone or have changed since they were loaded are deleted,
+    and new or changed files are read, so the table always holds exactly the
+    given files.
+
+    Args:
+        conn: DuckDB connection to the state database
+        files: Resolved snapshot file paths
+
+    Returns:
+        Tuple of (number of files loaded, number of files removed)
+    """
+    # The persistent table keeps every metric so later runs can ask for any subset
+    conn.execute(f"CREATE TABLE IF NOT EXISTS all_snapshots AS {build_snapshot_query(list(METRICS), source_file=True)} LIMIT 0",
+                 {'files': files[:1]})
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS processed_files (
+            file_path VARCHAR PRIMARY KEY,
+            file_size BIGINT,
+            mtime_ns BIGINT
+        )
+    """)
+
+    current = {}
+    for f in files:
+        stat = os.stat(f)
+        current[f] = (stat.st_size, stat.st_mtime_ns)
+    loaded = {path: (size, mtime) for path, size, mtime in
+              conn.execute("SELECT file_path, file_size, mtime_ns FROM processed_files").fetchall()}
+    stale = [f for f, key in loaded.items() if current.get(f) != key]
+    new_files = [f for f, key in current.items() if loaded.get(f) != key]
+
+    if stale or new_files:
+        conn.execute("BEGIN TRANSACTION")
+        if stale:
+            conn.execute("DELETE FROM all_snapshots WHERE list_contains($stale, source_file)", {'stale': stale})
+            conn.execute("DELETE FROM processed_files WHERE list_contains($stale, file_path)", {'stale': stale})
+        if new_files:
+            conn.execute(f"INSERT INTO all_snapshots BY NAME {build_snapshot_query(list(METRICS), source_file=True)}",
+                         {'files': new_files})
+            conn.execute("INSERT INTO processed_files SELECT unnest($paths), unnest($sizes), unnest($mtimes)",
+                         {'paths': new_files,
+                          'sizes': [current[f][0] for f in new_files],
+                          'mtimes': [current[f][1] for f in new_files]})
+        conn.execute("COMMIT")
+
+    return len(new_files), len(stale)
+
+
+def process_historical_data(data_dir, output_path=None, model_output_path=None,
+                            compression='zstd', model_compression='snappy', metrics=None,
+                            state_db=None, delta_method='lag'):
     """
     Process historical parquet files to compute daily downloads by author.
 
     Args:
         data_dir: Path to directory containing historical parquet files
         output_path: Optional path to save author-level results as Parquet
-        model_output_path: Optional path to save model-level results as Parquet
+        model_output_path: Optional directory to save model-level results as a
+            Parquet dataset partitioned by snapshot_date (hive-style
+            snapshot_date=YYYY-MM-DD subdirectories)
+        compression: Parquet compression codec for the author-level output
+        model_compression: Parquet compression codec for the model-level output,
+            which is large and read locally, so a fast codec is the default
+        metrics: Metric names to compute (default: all of METRICS); downloads
+            are always included, and unused columns are never read from the
+            snapshots
+        state_db: Optional DuckDB database file that keeps loaded snapshots
+            across runs, so only new or changed snapshot files are read; it
+            mirrors the files in data_dir (default: load everything into memory)
+        delta_method: How daily changes are computed, 'lag' or 'join'
+            (see build_daily_model_query)
 
     Returns:
         DuckDB relation with daily downloads by author
@@ -101,13 +425,22 @@ def process_historical_data(data_dir, output_path=None, model_output_path=None):
     timings = {}
 
     data_dir = Path(data_dir)
-
-    # Initialize DuckDB connection
-    conn = duckdb.connect()
-
-    # Configure DuckDB for large datasets
-    conn.execute("SET preserve_insertion_order=false")
-    conn.execute("SET threads=4")
+    # Downloads drive the row filters and the summaries, so they are always kept
+    if metrics is None:
+        metrics = list(METRICS)
+    else:
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))} (choose from {', '.join(METRICS)})")
+        metrics = [m for m in METRICS if m in metrics or m == 'downloads']
+
+    # The state database needs its own connection; otherwise share the process one
+    if state_db:
+        state_db = Path(state_db)
+        state_db.parent.mkdir(parents=True, exist_ok=True)
+        conn = configure_conn(duckdb.connect(str(state_db)))
+    else:
+        conn = get_conn()
 
     print(f"Processing historical data from: {data_dir}")
 
@@ -124,128 +457,94 @@ def process_historical_data(data_dir, output_path=None, model_output_path=None):
     print("\nStep 1: Loading historical data...")
     step_start = time.time()
 
-    # Create a union of all files with their respective dates
-    union_queries = []
-    for file_path in parquet_files:
-        date = extract_date_from_filename(file_path.name)
-        if date:
-            # Extract author from id (format: "author/model-name")
-            query = f"""
-                SELECT
-                    '{date}'::DATE as snapshot_date,
-                    id,
-                    SPLIT_PART(id, '/', 1) as author,
-                    downloadsAllTime,
-                    likes,
-                    trendingScore,
-                    downloads as downloads30
-                FROM '{file_path}'
-                WHERE id IS NOT NULL
-                  AND downloadsAllTime IS NOT NULL
-                  AND SPLIT_PART(id, '/', 1) != ''
-            """
-            union_queries.append(query)
-
-    if not union_queries:
-        raise ValueError("No valid dates extracted from filenames")
+    # Only files whose names carry a snapshot date take part in the load
+    dated_files = [str(p) for p in parquet_files if extract_date_from_filename(p.name)]
 
-    # Combine all snapshots
-    full_union_query = " UNION ALL ".join(union_queries)
+    if not dated_files:
+        raise ValueError("No valid dates extracted from filenames")
 
-    conn.execute(f"CREATE OR REPLACE TEMP TABLE all_snapshots AS {full_union_query}")
+    if state_db:
+        # Only snapshot files not loaded before (or changed since) are read
+        n_new, n_removed = sync_state_db(conn, [str(Path(f).resolve()) for f in dated_files])
+        print(f"Appended {n_new} snapshot files to {state_db} and removed {n_removed} "
+              f"({len(dated_files) - n_new} already loaded)")
+    else:
+        conn.execute(f"CREATE OR REPLACE TEMP TABLE all_snapshots AS {build_snapshot_query(metrics)}",
+                     {'files': dated_files})
 
     # Check the data
-    result = conn.execute("SELECT COUNT(*) as total_rows FROM all_snapshots").fetchdf()
+    total_rows = conn.execute("SELECT COUNT(*) FROM all_snapshots").fetchone()[0]
     timings['load_data'] = time.time() - step_start
-    print(f"Loaded {result['total_rows'][0]:,} total rows across all snapshots (took {timings['load_data']:.2f}s)")
+    print(f"Loaded {total_rows:,} total rows across all snapshots (took {timings['load_data']:.2f}s)")
 
-    # Step 2: Calculate daily downloads per model
-    print("\nStep 2: Calculating daily downloads per model...")
-    step_start = time.time()
+    if model_output_path:
+        # Step 2: Calculate daily downloads per model
+        print("\nStep 2: Calculating daily downloads per model...")
+        step_start = time.time()
 
-    conn.execute("""
-        CREATE OR REPLACE TEMP TABLE daily_model_downloads AS
-        SELECT
-            snapshot_date,
-            id,
-            author,
-            downloadsAllTime,
-            likes,
-            trendingScore,
-            downloads30,
-            downloadsAllTime - LAG(downloadsAllTime) OVER (
-                PARTITION BY id
-                ORDER BY snapshot_date
-            ) as daily_downloads,
-            likes - LAG(likes) OVER (
-                PARTITION BY id
-                ORDER BY snapshot_date
-            ) as daily_likes,
-            trendingScore - LAG(trendingScore) OVER (
-                PARTITION BY id
-                ORDER BY snapshot_date
-            ) as daily_trending_score,
-            downloads30 - LAG(downloads30) OVER (
-                PARTITION BY id
-                ORDER BY snapshot_date
-            ) as daily_downloads30
-        FROM all_snapshots
-        ORDER BY id, snapshot_date
-    """)
-    timings['calculate_daily_downloads'] = time.time() - step_start
-    print(f"Calculated daily downloads per model (took {timings['calculate_daily_downloads']:.2f}s)")
+        conn.execute(f"CREATE OR REPLACE TEMP TABLE daily_model_downloads AS {build_daily_model_query(metrics, delta_method)}")
+        timings['calculate_daily_downloads'] = time.time() - step_start
+        print(f"Calculated daily downloads per model (took {timings['calculate_daily_downloads']:.2f}s)")
 
-    # Save model-level results if output path is provided
-    if model_output_path:
+        # Save model-level results, one directory per snapshot date so date-range
+        # reads (read_parquet('.../**/*.parquet', hive_partitioning=true)) prune
         model_output_path = Path(model_output_path)
         model_output_path.parent.mkdir(parents=True, exist_ok=True)
 
         print(f"\nSaving model-level results to: {model_output_path}")
         step_start = time.time()
         conn.execute(f"""
-            COPY daily_model_downloads
-            TO '{model_output_path}'
-            (FORMAT PARQUET, COMPRESSION ZSTD)
+            COPY (
+                SELECT * FROM daily_model_downloads
+                ORDER BY id, snapshot_date
+            ) TO {sql_quote(model_output_path)}
+            ({parquet_copy_options(model_compression)}, PARTITION_BY (snapshot_date), OVERWRITE)
         """)
         timings['save_model_output'] = time.time() - step_start
 
-        file_size_mb = model_output_path.stat().st_size / (1024 * 1024)
+        file_size_mb = sum(f.stat().st_size for f in model_output_path.rglob('*.parquet')) / (1024 * 1024)
         print(f"Saved {model_output_path.name} ({file_size_mb:.2f} MB) (took {timings['save_model_output']:.2f}s)")
 
+        daily_model_source = "daily_model_downloads"
+    else:
+        # Without a model-level output the window query streams straight into
+        # the author aggregation instead of being materialized
+        print("\nStep 2: Daily downloads per model are computed inline with Step 3")
+        daily_model_source = f"({build_daily_model_query(metrics, delta_method)})"
+
     # Step 3: Aggregate by author and date
     print("\nStep 3: Aggregating by author and date...")
     step_start = time.time()
+    author_query = build_author_query(metrics, daily_model_source)
 
-    conn.execute("""
-        CREATE OR REPLACE TEMP TABLE author_daily_downloads AS
-        SELECT
-            snapshot_date,
-            author,
-            COUNT(DISTINCT id) as n_models,
-            SUM(daily_downloads) as total_daily_downloads,
-            AVG(daily_downloads) as avg_daily_downloads_per_model,
-            SUM(downloadsAllTime) as total_cumulative_downloads,
-            SUM(daily_likes) as total_daily_likes,
-            AVG(daily_likes) as avg_daily_likes_per_model,
-            SUM(likes) as total_cumulative_likes,
-            SUM(daily_trending_score) as total_daily_trending_score,
-            AVG(daily_trending_score) as avg_daily_trending_score_per_model,
-            SUM(trendingScore) as total_cumulative_trending_score,
-            SUM(daily_downloads30) as total_daily_downloads30,
-            AVG(daily_downloads30) as avg_daily_downloads30_per_model,
-            SUM(downloads30) as total_cumulative_downloads30
-        FROM daily_model_downloads
-        WHERE daily_downloads IS NOT NULL
-          AND daily_downloads >= 0  -- Filter out negative values (data anomalies)
-        GROUP BY snapshot_date, author
-        ORDER BY snapshot_date, total_daily_downloads DESC
-    """)
-    timings['aggregate_by_author'] = time.time() - step_start
-    print(f"Aggregated by author and date (took {timings['aggregate_by_author']:.2f}s)")
+    if output_path:
+        # Stream the aggregation straight to Parquet and read it back for the
+        # summaries instead of materializing a temp table
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        print(f"Saving results to: {output_path}")
+        conn.execute(f"""
+            COPY (
+                {author_query}
+                ORDER BY snapshot_date, total_daily_downloads DESC
+            ) TO {sql_quote(output_path)}
+            ({parquet_copy_options(compression)})
+        """)
+        author_source = f"read_parquet({sql_quote(output_path)})"
+        timings['aggregate_by_author'] = time.time() - step_start
+
+        file_size_mb = output_path.stat().st_size / (1024 * 1024)
+        print(f"Aggregated by author and date and saved {output_path.name} ({file_size_mb:.2f} MB) (took {timings['aggregate_by_author']:.2f}s)")
+    else:
+        conn.execute(f"CREATE OR REPLACE TEMP TABLE author_daily_downloads AS {author_query}")
+        author_source = "author_daily_downloads"
+        timings['aggregate_by_author'] = time.time() - step_start
+        print(f"Aggregated by author and date (took {timings['aggregate_by_author']:.2f}s)")
 
     # Show summary statistics
     print("\nSummary Statistics:")
-    summary = conn.execute("""
+    conn.sql(f"""
         SELECT
             COUNT(DISTINCT snapshot_date) as n_days,
             COUNT(DISTINCT author) as n_authors,
@@ -253,42 +552,23 @@ def process_historical_data(data_dir, output_path=None, model_output_path=None):
             MAX(snapshot_date) as last_date,
             SUM(total_daily_downloads) as grand_total_downloads,
             AVG(total_daily_downloads) as avg_daily_downloads
-        FROM author_daily_downloads
-    """).fetchdf()
-    print(summary.to_string())
+        FROM {author_source}
+    """).show()
 
     # Show top authors by total daily downloads
     print("\nTop 10 Authors by Total Daily Downloads:")
-    top_authors = conn.execute("""
+    conn.sql(f"""
         SELECT
             author,
             COUNT(DISTINCT snapshot_date) as n_days_active,
             SUM(total_daily_downloads) as total_downloads,
             AVG(total_daily_downloads) as avg_daily_downloads,
             MAX(n_models) as max_models
-        FROM author_daily_downloads
+        FROM {author_source}
         GROUP BY author
         ORDER BY total_downloads DESC
         LIMIT 10
-    """).fetchdf()
-    print(top_authors.to_string(index=False))
-
-    # Save results if output path is provided
-    if output_path:
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        print(f"\nSaving results to: {output_path}")
-        step_start = time.time()
-        conn.execute(f"""
-            COPY author_daily_downloads
-            TO '{output_path}'
-            (FORMAT PARQUET, COMPRESSION ZSTD)
-        """)
-        timings['save_output'] = time.time() - step_start
-
-        file_size_mb = output_path.stat().st_size / (1024 * 1024)
-        print(f"Saved {output_path.name} ({file_size_mb:.2f} MB) (took {timings['save_output']:.2f}s)")
+    """).show()
 
     # Calculate total time
     total_time = time.time() - start_time
@@ -300,18 +580,26 @@ def process_historical_data(data_dir, output_path=None, model_output_path=None):
     print("="*80)
     print(f"File discovery:              {timings['file_discovery']:>8.2f}s ({timings['file_discovery']/total_time*100:>5.1f}%)")
     print(f"Load data:                   {timings['load_data']:>8.2f}s ({timings['load_data']/total_time*100:>5.1f}%)")
-    print(f"Calculate daily downloads:   {timings['calculate_daily_downloads']:>8.2f}s ({timings['calculate_daily_downloads']/total_time*100:>5.1f}%)")
+    if 'calculate_daily_downloads' in timings:
+        print(f"Calculate daily downloads:   {timings['calculate_daily_downloads']:>8.2f}s ({timings['calculate_daily_downloads']/total_time*100:>5.1f}%)")
     if 'save_model_output' in timings:
         print(f"Save model output:           {timings['save_model_output']:>8.2f}s ({timings['save_model_output']/total_time*100:>5.1f}%)")
     print(f"Aggregate by author:         {timings['aggregate_by_author']:>8.2f}s ({timings['aggregate_by_author']/total_time*100:>5.1f}%)")
-    if 'save_output' in timings:
-        print(f"Save author output:          {timings['save_output']:>8.2f}s ({timings['save_output']/total_time*100:>5.1f}%)")
     print("-" * 80)
     print(f"TOTAL TIME:                  {total_time:>8.2f}s")
     print("="*80)
 
     # Return the result relation for further analysis
-    return conn.execute("SELECT * FROM author_daily_downloads")
+    result = conn.execute(f"""
+        SELECT * FROM {author_source}
+        ORDER BY snapshot_date, total_daily_downloads DESC
+    """)
+    if state_db:
+        # The author-level result is small, so it is handed over to the shared
+        # connection before the state database is closed
+        result = get_conn().from_arrow(result.arrow())
+        conn.close()
+    return result
 
 
 def main():
@@ -350,7 +638,36 @@ def main():
     parser.add_argument(
         '--model-output',
         type=str,
-        help='Path for model-level output (historical mode only)'
+        help='Directory for model-level output, partitioned by snapshot date (historical mode only)'
+    )
+    parser.add_argument(
+        '--compression',
+        choices=sorted(COMPRESSION_OPTIONS),
+        default='zstd',
+        help='Parquet compression for cleaned and author-level outputs (default: zstd)'
+    )
+    parser.add_argument(
+        '--model-compression',
+        choices=sorted(COMPRESSION_OPTIONS),
+        default='snappy',
+        help='Parquet compression for model-level output (default: snappy)'
+    )
+    parser.add_argument(
+        '--state-db',
+        type=str,
+        help='DuckDB file that keeps loaded snapshots between runs (default: load every snapshot into memory)'
+    )
+    parser.add_argument(
+        '--delta-method',
+        choices=DELTA_METHODS,
+        default='lag',
+        help="Daily change computation: 'lag' window (default) or 'join' to the previous snapshot, "
+             "faster when every model appears in every snapshot"
+    )
+    parser.add_argument(
+        '--metrics',
+        type=str,
+        help=f"Comma-separated metrics to compute in historical mode ({','.join(METRICS)}; default: all)"
     )
     parser.add_argument(
         '--debug',
@@ -378,10 +695,23 @@ def main():
         script_dir = Path(__file__).parent
         data_dir = Path(args.historical_dir) if args.historical_dir else script_dir.parent / 'data' / 'raw' / 'historical'
         author_output = Path(args.author_output) if args.author_output else script_dir.parent / 'data' / 'processed' / 'author_daily_downloads.parquet'
-        model_output = Path(args.model_output) if args.model_output else script_dir.parent / 'data' / 'processed' / 'daily_model_downloads.parquet'
+        model_output = Path(args.model_output) if args.model_output else script_dir.parent / 'data' / 'processed' / 'daily_model_downloads'
+        state_db = Path(args.state_db) if args.state_db else None
+
+        try:
+            metrics = parse_metrics(args.metrics)
+        except ValueError as e:
+            parser.error(str(e))
 
         # Process the data
-        result = process_historical_data(data_dir, author_output, model_output)
+        result = process_historical_data(
+            data_dir, author_output, model_output,
+            compression=args.compression,
+            model_compression=args.model_compression,
+            metrics=metrics,
+            delta_method=args.delta_method,
+            state_db=state_db
+        )
 
         print("\n" + "="*80)
         print("Processing complete!")
@@ -409,7 +739,7 @@ def main():
             print(f"Error: File not found: {parquet_path}")
             return 1
 
-        clean_models_parquet(parquet_path, output_path)
+        clean_models_parquet(parquet_path, output_path, compression=args.compression)
 
         print("="*80)
         print("Cleaning complete!")
@@ -420,4 +750,8 @@ def main():
 
 if __name__ == "__main__":
     import sys
-    sys.exit(main())
+    try:
+        exit_code = main()
+    finally:
+        close_conn()
+    sys.exit(exit_code)
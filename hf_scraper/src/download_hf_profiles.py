@@ -4,22 +4,105 @@ Get Top HuggingFace Profiles by Downloads
 This script loads the models.parquet file, identifies the top N profiles by total
 downloads across all their models, and scrapes profile data using scrape_hf_profile.
 Results are saved to a JSONL file, with failed profiles (429 errors) logged separately.
+Fetched pages are cached on disk (see scrape_hf_profile), so re-runs only hit the
+network for profiles that haven't been fetched yet (--no-cache / --max-age to override).
+
+Profiles can be scraped concurrently (--concurrency N): up to N page fetches are in
+flight at once, rate limited by a token bucket refilled at --rpm requests per minute.
+Retry mode (--retry-file) uses the same concurrent path.
+
+After each run the JSONL output is also written as a ZSTD Parquet file alongside it.
 """
 
+import asyncio
 import json
 import logging
 import argparse
+import random
 import time
+from functools import partial
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Optional, Tuple
 
+import duckdb
 import pandas as pd
 
-from scrape_hf_profile import scrape_hf_profile
+from scrape_hf_profile import scrape_hf_profile, scrape_cached_profile, DEFAULT_CACHE_DIR
 
 logger = logging.getLogger(__name__)
 
+# Default number of profile pages fetched at once
+DEFAULT_CONCURRENCY = 16
+
+# Default request rate for concurrent scraping (same as a 0.5s delay)
+DEFAULT_RPM = 120
+
+# Output files are written through a 1 MiB buffer and flushed every FLUSH_EVERY profiles
+WRITE_BUFFER_SIZE = 1 << 20
+FLUSH_EVERY = 50
+
+
+class RetryLog:
+    """
+    Append-only list of profiles to retry.
+
+    The file is opened on the first failure and kept open, so runs without
+    failures leave no empty retry file behind.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def add(self, author: str):
+        if self._file is None:
+            self._file = open(self.path, 'a', buffering=WRITE_BUFFER_SIZE)
+        self._file.write(f"{author}\n")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_parquet(jsonl_path: Path) -> Optional[Path]:
+    """
+    Write a ZSTD-compressed Parquet copy of a profiles JSONL file next to it.
+
+    The JSONL file stays the source of truth; the Parquet copy is for fast
+    downstream queries, so a failed conversion is logged and skipped.
+
+    Args:
+        jsonl_path: Path to the profiles JSONL file
+
+    Returns:
+        Path to the Parquet file, or None if nothing was written
+    """
+    if not jsonl_path.exists() or jsonl_path.stat().st_size == 0:
+        return None
+
+    parquet_path = jsonl_path.with_suffix('.parquet')
+    try:
+        duckdb.execute(f"""
+            COPY (SELECT * FROM read_json_auto($source, sample_size=-1))
+            TO '{str(parquet_path).replace("'", "''")}'
+            (FORMAT PARQUET, COMPRESSION ZSTD)
+        """, {'source': str(jsonl_path)})
+    except duckdb.Error as e:
+        logger.warning(f"Could not write Parquet copy of {jsonl_path}: {e}")
+        return None
+
+    logger.info(f"Parquet copy saved to: {parquet_path}")
+    return parquet_path
+
 
 def load_and_rank_authors(
     parquet_path: Path,
@@ -37,24 +120,29 @@ def load_and_rank_authors(
     """
     logger.info(f"Loading parquet file from {parquet_path}")
 
-    # Read only the columns we need for efficiency
-    df = pd.read_parquet(parquet_path, columns=['author', 'downloadsAllTime'])
-
-    logger.info(f"Loaded {len(df):,} models")
-
-    # Group by author and sum downloads
-    author_downloads = df.groupby('author')['downloadsAllTime'].sum().reset_index()
-    author_downloads.columns = ['author', 'total_downloads']
-
-    # Sort by total downloads descending
-    author_downloads = author_downloads.sort_values('total_downloads', ascending=False)
-
-    # Get top N
-    top_authors = author_downloads.head(top_n)
+    # Aggregate and rank on DuckDB's shared default connection, which reads
+    # only the two needed columns
+    n_models = duckdb.execute(
+        "SELECT COUNT(*) FROM read_parquet(?)", [str(parquet_path)]
+    ).fetchone()[0]
+
+    logger.info(f"Loaded {n_models:,} models")
+
+    # Sum downloads per author and keep the top N
+    top_authors = duckdb.execute("""
+        SELECT
+            author,
+            CAST(COALESCE(SUM(downloadsAllTime), 0) AS BIGINT) as total_downloads
+        FROM read_parquet(?)
+        WHERE author IS NOT NULL
+        GROUP BY author
+        ORDER BY total_downloads DESC
+        LIMIT ?
+    """, [str(parquet_path), top_n]).df()
 
     logger.info(f"Top {top_n} authors by downloads:")
-    for idx, row in top_authors.head(10).iterrows():
-        logger.info(f"  {row['author']}: {row['total_downloads']:,} downloads")
+    for author, total_downloads in zip(top_authors['author'].head(10), top_authors['total_downloads'].head(10)):
+        logger.info(f"  {author}: {total_downloads:,} downloads")
     if top_n > 10:
         logger.info(f"  ... and {top_n - 10} more")
 
@@ -66,7 +154,9 @@ def scrape_profiles(
     output_dir: Path,
     run_timestamp: str,
     top_n: int,
-    delay: float = 0.5
+    delay: float = 0.5,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = None
 ) -> Dict[str, List[str]]:
     """
     Scrape profile data for each author.
@@ -77,6 +167,8 @@ def scrape_profiles(
         run_timestamp: Timestamp string for filenames
         top_n: Number of profiles being scraped (for filename)
         delay: Delay between requests in seconds (default: 0.5)
+        cache_dir: Directory for cached profile pages (None disables the cache)
+        max_age: Maximum age of cached pages in seconds (None = never expires)
 
     Returns:
         Dictionary with 'success' and 'retry' lists of profile names
@@ -96,16 +188,21 @@ def scrape_profiles(
     logger.info(f"Output file: {output_file}")
     logger.info(f"Retry file: {retry_file}")
 
-    with open(output_file, 'w') as f_out:
-        for i, (idx, row) in enumerate(authors.iterrows()):
-            author = row['author']
-            total_downloads = row['total_downloads']
+    with open(output_file, 'w', buffering=WRITE_BUFFER_SIZE) as f_out, RetryLog(retry_file) as retry_log:
+        # Plain Python lists avoid building a pandas Series per row
+        names = authors['author'].tolist()
+        downloads = authors['total_downloads'].tolist()
+        for i, (author, total_downloads) in enumerate(zip(names, downloads)):
 
             logger.info(f"[{i + 1}/{len(authors)}] Scraping {author} ({total_downloads:,} downloads)")
 
+            fetched = False
             try:
-                # Scrape profile
-                result = scrape_hf_profile(author)
+                # Cached pages are parsed directly; only real fetches are rate limited
+                result = scrape_cached_profile(author, cache_dir=cache_dir, max_age=max_age)
+                if result is None:
+                    fetched = True
+                    result = scrape_hf_profile(author, cache_dir=cache_dir, max_age=max_age)
 
                 # Check for errors
                 if result.get('error'):
@@ -115,10 +212,7 @@ def scrape_profiles(
                     if '429' in str(error_msg):
                         logger.warning(f"Rate limited on {author} - adding to retry list")
                         results['retry'].append(author)
-
-                        # Write to retry file immediately
-                        with open(retry_file, 'a') as f_retry:
-                            f_retry.write(f"{author}\n")
+                        retry_log.add(author)
 
                         # Wait longer before next request
                         logger.info(f"Waiting 60 seconds before continuing...")
@@ -126,33 +220,277 @@ def scrape_profiles(
                     else:
                         logger.error(f"Error scraping {author}: {error_msg}")
                         results['retry'].append(author)
-
-                        # Write to retry file
-                        with open(retry_file, 'a') as f_retry:
-                            f_retry.write(f"{author}\n")
+                        retry_log.add(author)
                 else:
                     # Add download stats to result
                     result['total_downloads'] = int(total_downloads)
 
                     # Write to JSONL file
                     f_out.write(json.dumps(result) + '\n')
-                    f_out.flush()  # Ensure written to disk
 
                     results['success'].append(author)
+                    if len(results['success']) % FLUSH_EVERY == 0:
+                        f_out.flush()
                     logger.info(f"Successfully scraped {author}")
 
             except Exception as e:
                 logger.error(f"Unexpected error scraping {author}: {e}", exc_info=True)
                 results['retry'].append(author)
-
-                # Write to retry file
-                with open(retry_file, 'a') as f_retry:
-                    f_retry.write(f"{author}\n")
+                retry_log.add(author)
 
             # Rate limiting delay
-            if i < len(authors) - 1:  # Don't wait after last request
+            if fetched and i < len(authors) - 1:  # Don't wait after cache hits or the last request
                 time.sleep(delay)
 
+    export_parquet(output_file)
+
+    logger.info(f"\nScraping complete!")
+    logger.info(f"Successfully scraped: {len(results['success'])} profiles")
+    logger.info(f"Profiles to retry: {len(results['retry'])} profiles")
+
+    if results['retry']:
+        logger.info(f"Retry list saved to: {retry_file}")
+
+    return results
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for asyncio tasks.
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so short
+    bursts are allowed while the long-run request rate stays at `rate`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.min_rate = rate / 16
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available, then take it."""
+        async with self.lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def throttle(self, retry_after: Optional[float] = None):
+        """
+        Back off after a 429: halve the refill rate and, if the server sent a
+        Retry-After, hold all requests until it has passed.
+        """
+        self._refill()
+        self.rate = max(self.rate * 0.5, self.min_rate)
+        if retry_after:
+            self.tokens = min(self.tokens, 0) - retry_after * self.rate
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(retry_at.tzinfo)).total_seconds(), 0.0)
+
+
+async def scrape_concurrently(
+    profiles: List[Tuple[str, Optional[int]]],
+    output_file: Path,
+    retry_file: Path,
+    results: Dict[str, List[str]],
+    file_mode: str = 'w',
+    rpm: float = DEFAULT_RPM,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = 3,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = None
+):
+    """
+    Scrape profiles with up to `concurrency` requests in flight.
+
+    Profiles with a cached page are parsed straight away. Each real fetch runs in
+    a worker thread bounded by an asyncio.Semaphore and takes a token from a
+    TokenBucket refilled at `rpm` requests per minute. On a 429 the
+    bucket rate is halved, the Retry-After header is honoured, and the profile is
+    retried with exponential backoff and jitter before being added to the retry
+    list. Scraped profiles go through an asyncio.Queue to a single writer task, so
+    JSONL lines are appended whole and in completion order.
+
+    Args:
+        profiles: (profile name, total downloads) pairs; downloads may be None
+        output_file: JSONL file to write scraped profiles to
+        retry_file: Text file listing profiles that failed
+        results: Dictionary with 'success' and 'retry' lists, updated in place
+        file_mode: 'w' to start a new output file, 'a' to append to one
+        rpm: Target requests per minute
+        concurrency: Maximum number of concurrent requests, also the burst size
+        max_retries: Retries per profile after a 429 before giving up
+        cache_dir: Directory for cached profile pages (None disables the cache)
+        max_age: Maximum age of cached pages in seconds (None = never expires)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate=rpm / 60, capacity=concurrency)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    total = len(profiles)
+    scrape = partial(scrape_hf_profile, cache_dir=cache_dir, max_age=max_age)
+    scrape_cached = partial(scrape_cached_profile, cache_dir=cache_dir, max_age=max_age)
+
+    retry_log = RetryLog(retry_file)
+
+    def mark_retry(author):
+        results['retry'].append(author)
+        retry_log.add(author)
+
+    async def write_results(f_out):
+        written = 0
+        while (line := await queue.get()) is not None:
+            f_out.write(line)
+            written += 1
+            if written % FLUSH_EVERY == 0:
+                f_out.flush()
+
+    async def fetch(i, author, total_downloads):
+        if total_downloads is None:
+            logger.info(f"[{i + 1}/{total}] Scraping {author}")
+        else:
+            logger.info(f"[{i + 1}/{total}] Scraping {author} ({total_downloads:,} downloads)")
+
+        for attempt in range(max_retries + 1):
+            try:
+                # Cached pages are parsed without taking a token from the bucket
+                result = await asyncio.to_thread(scrape_cached, author)
+                if result is None:
+                    await bucket.acquire()
+                    async with semaphore:
+                        result = await asyncio.to_thread(scrape, author)
+            except Exception as e:
+                logger.error(f"Unexpected error scraping {author}: {e}", exc_info=True)
+                mark_retry(author)
+                return
+
+            error_msg = result.get('error')
+
+            # Rate limited: slow down and retry with backoff
+            if error_msg and '429' in str(error_msg):
+                retry_after = parse_retry_after(result.get('retry_after'))
+                bucket.throttle(retry_after)
+
+                if attempt == max_retries:
+                    logger.warning(f"Rate limited on {author} - adding to retry list")
+                    mark_retry(author)
+                    return
+
+                backoff = retry_after or (2 ** attempt + random.uniform(0, 1))
+                logger.warning(f"Rate limited on {author} - retrying in {backoff:.1f}s "
+                               f"(now {bucket.rate * 60:.0f} requests/min)")
+                await asyncio.sleep(backoff)
+                continue
+
+            if error_msg:
+                logger.error(f"Error scraping {author}: {error_msg}")
+                mark_retry(author)
+                return
+
+            # Add download stats to result
+            if total_downloads is not None:
+                result['total_downloads'] = int(total_downloads)
+
+            await queue.put(json.dumps(result) + '\n')
+
+            results['success'].append(author)
+            logger.info(f"Successfully scraped {author}")
+            return
+
+    with open(output_file, file_mode, buffering=WRITE_BUFFER_SIZE) as f_out, retry_log:
+        writer = asyncio.create_task(write_results(f_out))
+        try:
+            await asyncio.gather(*[
+                fetch(i, author, total_downloads)
+                for i, (author, total_downloads) in enumerate(profiles)
+            ])
+        finally:
+            await queue.put(None)
+            await writer
+
+
+async def scrape_profiles_async(
+    authors: pd.DataFrame,
+    output_dir: Path,
+    run_timestamp: str,
+    top_n: int,
+    rpm: float = DEFAULT_RPM,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = 3,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = None
+) -> Dict[str, List[str]]:
+    """
+    Scrape profile data for each author with up to `concurrency` requests in flight.
+
+    See scrape_concurrently for the rate limiting and retry behaviour.
+
+    Args:
+        authors: DataFrame with author names and total downloads
+        output_dir: Directory to save output files
+        run_timestamp: Timestamp string for filenames
+        top_n: Number of profiles being scraped (for filename)
+        rpm: Target requests per minute (default: 120)
+        concurrency: Maximum number of concurrent requests, also the burst size (default: 16)
+        max_retries: Retries per profile after a 429 before giving up (default: 3)
+        cache_dir: Directory for cached profile pages (None disables the cache)
+        max_age: Maximum age of cached pages in seconds (None = never expires)
+
+    Returns:
+        Dictionary with 'success' and 'retry' lists of profile names
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Create output file paths
+    output_file = output_dir / f"profiles_top{top_n}_{run_timestamp}.jsonl"
+    retry_file = output_dir / f"profiles_retry_top{top_n}_{run_timestamp}.txt"
+
+    results = {
+        'success': [],
+        'retry': []
+    }
+
+    logger.info(f"Scraping {len(authors)} profiles ({concurrency} concurrent requests, {rpm:g} requests/min)...")
+    logger.info(f"Output file: {output_file}")
+    logger.info(f"Retry file: {retry_file}")
+
+    await scrape_concurrently(
+        list(zip(authors['author'], authors['total_downloads'])),
+        output_file,
+        retry_file,
+        results,
+        file_mode='w',
+        rpm=rpm,
+        concurrency=concurrency,
+        max_retries=max_retries,
+        cache_dir=cache_dir,
+        max_age=max_age
+    )
+
+    export_parquet(output_file)
+
     logger.info(f"\nScraping complete!")
     logger.info(f"Successfully scraped: {len(results['success'])} profiles")
     logger.info(f"Profiles to retry: {len(results['retry'])} profiles")
@@ -166,7 +504,9 @@ def scrape_profiles(
 def retry_failed_profiles(
     retry_file_path: Path,
     output_file_path: Path,
-    delay: float = 0.5
+    delay: float = 0.5,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = None
 ) -> Dict[str, List[str]]:
     """
     Retry scraping profiles from a retry file and append to output file.
@@ -175,6 +515,8 @@ def retry_failed_profiles(
         retry_file_path: Path to retry file with list of profile names
         output_file_path: Path to JSONL file to append results to
         delay: Delay between requests in seconds
+        cache_dir: Directory for cached profile pages (None disables the cache)
+        max_age: Maximum age of cached pages in seconds (None = never expires)
 
     Returns:
         Dictionary with 'success' and 'retry' lists of profile names
@@ -196,13 +538,17 @@ def retry_failed_profiles(
     }
 
     # Open output file in append mode
-    with open(output_file_path, 'a') as f_out:
+    with open(output_file_path, 'a', buffering=WRITE_BUFFER_SIZE) as f_out, RetryLog(new_retry_file) as retry_log:
         for i, author in enumerate(profiles):
             logger.info(f"[{i + 1}/{len(profiles)}] Retrying {author}")
 
+            fetched = False
             try:
-                # Scrape profile
-                result = scrape_hf_profile(author)
+                # Cached pages are parsed directly; only real fetches are rate limited
+                result = scrape_cached_profile(author, cache_dir=cache_dir, max_age=max_age)
+                if result is None:
+                    fetched = True
+                    result = scrape_hf_profile(author, cache_dir=cache_dir, max_age=max_age)
 
                 # Check for errors
                 if result.get('error'):
@@ -212,10 +558,7 @@ def retry_failed_profiles(
                     if '429' in str(error_msg):
                         logger.warning(f"Rate limited on {author} - adding to new retry list")
                         results['retry'].append(author)
-
-                        # Write to new retry file
-                        with open(new_retry_file, 'a') as f_retry:
-                            f_retry.write(f"{author}\n")
+                        retry_log.add(author)
 
                         # Wait longer before next request
                         logger.info(f"Waiting 60 seconds before continuing...")
@@ -223,30 +566,27 @@ def retry_failed_profiles(
                     else:
                         logger.error(f"Error scraping {author}: {error_msg}")
                         results['retry'].append(author)
-
-                        # Write to new retry file
-                        with open(new_retry_file, 'a') as f_retry:
-                            f_retry.write(f"{author}\n")
+                        retry_log.add(author)
                 else:
                     # Write to JSONL file (append mode)
                     f_out.write(json.dumps(result) + '\n')
-                    f_out.flush()
 
                     results['success'].append(author)
+                    if len(results['success']) % FLUSH_EVERY == 0:
+                        f_out.flush()
                     logger.info(f"Successfully scraped {author}")
 
             except Exception as e:
                 logger.error(f"Unexpected error scraping {author}: {e}", exc_info=True)
                 results['retry'].append(author)
-
-                # Write to new retry file
-                with open(new_retry_file, 'a') as f_retry:
-                    f_retry.write(f"{author}\n")
+                retry_log.add(author)
 
             # Rate limiting delay
-            if i < len(profiles) - 1:
+            if fetched and i < len(profiles) - 1:
                 time.sleep(delay)
 
+    export_parquet(output_file_path)
+
     logger.info(f"\nRetry complete!")
     logger.info(f"Successfully scraped: {len(results['success'])} profiles")
     logger.info(f"Profiles still failing: {len(results['retry'])} profiles")
@@ -257,7 +597,82 @@ def retry_failed_profiles(
     return results
 
 
-def download_hf_profiles(parquet_path: Path, output_dir: Path, top_n: int = 1000, delay: float = 0.5):
+async def retry_failed_profiles_async(
+    retry_file_path: Path,
+    output_file_path: Path,
+    rpm: float = DEFAULT_RPM,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = 3,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = None
+) -> Dict[str, List[str]]:
+    """
+    Concurrently retry profiles from a retry file and append to output file.
+
+    Args:
+        retry_file_path: Path to retry file with list of profile names
+        output_file_path: Path to JSONL file to append results to
+        rpm: Target requests per minute (default: 120)
+        concurrency: Maximum number of concurrent requests (default: 16)
+        max_retries: Retries per profile after a 429 before giving up (default: 3)
+        cache_dir: Directory for cached profile pages (None disables the cache)
+        max_age: Maximum age of cached pages in seconds (None = never expires)
+
+    Returns:
+        Dictionary with 'success' and 'retry' lists of profile names
+    """
+    # Read profiles from retry file
+    with open(retry_file_path, 'r') as f:
+        profiles = [line.strip() for line in f if line.strip()]
+
+    logger.info(f"Retrying {len(profiles)} profiles from {retry_file_path} "
+                f"({concurrency} concurrent requests, {rpm:g} requests/min)")
+    logger.info(f"Appending results to {output_file_path}")
+
+    # Create new retry file for any remaining failures
+    retry_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    new_retry_file = retry_file_path.parent / f"{retry_file_path.stem}_retry_{retry_timestamp}.txt"
+
+    results = {
+        'success': [],
+        'retry': []
+    }
+
+    await scrape_concurrently(
+        [(author, None) for author in profiles],
+        output_file_path,
+        new_retry_file,
+        results,
+        file_mode='a',
+        rpm=rpm,
+        concurrency=concurrency,
+        max_retries=max_retries,
+        cache_dir=cache_dir,
+        max_age=max_age
+    )
+
+    export_parquet(output_file_path)
+
+    logger.info(f"\nRetry complete!")
+    logger.info(f"Successfully scraped: {len(results['success'])} profiles")
+    logger.info(f"Profiles still failing: {len(results['retry'])} profiles")
+
+    if results['retry']:
+        logger.info(f"New retry list saved to: {new_retry_file}")
+
+    return results
+
+
+def download_hf_profiles(
+    parquet_path: Path,
+    output_dir: Path,
+    top_n: int = 1000,
+    delay: float = 0.5,
+    concurrency: int = 1,
+    rpm: float = DEFAULT_RPM,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = None
+):
     """
     Download HuggingFace profiles for top N authors by downloads.
 
@@ -265,7 +680,11 @@ def download_hf_profiles(parquet_path: Path, output_dir: Path, top_n: int = 1000
         parquet_path: Path to models.parquet file
         output_dir: Directory to save output files
         top_n: Number of top profiles to scrape (default: 1000)
-        delay: Delay between requests in seconds (default: 0.5)
+        delay: Delay between requests in seconds when scraping sequentially (default: 0.5)
+        concurrency: Maximum number of concurrent requests; 1 scrapes sequentially (default: 1)
+        rpm: Requests per minute when scraping concurrently (default: 120)
+        cache_dir: Directory for cached profile pages (None disables the cache)
+        max_age: Maximum age of cached pages in seconds (None = never expires)
 
     Returns:
         Dictionary with 'success' and 'retry' lists of profile names
@@ -277,13 +696,27 @@ def download_hf_profiles(parquet_path: Path, output_dir: Path, top_n: int = 1000
     top_authors = load_and_rank_authors(parquet_path, top_n)
 
     # Scrape profiles
-    results = scrape_profiles(
-        top_authors,
-        output_dir,
-        run_timestamp,
-        top_n,
-        delay=delay
-    )
+    if concurrency > 1:
+        results = asyncio.run(scrape_profiles_async(
+            top_authors,
+            output_dir,
+            run_timestamp,
+            top_n,
+            rpm=rpm,
+            concurrency=concurrency,
+            cache_dir=cache_dir,
+            max_age=max_age
+        ))
+    else:
+        results = scrape_profiles(
+            top_authors,
+            output_dir,
+            run_timestamp,
+            top_n,
+            delay=delay,
+            cache_dir=cache_dir,
+            max_age=max_age
+        )
 
     return results
 
@@ -329,6 +762,28 @@ def main():
         default=0.5,
         help='Delay between requests in seconds (default: 0.5)'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Maximum number of concurrent requests; 1 scrapes sequentially (default: {DEFAULT_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--rpm',
+        type=float,
+        default=DEFAULT_RPM,
+        help=f'Requests per minute when scraping concurrently (default: {DEFAULT_RPM})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Always fetch profile pages instead of using the on-disk cache ({DEFAULT_CACHE_DIR})'
+    )
+    parser.add_argument(
+        '--max-age',
+        type=float,
+        help='Refetch cached profile pages older than this many hours (default: never expire)'
+    )
     parser.add_argument(
         '--debug',
         action='store_true',
@@ -343,6 +798,10 @@ def main():
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
+    # Page cache settings
+    cache_dir = None if args.no_cache else DEFAULT_CACHE_DIR
+    max_age = args.max_age * 3600 if args.max_age is not None else None
+
     # Retry mode
     if args.retry_file:
         retry_file_path = Path(args.retry_file)
@@ -365,11 +824,23 @@ def main():
             return 1
 
         logger.info("=== RETRY MODE ===")
-        results = retry_failed_profiles(
-            retry_file_path,
-            output_file_path,
-            delay=args.delay
-        )
+        if args.concurrency > 1:
+            results = asyncio.run(retry_failed_profiles_async(
+                retry_file_path,
+                output_file_path,
+                rpm=args.rpm,
+                concurrency=args.concurrency,
+                cache_dir=cache_dir,
+                max_age=max_age
+            ))
+        else:
+            results = retry_failed_profiles(
+                retry_file_path,
+                output_file_path,
+                delay=args.delay,
+                cache_dir=cache_dir,
+                max_age=max_age
+            )
 
         logger.info("Done!")
         return 0
@@ -395,13 +866,27 @@ def main():
     top_authors = load_and_rank_authors(parquet_path, args.top_n)
 
     # Scrape profiles
-    results = scrape_profiles(
-        top_authors,
-        output_dir,
-        run_timestamp,
-        args.top_n,
-        delay=args.delay
-    )
+    if args.concurrency > 1:
+        results = asyncio.run(scrape_profiles_async(
+            top_authors,
+            output_dir,
+            run_timestamp,
+            args.top_n,
+            rpm=args.rpm,
+            concurrency=args.concurrency,
+            cache_dir=cache_dir,
+            max_age=max_age
+        ))
+    else:
+        results = scrape_profiles(
+            top_authors,
+            output_dir,
+            run_timestamp,
+            args.top_n,
+            delay=args.delay,
+            cache_dir=cache_dir,
+            max_age=max_age
+        )
 
     logger.info("Done!")
 
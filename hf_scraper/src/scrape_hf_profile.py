@@ -3,90 +3,343 @@ Scrape HuggingFace Profile Raw Data
 
 This script scrapes raw data-props elements from HuggingFace profile pages
 (users or organizations) and merges them into a single dictionary.
+
+Fetched pages are cached on disk (gzip-compressed, keyed by a blake2b hash of the
+URL) so repeated or resumed runs don't re-download profiles they've already seen.
+
+Many profiles can be scraped at once with scrape_hf_profiles(), which overlaps the
+page fetches with aiohttp when it is installed (worker threads otherwise).
 """
 
+import asyncio
 import json
+import gzip
+import hashlib
 import logging
 import html
+import re
+import time
 import requests
 import argparse
-from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pathlib import Path
+from typing import Dict, Any, List, Optional
 from bs4 import BeautifulSoup
 
+try:
+    import aiohttp
+except ImportError:  # optional: batch scrapes fall back to worker threads
+    aiohttp = None
+
+# lxml parses in C; without it we fall back to BeautifulSoup's pure-Python parser
+try:
+    from lxml import etree
+    HTML_PARSER = 'lxml'
+except ImportError:
+    etree = None
+    HTML_PARSER = 'html.parser'
+
+# orjson is much faster than the stdlib parser; fall back if it isn't installed
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
 logger = logging.getLogger(__name__)
 
+# Default on-disk cache for fetched profile pages
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'hf_scraper' / 'profiles'
+
+# Request headers sent with every profile page fetch
+HEADERS = {'User-Agent': 'HF-Data-Collection-Script/1.0'}
+
+# Default number of profile pages fetched at once by scrape_hf_profiles
+DEFAULT_BATCH_CONCURRENCY = 64
+
+# Seconds to wait for a profile page before giving up
+REQUEST_TIMEOUT = 30
+
+
+def _create_session() -> requests.Session:
+    """Shared session so repeated fetches reuse pooled keep-alive connections (no new TLS handshake)."""
+    session = requests.Session()
+    # Connection errors only; HTTP errors (incl. 429) are reported back to the caller
+    adapter = HTTPAdapter(
+        pool_connections=DEFAULT_BATCH_CONCURRENCY,
+        pool_maxsize=DEFAULT_BATCH_CONCURRENCY,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=None),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+_SESSION = _create_session()
+
+# Compiled once: every data-props attribute value on the page
+_DATA_PROPS_XPATH = etree.XPath('//*[@data-props]/@data-props') if etree is not None else None
+
+# Sentinel for "key not merged yet" (None is a legitimate data-props value)
+_MISSING = object()
+
+# Value types whose size decides which duplicate data-props key is kept
+_CONTAINER_TYPES = (dict, list)
+
+# Class fragments that mark a header element as a tag/badge (rounded, bordered, padded, ...)
+_TAG_CLASS_RE = re.compile(r'rounded-|inline-flex|inline-block|border|bg-|px-|py-')
+
+# CSS selectors for walking down the org profile header (matched by soupsieve,
+# which caches the compiled selectors, instead of per-node Python callbacks).
+# The profile <header> has gradient background classes; the nav header doesn't.
+_PROFILE_HEADER_SELECTOR = 'header[class*="bg-linear-to"], header[class*="from-gray"]'
+_CONTAINER_SELECTOR = 'div[class*="container"]'
+_OVERFLOW_SELECTOR = 'div[class*="overflow-hidden"]'
+_ITEMS_CENTER_SELECTOR = 'div[class*="items-center"]'
+_MB3_SELECTOR = 'div[class^="mb-3"], div[class*=" mb-3"]'
+
+
+# External link classifier: one case-insensitive scan, matched fragment -> link type
+_LINK_TYPES = {
+    'github.com': 'github',
+    'twitter.com': 'twitter',
+    'x.com': 'twitter',
+    'linkedin.com': 'linkedin',
+    'facebook.com': 'facebook',
+    'youtube.com': 'youtube',
+    'youtu.be': 'youtube',
+    'discord': 'discord',
+}
+_LINK_TYPE_RE = re.compile('(' + '|'.join(map(re.escape, _LINK_TYPES)) + ')', re.IGNORECASE)
+
+
+def has_class_matching(element, pattern: re.Pattern) -> bool:
+    """True if any of the element's classes contains a match for pattern (no joined string built)."""
+    search = pattern.search
+    return any(search(cls) for cls in element.get('class') or ())
+
+
+def _cache_path(url: str, cache_dir: Path) -> Path:
+    """Content-addressed cache file path for a URL."""
+    key = hashlib.blake2b(url.encode('utf-8'), digest_size=20).hexdigest()
+    return cache_dir / f"{key}.html.gz"
+
+
+def read_cached_page(url: str, cache_dir: Path, max_age: Optional[float] = None) -> Optional[str]:
+    """
+    Return the cached page body for a URL, or None if missing or expired.
+
+    Args:
+        url: Page URL
+        cache_dir: Cache directory
+        max_age: Maximum cache entry age in seconds (None = never expires)
+    """
+    cache_path = _cache_path(url, cache_dir)
+    try:
+        if max_age is not None and time.time() - cache_path.stat().st_mtime > max_age:
+            return None
+        return gzip.decompress(cache_path.read_bytes()).decode('utf-8')
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, UnicodeDecodeError) as e:
+        logger.warning(f"Ignoring unreadable cache entry {cache_path}: {e}")
+        return None
+
+
+def write_cached_page(url: str, body: str, cache_dir: Path):
+    """Write a page body to the cache (atomically, so concurrent readers never see partial files)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = _cache_path(url, cache_dir)
+    tmp_path = cache_path.with_suffix(f".tmp{time.monotonic_ns()}")
+    tmp_path.write_bytes(gzip.compress(body.encode('utf-8'), compresslevel=6))
+    tmp_path.replace(cache_path)
+
 
 def scrape_hf_profile(
     profile_name: str,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = None,
+    session: Optional[requests.Session] = None,
 ) -> Dict[str, Any]:
     """
     Scrape raw data-props elements from a HuggingFace profile page
 
     Args:
         profile_name: Profile username/identifier (user or organization)
+        cache_dir: Directory for cached pages (None disables the cache)
+        max_age: Maximum age of cached pages in seconds (None = never expires)
+        session: HTTP session to fetch with (default: shared module-level session)
 
     Returns:
         Dictionary containing merged data-props elements
     """
     logger.info(f"Scraping profile: {profile_name}")
 
-    result = {
+    result = new_result(profile_name)
+
+    try:
+        # Fetch profile page HTML
+        profile_url = f"https://huggingface.co/{profile_name}"
+        page = read_cached_page(profile_url, cache_dir, max_age) if cache_dir else None
+
+        if page is not None:
+            logger.debug(f"Using cached page for {profile_url}")
+        else:
+            logger.debug(f"Fetching {profile_url}")
+            response = (session or _SESSION).get(profile_url, timeout=REQUEST_TIMEOUT)
+
+            if response.status_code != 200:
+                logger.error(f"Failed to fetch profile page: {response.status_code}")
+                result['error'] = f"HTTP {response.status_code}"
+                if response.status_code == 429:
+                    result['retry_after'] = response.headers.get('Retry-After')
+                return result
+
+            page = response.text
+            if cache_dir:
+                write_cached_page(profile_url, page, cache_dir)
+
+        return parse_profile_page(result, page)
+
+    except Exception as e:
+        logger.error(f"Error scraping {profile_name}: {e}", exc_info=True)
+        result['error'] = str(e)
+
+    return result
+
+
+def scrape_cached_profile(
+    profile_name: str,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Parse a profile from its cached page without touching the network.
+
+    Lets rate-limited callers skip their throttle for pages that are already cached.
+
+    Args:
+        profile_name: Profile username/identifier (user or organization)
+        cache_dir: Directory for cached pages (None disables the cache)
+        max_age: Maximum age of cached pages in seconds (None = never expires)
+
+    Returns:
+        Scrape result as returned by scrape_hf_profile, or None if the page isn't cached
+    """
+    if not cache_dir:
+        return None
+
+    profile_url = f"https://huggingface.co/{profile_name}"
+    page = read_cached_page(profile_url, cache_dir, max_age)
+    if page is None:
+        return None
+
+    logger.debug(f"Using cached page for {profile_url}")
+    result = new_result(profile_name)
+    try:
+        return parse_profile_page(result, page)
+    except Exception as e:
+        logger.error(f"Error scraping {profile_name}: {e}", exc_info=True)
+        result['error'] = str(e)
+        return result
+
+
+def new_result(profile_name: str) -> Dict[str, Any]:
+    """Empty scrape result for a profile."""
+    return {
         'profile': profile_name,
         'data': {},
         'error': None
     }
 
-    try:
-        # Fetch profile page HTML
-        profile_url = f"https://huggingface.co/{profile_name}"
-        logger.debug(f"Fetching {profile_url}")
-        response = requests.get(profile_url, headers={'User-Agent': 'HF-Data-Collection-Script/1.0'})
 
-        if response.status_code != 200:
-            logger.error(f"Failed to fetch profile page: {response.status_code}")
-            result['error'] = f"HTTP {response.status_code}"
-            return result
+def extract_data_props(page: str) -> List[str]:
+    """
+    Return the raw data-props attribute values on a page, in document order.
+
+    Uses lxml's XPath when available so the attributes are found without
+    building a BeautifulSoup tree.
 
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
+    Args:
+        page: Profile page HTML
 
+    Returns:
+        List of data-props attribute strings (HTML entities already decoded)
+    """
+    if etree is not None:
+        tree = etree.HTML(page)
+        return [] if tree is None else [str(value) for value in _DATA_PROPS_XPATH(tree)]
+
+    soup = BeautifulSoup(page, HTML_PARSER)
+    return [element['data-props'] for element in soup.find_all(attrs={'data-props': True})]
+
+
+def parse_profile_page(result: Dict[str, Any], page: str) -> Dict[str, Any]:
+    """
+    Parse a fetched profile page into a scrape result.
+
+    Args:
+        result: Result dictionary from new_result() to fill in
+        page: Profile page HTML
+
+    Returns:
+        The result dictionary with merged data-props (and header metadata for orgs)
+    """
+    profile_name = result['profile']
+    # Checked once so per-element debug messages aren't formatted when they'd be dropped
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    try:
         # Extract all JSON data from data-props attributes
-        data_props_elements = soup.find_all(attrs={'data-props': True})
+        data_props_elements = extract_data_props(page)
         logger.info(f"Found {len(data_props_elements)} data-props elements")
 
         # Merge all data-props dictionaries together
         # Strategy: Keep the most complete version of each key (the one with most data)
         merged_data = {}
 
-        for i, element in enumerate(data_props_elements):
+        for i, raw in enumerate(data_props_elements):
             try:
-                # Decode HTML entities and parse JSON
-                props_json = html.unescape(element['data-props'])
-                props_data = json.loads(props_json)
+                # Decode HTML entities (only if there are any) and parse JSON
+                props_data = json_loads(html.unescape(raw) if '&' in raw else raw)
+
+                if debug:
+                    logger.debug(f"Element {i}: {len(props_data)} keys = {list(props_data.keys())}")
 
-                logger.debug(f"Element {i}: {len(props_data)} keys = {list(props_data.keys())}")
+                # Nothing merged yet: every key is new, so take the element wholesale
+                if not merged_data:
+                    merged_data.update(props_data)
+                    continue
 
                 # Merge this element's data into the main dictionary
                 # For each key, keep the value with more content (prefer non-empty, larger structures)
                 for key, value in props_data.items():
-                    if key not in merged_data:
+                    existing_value = merged_data.get(key, _MISSING)
+
+                    if existing_value is _MISSING:
                         # New key, just add it
                         merged_data[key] = value
-                    else:
-                        # Key exists - keep the more complete version
-                        existing_value = merged_data[key]
 
-                        # If new value is "better" (more complete), use it
-                        # Heuristic: prefer non-None, non-empty, or larger data structures
-                        if existing_value is None and value is not None:
+                    # Key exists - keep the more complete version
+                    # Heuristic: prefer non-None, non-empty, or larger data structures
+                    elif existing_value is None:
+                        if value is not None:
                             merged_data[key] = value
-                        elif isinstance(value, (dict, list)) and isinstance(existing_value, (dict, list)):
-                            # For dicts/lists, keep the one with more items
-                            if len(value) > len(existing_value):
-                                merged_data[key] = value
-                        elif value and not existing_value:
-                            # New value is truthy, old is falsy
+                    elif isinstance(value, _CONTAINER_TYPES) and isinstance(existing_value, _CONTAINER_TYPES):
+                        # For dicts/lists, keep the one with more items
+                        if len(value) > len(existing_value):
                             merged_data[key] = value
+                    elif value and not existing_value:
+                        # New value is truthy, old is falsy
+                        merged_data[key] = value
 
             except (json.JSONDecodeError, KeyError) as e:
                 logger.warning(f"Could not parse data-props element {i}: {e}")
@@ -98,6 +351,7 @@ def scrape_hf_profile(
         # If this is an organization page, scrape additional header metadata
         if merged_data.get('org'):
             logger.info("Detected organization profile - scraping header metadata")
+            soup = BeautifulSoup(page, HTML_PARSER)
             header_metadata = scrape_org_header(soup, profile_name)
             result['header_metadata'] = header_metadata
             logger.info(f"Scraped {len(header_metadata)} header metadata items")
@@ -109,6 +363,105 @@ def scrape_hf_profile(
     return result
 
 
+async def _fetch(
+    session: "aiohttp.ClientSession",
+    profile_name: str,
+    semaphore: asyncio.BoundedSemaphore,
+    cache_dir: Optional[Path],
+    max_age: Optional[float],
+) -> Dict[str, Any]:
+    """Fetch (or read from cache) and parse one profile page on an aiohttp session."""
+    logger.info(f"Scraping profile: {profile_name}")
+    result = new_result(profile_name)
+    profile_url = f"https://huggingface.co/{profile_name}"
+
+    try:
+        page = read_cached_page(profile_url, cache_dir, max_age) if cache_dir else None
+
+        if page is None:
+            logger.debug(f"Fetching {profile_url}")
+            async with semaphore:
+                async with session.get(profile_url, headers=HEADERS) as response:
+                    if response.status != 200:
+                        logger.error(f"Failed to fetch profile page: {response.status}")
+                        result['error'] = f"HTTP {response.status}"
+                        if response.status == 429:
+                            result['retry_after'] = response.headers.get('Retry-After')
+                        return result
+                    page = await response.text()
+
+            if cache_dir:
+                write_cached_page(profile_url, page, cache_dir)
+        else:
+            logger.debug(f"Using cached page for {profile_url}")
+
+    except Exception as e:
+        logger.error(f"Error scraping {profile_name}: {e}", exc_info=True)
+        result['error'] = str(e)
+        return result
+
+    # Parse off the event loop so other fetches keep flowing
+    return await asyncio.to_thread(parse_profile_page, result, page)
+
+
+async def scrape_many(
+    profile_names: List[str],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Scrape many profiles with up to `concurrency` page fetches in flight.
+
+    Uses one shared aiohttp session when aiohttp is installed, otherwise runs
+    scrape_hf_profile in worker threads under the same concurrency bound.
+
+    Args:
+        profile_names: Profile usernames/identifiers to scrape
+        concurrency: Maximum number of concurrent page fetches
+        cache_dir: Directory for cached pages (None disables the cache)
+        max_age: Maximum age of cached pages in seconds (None = never expires)
+
+    Returns:
+        List of scrape results, in the same order as profile_names
+    """
+    semaphore = asyncio.BoundedSemaphore(concurrency)
+
+    if aiohttp is None:
+        async def scrape_in_thread(profile_name):
+            async with semaphore:
+                return await asyncio.to_thread(scrape_hf_profile, profile_name, cache_dir, max_age)
+
+        return await asyncio.gather(*[scrape_in_thread(name) for name in profile_names])
+
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(*[
+            _fetch(session, name, semaphore, cache_dir, max_age) for name in profile_names
+        ])
+
+
+def scrape_hf_profiles(
+    profile_names: List[str],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Scrape many HuggingFace profiles concurrently (blocking wrapper around scrape_many).
+
+    Args:
+        profile_names: Profile usernames/identifiers to scrape
+        concurrency: Maximum number of concurrent page fetches (default: 64)
+        cache_dir: Directory for cached pages (None disables the cache)
+        max_age: Maximum age of cached pages in seconds (None = never expires)
+
+    Returns:
+        List of scrape results, in the same order as profile_names
+    """
+    return asyncio.run(scrape_many(profile_names, concurrency, cache_dir, max_age))
+
+
 def scrape_org_header(soup: BeautifulSoup, profile_name: str) -> Dict[str, Any]:
     """
     Scrape header metadata from organization page.
@@ -133,16 +486,15 @@ def scrape_org_header(soup: BeautifulSoup, profile_name: str) -> Dict[str, Any]:
         'links': []
     }
 
+    seen_tag_texts = set()
+    # Checked once so per-element debug messages aren't formatted when they'd be dropped
+    debug = logger.isEnabledFor(logging.DEBUG)
+    seen_urls = set()
+
     try:
         # Find the profile <header> element (not the navigation header)
         # Profile header typically has bg-linear-to-t or from-gray classes
-        header_element = None
-        for header in soup.find_all('header'):
-            classes = ' '.join(header.get('class', []))
-            # Profile header has gradient background classes
-            if 'bg-linear-to' in classes or 'from-gray' in classes:
-                header_element = header
-                break
+        header_element = soup.select_one(_PROFILE_HEADER_SELECTOR)
 
         if not header_element:
             logger.warning("Could not find profile <header> element")
@@ -156,7 +508,7 @@ def scrape_org_header(soup: BeautifulSoup, profile_name: str) -> Dict[str, Any]:
         #            -> <div class="flex items-center space-x-2"> (this contains tags)
 
         # Level 1: Find container div
-        container_div = header_element.find('div', class_=lambda x: x and 'container' in x)
+        container_div = header_element.select_one(_CONTAINER_SELECTOR)
         if not container_div:
             logger.warning("Could not find container div (level 1)")
             return header_data
@@ -164,10 +516,10 @@ def scrape_org_header(soup: BeautifulSoup, profile_name: str) -> Dict[str, Any]:
         logger.debug(f"Found container div with classes: {container_div.get('class', [])}")
 
         # Find the div containing overflow-hidden which has the org info
-        overflow_div = container_div.find('div', class_=lambda x: x and 'overflow-hidden' in x)
+        overflow_div = container_div.select_one(_OVERFLOW_SELECTOR)
         if not overflow_div:
             # Try alternative: just find div with items-center
-            overflow_div = container_div.find('div', class_=lambda x: x and 'items-center' in x)
+            overflow_div = container_div.select_one(_ITEMS_CENTER_SELECTOR)
 
         if not overflow_div:
             logger.warning("Could not find overflow/items-center div")
@@ -176,10 +528,10 @@ def scrape_org_header(soup: BeautifulSoup, profile_name: str) -> Dict[str, Any]:
         logger.debug(f"Found overflow div with classes: {overflow_div.get('class', [])}")
 
         # Find the inner div with the actual content (mb-3 or items-center)
-        target_div = overflow_div.find('div', class_=lambda x: x and any(cls.startswith('mb-3') for cls in x))
+        target_div = overflow_div.select_one(_MB3_SELECTOR)
         if not target_div:
             # Try alternative
-            target_div = overflow_div.find('div', class_=lambda x: x and 'items-center' in x)
+            target_div = overflow_div.select_one(_ITEMS_CENTER_SELECTOR)
 
         if not target_div:
             logger.warning("Could not find target div with content")
@@ -197,7 +549,6 @@ def scrape_org_header(soup: BeautifulSoup, profile_name: str) -> Dict[str, Any]:
 
         # 2. Extract tags - look for divs/spans with tag-like styling within this container
         for element in target_div.find_all(['div', 'span']):
-            classes = ' '.join(element.get('class', []))
             text = element.get_text(strip=True)
 
             # Skip if it's the h1 element or empty
@@ -205,14 +556,12 @@ def scrape_org_header(soup: BeautifulSoup, profile_name: str) -> Dict[str, Any]:
                 continue
 
             # Skip if already captured
-            if any(t['text'] == text for t in header_data['tags']):
+            if text in seen_tag_texts:
                 continue
 
             # Tag patterns: rounded, inline-flex, border, background colors
             # Look for elements that have these styling patterns
-            is_tag_like = any(pattern in classes for pattern in [
-                'rounded-', 'inline-flex', 'inline-block', 'border', 'bg-', 'px-', 'py-'
-            ])
+            is_tag_like = has_class_matching(element, _TAG_CLASS_RE)
 
             # Must be reasonably short and have no deep nesting
             if is_tag_like and len(text) < 30 and len(element.find_all(recursive=True)) <= 2:
@@ -221,7 +570,9 @@ def scrape_org_header(soup: BeautifulSoup, profile_name: str) -> Dict[str, Any]:
                     'classes': element.get('class', [])
                 }
                 header_data['tags'].append(tag_info)
-                logger.debug(f"Found tag: {text}")
+                seen_tag_texts.add(text)
+                if debug:
+                    logger.debug(f"Found tag: {text}")
 
         # 3. Extract links - search in overflow_div for broader scope
         # Links may appear outside the immediate target_div
@@ -246,9 +597,11 @@ def scrape_org_header(soup: BeautifulSoup, profile_name: str) -> Dict[str, Any]:
                         }
 
                         # Avoid duplicates
-                        if not any(l['url'] == href for l in header_data['links']):
+                        if href not in seen_urls:
+                            seen_urls.add(href)
                             header_data['links'].append(link_info)
-                            logger.debug(f"Found link: {href}")
+                            if debug:
+                                logger.debug(f"Found link: {href}")
 
     except Exception as e:
         logger.warning(f"Error scraping organization header: {e}")
@@ -258,22 +611,8 @@ def scrape_org_header(soup: BeautifulSoup, profile_name: str) -> Dict[str, Any]:
 
 def identify_link_type(url: str) -> str:
     """Identify the type of external link."""
-    url_lower = url.lower()
-
-    if 'github.com' in url_lower:
-        return 'github'
-    elif 'twitter.com' in url_lower or 'x.com' in url_lower:
-        return 'twitter'
-    elif 'linkedin.com' in url_lower:
-        return 'linkedin'
-    elif 'facebook.com' in url_lower:
-        return 'facebook'
-    elif 'youtube.com' in url_lower or 'youtu.be' in url_lower:
-        return 'youtube'
-    elif 'discord' in url_lower:
-        return 'discord'
-    else:
-        return 'website'
+    match = _LINK_TYPE_RE.search(url)
+    return _LINK_TYPES[match.group(1).lower()] if match else 'website'
 
 
 if __name__ == "__main__":
@@ -284,7 +623,14 @@ if __name__ == "__main__":
     parser.add_argument(
         'profile',
         type=str,
-        help='HuggingFace profile name to scrape (user or organization)'
+        nargs='+',
+        help='HuggingFace profile name(s) to scrape (user or organization)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_BATCH_CONCURRENCY,
+        help=f'Maximum concurrent fetches when scraping several profiles (default: {DEFAULT_BATCH_CONCURRENCY})'
     )
     parser.add_argument(
         '--output',
@@ -292,6 +638,11 @@ if __name__ == "__main__":
         type=str,
         help='Output JSON file path (if not specified, prints to console only)'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always fetch the page instead of using the on-disk cache'
+    )
     parser.add_argument(
         '--debug',
         action='store_true',
@@ -306,19 +657,22 @@ if __name__ == "__main__":
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
-    # Scrape the profile
-    result = scrape_hf_profile(args.profile)
+    # Scrape the profile(s); several profiles are fetched concurrently and output as a list
+    cache_dir = None if args.no_cache else DEFAULT_CACHE_DIR
+    if len(args.profile) == 1:
+        result = scrape_hf_profile(args.profile[0], cache_dir=cache_dir)
+    else:
+        result = scrape_hf_profiles(args.profile, concurrency=args.concurrency, cache_dir=cache_dir)
 
     # Output result to console
-    print(json.dumps(result, indent=2))
+    output = json_dumps_pretty(result)
+    print(output.decode('utf-8'))
 
     # Save to file if output path specified
     if args.output:
-        from pathlib import Path
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w') as f:
-            json.dump(result, f, indent=2)
+        output_path.write_bytes(output)
 
         logger.info(f"Saved output to {output_path}")
@@ -0,0 +1,93 @@
+"""
+Checks that the Arrow and Python profile parsers agree and keep off-type records.
+"""
+import json
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from clean_hf_profiles import clean_hf_profiles, process_file, process_jsonl_arrow  # noqa: E402
+
+
+def org(name, **data):
+    return {"profile": name, "data": {"org": {"name": name, "type": "org"}, **data},
+            "header_metadata": {"org_display_name": name.title(),
+                                "tags": [{"text": "Company"}, {"text": "verified"}],
+                                "links": [{"url": f"https://{name}.example"}]}}
+
+
+def user(name, **u):
+    return {"profile": name, "data": {"u": {"user": name, "type": "user", **u}, "numFollowers": 3,
+                                      "hardwareItems": []}}
+
+
+# Profiles the Arrow kernels flatten themselves
+ARROW_PROFILES = [
+    org("card-contents", organizationCard={"contents": "# Hi", "html": "<h1>Hi</h1>"}),
+    org("card-metadata", organizationCard={"metadata": {}}),
+    org("no-card"),
+    org("null-card", organizationCard=None),
+    user("with-orgs", orgs=[{"name": "card-contents", "userRole": "admin"}, {"name": "no-card"}]),
+    user("empty-orgs", orgs=[]),
+    {"profile": "nobody", "data": {}},
+    {"profile": "both", "data": {"org": {"name": "both"}, "u": {"user": "both"}}},
+]
+
+# Profiles whose cards or orgs look the same as a missing field once Arrow has read them
+AMBIGUOUS_PROFILES = [
+    org("card-other-keys", organizationCard={"theme": "dark"}),
+    org("card-null-contents", organizationCard={"contents": None}),
+    org("card-empty", organizationCard={}),
+    user("null-orgs", orgs=None),
+    user("missing-orgs"),
+]
+
+
+def write_jsonl(path, profiles):
+    path.write_text("".join(json.dumps(profile) + "\n" for profile in profiles))
+    return path
+
+
+def assert_same_tables(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        assert actual[key].to_pylist() == expected[key].to_pylist(), key
+
+
+def test_arrow_kernels_match_python_parser(tmp_path):
+    path = write_jsonl(tmp_path / "profiles.jsonl", ARROW_PROFILES)
+    assert_same_tables(process_jsonl_arrow(path, verbose=False), process_file(path, False, use_arrow=False))
+
+
+def test_ambiguous_profiles_use_python_parser(tmp_path):
+    path = write_jsonl(tmp_path / "profiles.jsonl", ARROW_PROFILES + AMBIGUOUS_PROFILES)
+    with pytest.raises(pa.ArrowInvalid):
+        process_jsonl_arrow(path, verbose=False)
+
+    tables = process_file(path, False, use_arrow=True)
+    assert_same_tables(tables, process_file(path, False, use_arrow=False))
+
+    orgs = {row["profile_name"]: row["has_org_card"] for row in tables["orgs"].to_pylist()}
+    assert orgs["card-other-keys"] and orgs["card-null-contents"] and not orgs["card-empty"]
+    users = {row["profile_name"]: row["numOrgs"] for row in tables["users"].to_pylist()}
+    assert users == {"with-orgs": 2, "empty-orgs": 0, "null-orgs": None, "missing-orgs": 0}
+
+
+def test_off_type_values_keep_the_rest_of_the_file(tmp_path):
+    bad_count = org("string-count", organizationCard={"contents": "# Hi"}, numModels="12")
+    bad_flag = user("dict-flag", orgs=[], isPro={"plan": "pro"})
+    path = write_jsonl(tmp_path / "profiles.jsonl", ARROW_PROFILES + [bad_count, bad_flag])
+
+    created = clean_hf_profiles([path], tmp_path / "out")
+
+    orgs = pq.read_table(tmp_path / "out" / "hf_orgs.parquet").to_pylist()
+    users = pq.read_table(tmp_path / "out" / "hf_users.parquet").to_pylist()
+    assert len(created) == 4
+    assert len(orgs) == 5 and len(users) == 3
+    assert {row["profile_name"]: row["numModels"] for row in orgs}["string-count"] == 12
+    assert {row["profile_name"]: row["isPro"] for row in users}["dict-flag"] is None
@@ -4,120 +4,172 @@ Analyze HuggingFace Data
 This script loads collected model and organization data and reports summary statistics.
 """
 
+import heapq
 import json
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson is much faster than the stdlib parser; fall back if it isn't installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
 
-def load_jsonl(file_path: Path) -> List[Dict[Any, Any]]:
-    """Load data from a JSONL file"""
-    data = []
+def iter_jsonl(file_path: Path) -> Iterator[Dict[Any, Any]]:
+    """Stream records from a JSONL file one line at a time"""
     if not file_path.exists():
         logger.warning(f"File not found: {file_path}")
-        return data
+        return
 
     with open(file_path, 'r') as f:
         for line in f:
             try:
-                data.append(json.loads(line))
+                yield json_loads(line)
             except json.JSONDecodeError as e:
                 logger.warning(f"Could not parse line: {e}")
                 continue
 
-    return data
+
+def load_jsonl(file_path: Path) -> List[Dict[Any, Any]]:
+    """Load data from a JSONL file"""
+    return list(iter_jsonl(file_path))
 
 
-def analyze_models(models: List[dict]) -> Dict[str, Any]:
+TOP_K = 10
+
+
+def push_top(heap: list, value, index: int, item: Any, k: int = TOP_K):
+    """
+    Keep the k largest items seen so far in a min-heap
+
+    Ties are broken by arrival order (earlier wins), matching
+    sorted(..., reverse=True)[:k].
+
+    Args:
+        heap: Heap of (value, -index, item) tuples, updated in place
+        value: Sort key for the item
+        index: Position of the item in the input stream
+        item: Payload to keep
+        k: Number of items to retain
+    """
+    entry = (value, -index, item)
+    if len(heap) < k:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
+
+
+def drain_top(heap: list) -> list:
+    """Return the payloads of a push_top heap, largest first"""
+    return [item for _, _, item in sorted(heap, reverse=True)]
+
+
+def slim_model(model: dict) -> Tuple[Optional[str], int, int, str, str]:
+    """Reduce a model record to the fields the analysis uses"""
+    return (
+        model.get('id'),
+        model.get('downloads', 0),
+        model.get('likes', 0),
+        model.get('pipeline_tag', 'unknown'),
+        model.get('library_name', 'unknown'),
+    )
+
+
+def iter_models_slim(file_path: Path) -> Iterator[Tuple[Optional[str], int, int, str, str]]:
+    """Stream (id, downloads, likes, pipeline_tag, library_name) rows from a models JSONL file"""
+    for model in iter_jsonl(file_path):
+        yield slim_model(model)
+
+
+def analyze_models(models: Iterable[dict]) -> Dict[str, Any]:
     """Analyze model data and return summary statistics"""
-    if not models:
-        return {'error': 'No models to analyze'}
+    return analyze_model_rows(map(slim_model, models))
 
-    stats = {
-        'total_models': len(models),
-        'total_downloads': sum(m.get('downloads', 0) for m in models),
-        'total_likes': sum(m.get('likes', 0) for m in models),
-        'avg_downloads': 0,
-        'avg_likes': 0,
-        'top_models_by_downloads': [],
-        'top_models_by_likes': [],
-        'models_by_pipeline_tag': {},
-        'models_by_library': {},
-        'models_by_author': {},
-    }
 
-    # Calculate averages
-    stats['avg_downloads'] = stats['total_downloads'] / len(models)
-    stats['avg_likes'] = stats['total_likes'] / len(models)
-
-    # Top models by downloads
-    sorted_by_downloads = sorted(models, key=lambda x: x.get('downloads', 0), reverse=True)
-    stats['top_models_by_downloads'] = [
-        {
-            'id': m.get('id'),
-            'downloads': m.get('downloads', 0),
-            'likes': m.get('likes', 0)
-        }
-        for m in sorted_by_downloads[:10]
-    ]
-
-    # Top models by likes
-    sorted_by_likes = sorted(models, key=lambda x: x.get('likes', 0), reverse=True)
-    stats['top_models_by_likes'] = [
-        {
-            'id': m.get('id'),
-            'likes': m.get('likes', 0),
-            'downloads': m.get('downloads', 0)
-        }
-        for m in sorted_by_likes[:10]
-    ]
+def analyze_model_rows(rows: Iterable[tuple]) -> Dict[str, Any]:
+    """
+    Analyze slim model rows and return summary statistics
 
-    # Group by pipeline tag
+    Args:
+        rows: (id, downloads, likes, pipeline_tag, library_name) tuples, as
+            produced by slim_model / iter_models_slim
+
+    Returns:
+        Summary statistics dictionary (same shape as analyze_models)
+    """
+    # Single pass: totals, top-k heaps and group counters together
+    total_models = 0
+    total_downloads = 0
+    total_likes = 0
+    downloads_heap = []
+    likes_heap = []
     pipeline_counter = Counter()
-    for m in models:
-        tag = m.get('pipeline_tag', 'unknown')
-        pipeline_counter[tag] += 1
+    library_counter = Counter()
+    author_counter = Counter()
 
-    stats['models_by_pipeline_tag'] = dict(pipeline_counter.most_common(20))
+    for i, row in enumerate(rows):
+        model_id, downloads, likes, pipeline_tag, library_name = row
+        total_downloads += downloads
+        total_likes += likes
 
-    # Group by library
-    library_counter = Counter()
-    for m in models:
-        lib = m.get('library_name', 'unknown')
-        library_counter[lib] += 1
+        push_top(downloads_heap, downloads, i, row)
+        push_top(likes_heap, likes, i, row)
 
-    stats['models_by_library'] = dict(library_counter.most_common(20))
+        pipeline_counter[pipeline_tag] += 1
+        library_counter[library_name] += 1
 
-    # Group by author
-    author_counter = Counter()
-    for m in models:
         # Extract author from model ID (format: author/model-name)
-        model_id = m.get('id', '')
-        if '/' in model_id:
-            author = model_id.split('/')[0]
-            author_counter[author] += 1
+        if model_id and '/' in model_id:
+            author_counter[model_id.split('/')[0]] += 1
 
-    stats['models_by_author'] = dict(author_counter.most_common(20))
+        total_models += 1
 
-    return stats
+    if not total_models:
+        return {'error': 'No models to analyze'}
 
+    stats = {
+        'total_models': total_models,
+        'total_downloads': total_downloads,
+        'total_likes': total_likes,
+        'avg_downloads': total_downloads / total_models,
+        'avg_likes': total_likes / total_models,
+        'top_models_by_downloads': [
+            {
+                'id': model_id,
+                'downloads': downloads,
+                'likes': likes
+            }
+            for model_id, downloads, likes, _, _ in drain_top(downloads_heap)
+        ],
+        'top_models_by_likes': [
+            {
+                'id': model_id,
+                'likes': likes,
+                'downloads': downloads
+            }
+            for model_id, downloads, likes, _, _ in drain_top(likes_heap)
+        ],
+        'models_by_pipeline_tag': dict(pipeline_counter.most_common(20)),
+        'models_by_library': dict(library_counter.most_common(20)),
+        'models_by_author': dict(author_counter.most_common(20)),
+    }
 
-def analyze_organizations(organizations: List[dict]) -> Dict[str, Any]:
-    """Analyze organization data and return summary statistics"""
-    if not organizations:
-        return {'error': 'No organizations to analyze'}
+    return stats
 
-    # Filter out error records
-    valid_orgs = [o for o in organizations if not o.get('error')]
-    error_orgs = [o for o in organizations if o.get('error')]
 
+def analyze_organizations(organizations: Iterable[dict]) -> Dict[str, Any]:
+    """Analyze organization data and return summary statistics"""
     stats = {
-        'total_organizations': len(organizations),
-        'valid_organizations': len(valid_orgs),
-        'failed_organizations': len(error_orgs),
+        'total_organizations': 0,
+        'valid_organizations': 0,
+        'failed_organizations': 0,
         'total_models': 0,
         'total_datasets': 0,
         'total_spaces': 0,
@@ -128,69 +180,52 @@ def analyze_organizations(organizations: List[dict]) -> Dict[str, Any]:
         'orgs_by_plan': {},
     }
 
-    if not valid_orgs:
-        return stats
-
-    # Aggregate statistics
-    for org in valid_orgs:
-        # Models
-        models_data = org.get('api_data', {}).get('models', {})
-        stats['total_models'] += models_data.get('count', 0)
-
-        # Datasets
-        datasets_data = org.get('api_data', {}).get('datasets', {})
-        stats['total_datasets'] += datasets_data.get('count', 0)
-
-        # Spaces
-        spaces_data = org.get('api_data', {}).get('spaces', {})
-        stats['total_spaces'] += spaces_data.get('count', 0)
-
-        # Followers
-        follower_data = org.get('follower_info', {})
-        stats['total_followers'] += follower_data.get('follower_count', 0)
-
-    # Top orgs by model count
-    orgs_with_models = [
-        {
-            'name': o.get('organization'),
-            'model_count': o.get('api_data', {}).get('models', {}).get('count', 0),
-            'total_downloads': o.get('api_data', {}).get('models', {}).get('total_downloads', 0)
-        }
-        for o in valid_orgs
-    ]
-    stats['top_orgs_by_models'] = sorted(
-        orgs_with_models,
-        key=lambda x: x['model_count'],
-        reverse=True
-    )[:10]
-
-    # Top orgs by downloads
-    stats['top_orgs_by_downloads'] = sorted(
-        orgs_with_models,
-        key=lambda x: x['total_downloads'],
-        reverse=True
-    )[:10]
-
-    # Top orgs by followers
-    orgs_with_followers = [
-        {
-            'name': o.get('organization'),
-            'followers': o.get('follower_info', {}).get('follower_count', 0)
-        }
-        for o in valid_orgs
-    ]
-    stats['top_orgs_by_followers'] = sorted(
-        orgs_with_followers,
-        key=lambda x: x['followers'],
-        reverse=True
-    )[:10]
-
-    # Group by plan
+    models_heap = []
+    downloads_heap = []
+    followers_heap = []
     plan_counter = Counter()
-    for o in valid_orgs:
-        plan = o.get('basic_info', {}).get('plan', 'unknown')
-        plan_counter[plan] += 1
 
+    # Single pass: counts, totals, top-k heaps and plan counter together,
+    # skipping error records inline instead of building a filtered list
+    for org in organizations:
+        stats['total_organizations'] += 1
+        if org.get('error'):
+            stats['failed_organizations'] += 1
+            continue
+        i = stats['valid_organizations']
+        stats['valid_organizations'] += 1
+
+        api_data = org.get('api_data', {})
+        models_data = api_data.get('models', {})
+        model_count = models_data.get('count', 0)
+        follower_count = org.get('follower_info', {}).get('follower_count', 0)
+
+        stats['total_models'] += model_count
+        stats['total_datasets'] += api_data.get('datasets', {}).get('count', 0)
+        stats['total_spaces'] += api_data.get('spaces', {}).get('count', 0)
+        stats['total_followers'] += follower_count
+
+        name = org.get('organization')
+        org_models = {
+            'name': name,
+            'model_count': model_count,
+            'total_downloads': models_data.get('total_downloads', 0)
+        }
+        push_top(models_heap, model_count, i, org_models)
+        push_top(downloads_heap, org_models['total_downloads'], i, org_models)
+        push_top(followers_heap, follower_count, i, {
+            'name': name,
+            'followers': follower_count
+        })
+
+        plan_counter[org.get('basic_info', {}).get('plan', 'unknown')] += 1
+
+    if not stats['total_organizations']:
+        return {'error': 'No organizations to analyze'}
+
+    stats['top_orgs_by_models'] = drain_top(models_heap)
+    stats['top_orgs_by_downloads'] = drain_top(downloads_heap)
+    stats['top_orgs_by_followers'] = drain_top(followers_heap)
     stats['orgs_by_plan'] = dict(plan_counter)
 
     return stats
@@ -292,26 +327,24 @@ def analyze_data(
     if organizations_file is None:
         organizations_file = data_dir / "organizations.jsonl"
 
-    # Load models
-    logger.info("Loading models data...")
-    models = load_jsonl(models_file)
-    logger.info(f"Loaded {len(models)} models")
-
-    # Load organizations
-    logger.info("Loading organizations data...")
-    organizations = load_jsonl(organizations_file)
-    logger.info(f"Loaded {len(organizations)} organizations")
-
-    # Analyze models
-    if models:
-        model_stats = analyze_models(models)
+    # Load and analyze both files at once (streamed; neither file is held in memory)
+    logger.info("Loading models and organizations data...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        model_future = executor.submit(analyze_model_rows, iter_models_slim(models_file))
+        org_future = executor.submit(analyze_organizations, iter_jsonl(organizations_file))
+        model_stats = model_future.result()
+        org_stats = org_future.result()
+
+    # Report models
+    if 'error' not in model_stats:
+        logger.info(f"Loaded {model_stats['total_models']} models")
         print_model_stats(model_stats)
     else:
         logger.info("\n⚠️  No model data found")
 
-    # Analyze organizations
-    if organizations:
-        org_stats = analyze_organizations(organizations)
+    # Report organizations
+    if 'error' not in org_stats:
+        logger.info(f"Loaded {org_stats['total_organizations']} organizations")
         print_org_stats(org_stats)
     else:
         logger.info("\n⚠️  No organization data found")
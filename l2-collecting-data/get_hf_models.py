@@ -10,6 +10,14 @@ from pathlib import Path
 from typing import Optional, List
 from hf_client import get_client
 
+# orjson serializes straight to bytes and much faster; fall back if it isn't installed
+try:
+    import orjson
+    json_dumps = orjson.dumps
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,23 +89,21 @@ def get_hf_models(
     if full:
         params['full'] = 'true'
 
-    # Fetch models in batches (API max is 1000 per request)
+    # Fetch models in batches (API max is 1000 per request). The API pages with an
+    # opaque cursor returned in the Link header, so each batch follows the previous one.
     models = []
     remaining = n
-    offset = 0
     batch_size = min(1000, n)  # Max 1000 per request
+    url = "https://huggingface.co/api/models"
 
     with get_client(requests_per_second=requests_per_second) as client:
         logger.info(f"Fetching top {n} models from HuggingFace API...")
         logger.info(f"Parameters: {params}")
 
-        while remaining > 0:
-            # Adjust limit for last batch
-            current_limit = min(batch_size, remaining)
-            params['limit'] = current_limit
+        params['limit'] = batch_size
 
-            # Make API request
-            url = "https://huggingface.co/api/models"
+        while remaining > 0:
+            # Make API request (follow-up pages carry their params in the cursor URL)
             response = client.get(url, params=params)
 
             if response.status_code != 200:
@@ -110,22 +116,27 @@ def get_hf_models(
                 logger.warning(f"No more models returned. Got {len(models)} total.")
                 break
 
-            models.extend(batch)
+            # The last page may overshoot n; keep only what was asked for
+            models.extend(batch[:remaining])
             remaining -= len(batch)
-            offset += len(batch)
 
             logger.info(f"Fetched {len(models)}/{n} models...")
 
             # If we got fewer models than requested, we've reached the end
-            if len(batch) < current_limit:
+            if len(batch) < batch_size:
                 logger.info(f"Reached end of available models. Got {len(models)} total.")
                 break
 
+            next_url = response.links.get('next', {}).get('url')
+            if not next_url:
+                logger.info(f"No further pages available. Got {len(models)} total.")
+                break
+            url, params = next_url, None
+
     # Save to JSONL file
     logger.info(f"Saving {len(models)} models to {output_file}")
-    with open(output_file, 'w') as f:
-        for model in models:
-            f.write(json.dumps(model) + '\n')
+    with open(output_file, 'wb') as f:
+        f.writelines(json_dumps(model) + b'\n' for model in models)
 
     logger.info(f"Successfully saved {len(models)} models to {output_file}")
 
@@ -5,26 +5,116 @@ This script scrapes metadata for multiple HuggingFace organizations and saves to
 """
 
 import json
+import hashlib
 import logging
+import os
+import time
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
+from hf_client import get_client
 from scrape_hf_organization import scrape_hf_organization
 
+# orjson serializes straight to bytes and much faster; fall back if it isn't installed
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Output is buffered in memory and written + fsynced every FLUSH_EVERY organizations
+# (and on exit, including Ctrl-C), so records that were reported written survive a crash
+# at the cost of one fsync per batch rather than per record
+WRITE_BUFFER_SIZE = 256 * 1024
+FLUSH_EVERY = 16
+
+# Successfully scraped profiles are cached on disk so reruns (and resumed runs)
+# skip organizations fetched within the last DEFAULT_CACHE_MAX_AGE seconds
+DEFAULT_CACHE_DIR = Path(__file__).parent / "data" / ".hf_cache" / "organizations"
+DEFAULT_CACHE_MAX_AGE = 24 * 60 * 60
+
+
+def _cache_path(org_name: str, cache_dir: Path) -> Path:
+    """Cache file path for an organization (hashed, so any name is a safe filename)."""
+    key = hashlib.blake2b(org_name.encode('utf-8'), digest_size=20).hexdigest()
+    return cache_dir / f"{key}.json"
+
+
+def read_cached_profile(org_name: str, cache_dir: Path, max_age: Optional[float] = None) -> Optional[dict]:
+    """
+    Return the cached profile for an organization, or None if missing or expired.
+
+    Args:
+        org_name: Organization username
+        cache_dir: Cache directory
+        max_age: Maximum cache entry age in seconds (None = never expires)
+    """
+    cache_path = _cache_path(org_name, cache_dir)
+    try:
+        if max_age is not None and time.time() - cache_path.stat().st_mtime > max_age:
+            return None
+        return json_loads(cache_path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache entry {cache_path}: {e}")
+        return None
+
+
+def write_cached_profile(org_name: str, profile: dict, cache_dir: Path):
+    """Write a profile to the cache (atomically, so concurrent readers never see partial files)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = _cache_path(org_name, cache_dir)
+    tmp_path = cache_path.with_suffix(f".tmp{time.monotonic_ns()}")
+    tmp_path.write_bytes(json_dumps(profile))
+    tmp_path.replace(cache_path)
+
+
+def _write_durably(fd: int, buffer: bytearray):
+    """Write out and fsync a buffer of encoded records, then empty it."""
+    view = memoryview(buffer)
+    while view:
+        view = view[os.write(fd, view):]
+    view.release()
+    os.fsync(fd)
+    buffer.clear()
+
+
+def profile_covers(profile: dict, include_html: bool) -> bool:
+    """Whether a stored profile can stand in for a fresh scrape (API-only profiles can't for HTML runs)."""
+    # Profiles written before 'scraped_html' existed always include the HTML page
+    return not include_html or profile.get('scraped_html', True)
+
 
 def get_hf_organizations(
     org_names: List[str],
     requests_per_second: int = 5,
-    output_file: Optional[str] = None
+    output_file: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_age: Optional[float] = DEFAULT_CACHE_MAX_AGE,
+    include_html: bool = True
 ) -> List[dict]:
     """
     Scrape metadata for multiple HuggingFace organizations
 
+    Organizations are scraped concurrently in worker threads that share one
+    rate-limited API client, so requests_per_second still caps the total API rate.
+
     Args:
         org_names: List of organization usernames to scrape
         requests_per_second: Rate limit for API requests (default: 5)
         output_file: Path to output JSONL file (default: data/organizations.jsonl)
+        concurrency: Organizations scraped at once (default: 2 x requests_per_second)
+        cache_dir: Directory for cached profiles (None disables the cache)
+        max_age: Maximum age of cached profiles in seconds (default: 24h, None = never expires)
+        include_html: Also scrape each organization's HTML page; False fetches only
+            the API listings, saving a request and an HTML parse per org (default: True)
 
     Returns:
         List of organization profile dictionaries
@@ -38,38 +128,61 @@ def get_hf_organizations(
     # Ensure output directory exists
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    logger.info(f"Scraping {len(org_names)} organizations...")
-
-    profiles = []
+    if concurrency is None:
+        concurrency = max(1, requests_per_second * 2)
 
-    # Open file for writing (append mode so we don't lose data if interrupted)
-    with open(output_file, 'w') as f:
-        for i, org_name in enumerate(org_names, 1):
-            logger.info(f"[{i}/{len(org_names)}] Scraping {org_name}...")
+    logger.info(f"Scraping {len(org_names)} organizations ({concurrency} at a time)...")
 
-            try:
-                profile = scrape_hf_organization(
-                    org_name=org_name,
-                    requests_per_second=requests_per_second
-                )
-                profiles.append(profile)
-
-                # Write immediately to file (in case of interruption)
-                f.write(json.dumps(profile) + '\n')
-                f.flush()  # Ensure it's written to disk
+    profiles = []
 
+    def scrape(indexed_org):
+        i, org_name = indexed_org
+        if cache_dir:
+            profile = read_cached_profile(org_name, cache_dir, max_age)
+            if profile is not None and profile_covers(profile, include_html):
+                logger.info(f"[{i}/{len(org_names)}] Using cached profile for {org_name}")
+                return profile
+
+        logger.info(f"[{i}/{len(org_names)}] Scraping {org_name}...")
+        try:
+            profile = scrape_hf_organization(
+                org_name=org_name,
+                requests_per_second=requests_per_second,
+                client=client,
+                include_html=include_html
+            )
+            if profile.get('error'):
+                logger.warning(f"✗ Scraped {org_name} with error: {profile['error']}")
+            else:
                 logger.info(f"✓ Successfully scraped {org_name}")
+                if cache_dir:
+                    write_cached_profile(org_name, profile, cache_dir)
+            return profile
+        except Exception as e:
+            logger.error(f"✗ Failed to scrape {org_name}: {e}")
+            # Still write the error record
+            return {
+                'organization': org_name,
+                'error': str(e)
+            }
+
+    # Results come back in input order. The finally block (also reached on errors
+    # or Ctrl-C) writes and fsyncs whatever is still buffered, so an interruption loses little
+    fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_APPEND | os.O_CLOEXEC, 0o644)
+    buffer = bytearray()
+    try:
+        with get_client(requests_per_second=requests_per_second) as client, \
+                ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for profile in executor.map(scrape, enumerate(org_names, 1)):
+                profiles.append(profile)
 
-            except Exception as e:
-                logger.error(f"✗ Failed to scrape {org_name}: {e}")
-                # Still write the error record
-                error_profile = {
-                    'organization': org_name,
-                    'error': str(e)
-                }
-                profiles.append(error_profile)
-                f.write(json.dumps(error_profile) + '\n')
-                f.flush()
+                buffer += json_dumps(profile)
+                buffer += b'\n'
+                if len(profiles) % FLUSH_EVERY == 0 or len(buffer) >= WRITE_BUFFER_SIZE:
+                    _write_durably(fd, buffer)
+    finally:
+        _write_durably(fd, buffer)
+        os.close(fd)
 
     logger.info(f"Successfully scraped {len(profiles)} organizations to {output_file}")
 
@@ -4,70 +4,159 @@ HuggingFace API Client with Rate Limiting
 This module provides a rate-limited HTTP client for interacting with the HuggingFace API.
 """
 
+import functools
 import os
+import random
+import threading
+import time
+from pathlib import Path
 from typing import Optional
-from requests_ratelimiter import LimiterSession
+import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections pooled per host. requests defaults to 10, which concurrent
+# org scraping (several workers x 3 API listings each) exhausts, forcing new TLS handshakes
+DEFAULT_POOL_SIZE = 64
+
+# 429 responses are retried here rather than by urllib3, so the wait applies to every
+# thread sharing the client (Retry-After when given, else exponential backoff + jitter)
+RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BACKOFF = 1.0
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env_api_key() -> Optional[str]:
+    """Read HF_API_KEY from the .env file (parsed once per process, not per client)"""
+    try:
+        env_file = Path(__file__).parent.parent / '.env'
+        if env_file.exists():
+            with open(env_file) as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('HF_API_KEY='):
+                        return line.split('=', 1)[1].strip()
+    except Exception as e:
+        logger.warning(f"Could not load .env file: {e}")
+    return None
+
+
+def _header_number(response: requests.Response, name: str) -> Optional[float]:
+    """Numeric value of a response header, or None if missing or not a number (e.g. an HTTP date)"""
+    value = response.headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: up to `burst` requests go out at once, then `rate` per second.
+
+    The lock is only held to reserve a slot; callers sleep outside it, so waiting
+    threads wake up staggered at their own slot instead of queueing on the lock.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity, i.e. requests allowed back to back
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens earned since the last update (caller holds the lock)"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take one token, sleeping until it is available"""
+        with self._lock:
+            self._refill()
+            # Going negative reserves a future token for this caller
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+    def limit_to(self, remaining: float):
+        """Never hold more tokens than the server says are left in its own window"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, remaining)
+
+    def pause(self, seconds: float):
+        """Make the next caller wait at least `seconds` (e.g. after a 429), with no burst after"""
+        with self._lock:
+            self._refill()
+            # A debt of `seconds` worth of tokens delays every later acquire
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
 
 class HFClient:
     """Rate-limited HTTP client for HuggingFace API"""
 
-    def __init__(self, requests_per_second: int = 5, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        requests_per_second: int = 5,
+        api_key: Optional[str] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        burst: Optional[int] = None
+    ):
         """
         Initialize the HuggingFace client with rate limiting.
 
         Args:
             requests_per_second: Maximum number of requests per second (default: 5)
             api_key: HuggingFace API key. If None, will try to load from environment.
+            pool_size: Maximum pooled keep-alive connections per host (default: 64)
+            burst: Requests allowed back to back before the rate applies
+                (default: requests_per_second)
         """
         self.requests_per_second = requests_per_second
+        self.pool_size = pool_size
+        self.limiter = TokenBucket(requests_per_second, burst or max(1, int(requests_per_second)))
         self.api_key = api_key or self._load_api_key()
         self.session = self._create_session()
 
     def _load_api_key(self) -> Optional[str]:
         """Load API key from environment or .env file"""
-        # Try to load from environment
-        api_key = os.getenv('HF_API_KEY')
-
-        if not api_key:
-            # Try to load from .env file
-            try:
-                from pathlib import Path
-                env_file = Path(__file__).parent.parent / '.env'
-                if env_file.exists():
-                    with open(env_file) as f:
-                        for line in f:
-                            line = line.strip()
-                            if line.startswith('HF_API_KEY='):
-                                api_key = line.split('=', 1)[1].strip()
-                                break
-            except Exception as e:
-                logger.warning(f"Could not load .env file: {e}")
+        # Environment first, then the (cached) .env file
+        api_key = os.getenv('HF_API_KEY') or _load_env_api_key()
 
         if not api_key:
             logger.warning("No HF_API_KEY found. Some API calls may be rate-limited more aggressively.")
 
         return api_key
 
-    def _create_session(self) -> LimiterSession:
-        """Create a rate-limited session with retry logic"""
-        # Create rate-limited session
-        session = LimiterSession(per_second=self.requests_per_second)
+    def _create_session(self) -> requests.Session:
+        """Create a session with retry logic (rate limiting happens in get())"""
+        session = requests.Session()
 
         # Configure retry strategy
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            # 429 is handled in get() so the backoff is shared by all threads
+            status_forcelist=[500, 502, 503, 504],
             allowed_methods=["HEAD", "GET", "OPTIONS"]
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
 
@@ -85,15 +174,35 @@ class HFClient:
         """
         Make a GET request with rate limiting
 
+        The local rate is tightened by the server's X-RateLimit-Remaining header, and a
+        429 pauses the whole client (Retry-After, or exponential backoff with jitter)
+        before retrying, up to RATE_LIMIT_RETRIES times.
+
         Args:
             url: URL to request
             **kwargs: Additional arguments to pass to requests.get()
 
         Returns:
-            Response object
+            Response object (the last 429 if retries run out)
         """
-        logger.debug(f"GET {url}")
-        return self.session.get(url, **kwargs)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self.limiter.acquire()
+            logger.debug(f"GET {url}")
+            response = self.session.get(url, **kwargs)
+
+            remaining = _header_number(response, 'X-RateLimit-Remaining')
+            if remaining is not None:
+                self.limiter.limit_to(remaining)
+
+            if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                return response
+
+            delay = _header_number(response, 'Retry-After')
+            if delay is None:
+                delay = RATE_LIMIT_BACKOFF * 2 ** attempt
+            delay += random.uniform(0, RATE_LIMIT_BACKOFF)
+            logger.warning(f"⏳ Rate limited (429) on {url}, pausing {delay:.1f}s")
+            self.limiter.pause(delay)
 
     def close(self):
         """Close the session"""
@@ -5,20 +5,77 @@ This script demonstrates how to scrape organization metadata from HuggingFace
 organization profile pages. The data is embedded in HTML as JSON in data-props attributes.
 """
 
+import atexit
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, NavigableString, Tag
 import json
 import html
 import re
-from typing import Dict, List, Optional
-
-
-def scrape_organization_metadata(org_name: str) -> Dict:
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+# lxml parses in C and lets us query the tree with XPath instead of building a
+# BeautifulSoup tree; without it we fall back to BeautifulSoup's pure-Python parser
+try:
+    from lxml import etree
+    HTML_PARSER = 'lxml'
+    DATA_PROPS_XPATH = etree.XPath('//*[@data-props]/@data-props')
+    LINKS_XPATH = etree.XPath('//a[@href]')
+    TEXT_XPATH = etree.XPath('//text()')
+except ImportError:
+    etree = None
+    HTML_PARSER = 'html.parser'
+
+# Link classification uses plain substring/prefix/suffix checks (one C-level call
+# per test, no regex engine), which is all these fixed patterns need
+TWITTER_MARKER = 'twitter.com/'
+GITHUB_MARKER = 'github.com/'
+HTTP_PREFIXES = ('http://', 'https://')
+CONTENT_LINK_SUFFIXES = ('/models', '/datasets', '/spaces')
+# Hosts (and their subdomains) that don't count as an organization's own website
+NON_WEBSITE_HOSTS = frozenset({'twitter.com', 'github.com', 'huggingface.co'})
+NON_WEBSITE_HOST_SUFFIXES = tuple('.' + host for host in NON_WEBSITE_HOSTS)
+
+# Models/datasets/spaces kept per listing as a sample; the rest only feed the totals
+SAMPLE_ITEMS = 5
+TEAM_RE = re.compile(r'Team members (\d+)')
+CONTENT_COUNT_RES = {
+    'models': re.compile(r'models (\d+)', re.IGNORECASE),
+    'datasets': re.compile(r'datasets (\d+)', re.IGNORECASE),
+    'spaces': re.compile(r'spaces (\d+)', re.IGNORECASE),
+}
+
+# orjson is much faster than the stdlib parser/encoder; fall back if it isn't installed
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# One keep-alive session for every page and API call (instead of a fresh
+# connection pool and TLS handshake per requests.get), closed at interpreter exit
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+atexit.register(_SESSION.close)
+
+
+def scrape_organization_metadata(org_name: str, keep_raw: bool = False) -> Dict:
     """
     Scrape metadata from a HuggingFace organization profile page.
 
     Args:
         org_name: Organization username (e.g., 'huggingface', 'meta-llama')
+        keep_raw: Also keep every parsed data-props blob in 'raw_data' (default: False)
 
     Returns:
         Dictionary containing organization metadata
@@ -26,14 +83,14 @@ def scrape_organization_metadata(org_name: str) -> Dict:
     url = f"https://huggingface.co/{org_name}"
 
     # Fetch the page
-    response = requests.get(url)
+    response = _SESSION.get(url)
     response.raise_for_status()
 
-    # Parse HTML
-    soup = BeautifulSoup(response.content, 'html.parser')
-
-    # Find all elements with data-props attribute
-    data_props_elements = soup.find_all(attrs={'data-props': True})
+    # Parse HTML and collect everything we need from it
+    if etree is not None:
+        page = scan_page_lxml(response.text)
+    else:
+        page = scan_page(BeautifulSoup(response.content, HTML_PARSER))
 
     metadata = {
         'organization': org_name,
@@ -46,15 +103,15 @@ def scrape_organization_metadata(org_name: str) -> Dict:
     }
 
     # Extract data from each data-props element
-    for element in data_props_elements:
-        props_raw = element.get('data-props', '')
-
-        # Decode HTML entities
-        props_decoded = html.unescape(props_raw)
+    for props_raw in page['data_props']:
+        # Decode HTML entities (the parser already decoded the attribute, so most
+        # values have none left and skip the pure-Python unescape entirely)
+        props_decoded = html.unescape(props_raw) if '&' in props_raw else props_raw
 
         try:
-            props_json = json.loads(props_decoded)
-            metadata['raw_data'].append(props_json)
+            props_json = json_loads(props_decoded)
+            if keep_raw:
+                metadata['raw_data'].append(props_json)
 
             # Extract organization basic info
             if 'org' in props_json:
@@ -94,148 +151,234 @@ def scrape_organization_metadata(org_name: str) -> Dict:
         except json.JSONDecodeError:
             continue
 
-    # Extract social links from page
-    social_links = extract_social_links(soup)
-    metadata['social_links'] = social_links
+    # Social links, team member count and content counts from the same walk
+    metadata['social_links'] = page['social_links']
 
-    # Extract team member count from page
-    team_count = extract_team_count(soup)
-    if team_count:
-        metadata['team_member_count'] = team_count
+    if page['team_member_count']:
+        metadata['team_member_count'] = page['team_member_count']
 
-    # Extract content counts from page
-    content_counts = extract_content_counts(soup)
-    metadata['content_counts'] = content_counts
+    metadata['content_counts'] = page['content_counts']
 
     return metadata
 
 
-def extract_social_links(soup: BeautifulSoup) -> Dict[str, str]:
-    """Extract social media links from organization page."""
-    social_links = {}
+def scan_page(soup: BeautifulSoup) -> Dict:
+    """
+    Walk the parsed page once, collecting data-props, social links, team count and content counts.
+
+    Args:
+        soup: Parsed organization page
+
+    Returns:
+        Dictionary with 'data_props' (raw attribute strings, in page order),
+        'social_links', 'team_member_count' (or None) and 'content_counts'
+    """
+    data_props = []
+    links = []
+    team_count = None
+
+    for node in soup.descendants:
+        if isinstance(node, Tag):
+            props_raw = node.get('data-props')
+            if props_raw is not None:
+                data_props.append(props_raw)
+            if node.name == 'a' and node.get('href') is not None:
+                links.append((node['href'], node.get_text))
+
+        elif team_count is None and isinstance(node, NavigableString):
+            # Look for team members heading
+            match = TEAM_RE.search(node)
+            if match:
+                team_count = int(match.group(1))
+
+    social_links, content_counts = classify_links(links)
+    return {
+        'data_props': data_props,
+        'social_links': social_links,
+        'team_member_count': team_count,
+        'content_counts': content_counts,
+    }
+
 
-    # Find Twitter link
-    twitter_link = soup.find('a', href=re.compile(r'twitter\.com/'))
-    if twitter_link:
-        social_links['twitter'] = twitter_link['href']
-
-    # Find GitHub link
-    github_link = soup.find('a', href=re.compile(r'github\.com/'))
-    if github_link:
-        social_links['github'] = github_link['href']
-
-    # Find website link (look for https:// links that aren't social media)
-    website_links = soup.find_all('a', href=re.compile(r'^https?://'))
-    for link in website_links:
-        href = link['href']
-        if not any(domain in href for domain in ['twitter.com', 'github.com', 'huggingface.co']):
-            social_links['website'] = href
+def scan_page_lxml(page_html: str) -> Dict:
+    """
+    Same result as scan_page(), but queried with compiled XPath on an lxml tree.
+
+    Args:
+        page_html: Organization page HTML
+
+    Returns:
+        Dictionary with 'data_props', 'social_links', 'team_member_count' and 'content_counts'
+    """
+    root = etree.HTML(page_html)
+    if root is None:
+        return {'data_props': [], 'social_links': {}, 'team_member_count': None, 'content_counts': {}}
+
+    links = [
+        (link.get('href'), partial(etree.tostring, link, method='text', encoding=str, with_tail=False))
+        for link in LINKS_XPATH(root)
+    ]
+    social_links, content_counts = classify_links(links)
+
+    # Look for team members heading
+    team_count = None
+    for text in TEXT_XPATH(root):
+        match = TEAM_RE.search(text)
+        if match:
+            team_count = int(match.group(1))
             break
 
-    return social_links
+    return {
+        'data_props': [str(value) for value in DATA_PROPS_XPATH(root)],
+        'social_links': social_links,
+        'team_member_count': team_count,
+        'content_counts': content_counts,
+    }
+
+
+def classify_links(links: List[Tuple[str, Callable[[], str]]]) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """
+    Pick social links and content counts out of a page's links (first link of each kind wins).
+
+    Args:
+        links: (href, get_text) pairs in page order; get_text is only called for
+            the models/datasets/spaces links
+
+    Returns:
+        (social_links, content_counts)
+    """
+    twitter = github = website = None
+    content_links = {}
+
+    for href, get_text in links:
+        if twitter is None and TWITTER_MARKER in href:
+            twitter = href
+        if github is None and GITHUB_MARKER in href:
+            github = href
+        # Website: an http(s) link whose host isn't social media or HuggingFace itself
+        if website is None and href.startswith(HTTP_PREFIXES):
+            host = href.split('/', 3)[2].lower()
+            if host not in NON_WEBSITE_HOSTS and not host.endswith(NON_WEBSITE_HOST_SUFFIXES):
+                website = href
+        # Content link: the kind is the last path segment (an href has at most one)
+        if href.endswith(CONTENT_LINK_SUFFIXES):
+            kind = href[href.rfind('/') + 1:]
+            if kind not in content_links:
+                content_links[kind] = get_text
+
+    social_links = {}
+    if twitter:
+        social_links['twitter'] = twitter
+    if github:
+        social_links['github'] = github
+    if website:
+        social_links['website'] = website
+
+    # Counts come from the text of the first models/datasets/spaces link
+    content_counts = {}
+    for kind, count_re in CONTENT_COUNT_RES.items():
+        if kind in content_links:
+            match = count_re.search(content_links[kind]())
+            if match:
+                content_counts[kind] = int(match.group(1))
+
+    return social_links, content_counts
+
+
+def extract_social_links(soup: BeautifulSoup) -> Dict[str, str]:
+    """Extract social media links from organization page."""
+    return scan_page(soup)['social_links']
 
 
 def extract_team_count(soup: BeautifulSoup) -> Optional[int]:
     """Extract team member count from page."""
-    # Look for team members heading
-    team_heading = soup.find(string=re.compile(r'Team members \d+'))
-    if team_heading:
-        match = re.search(r'Team members (\d+)', team_heading)
-        if match:
-            return int(match.group(1))
-    return None
+    return scan_page(soup)['team_member_count']
 
 
 def extract_content_counts(soup: BeautifulSoup) -> Dict[str, int]:
     """Extract counts of models, datasets, and spaces."""
-    counts = {}
+    return scan_page(soup)['content_counts']
 
-    # Look for models count
-    models_link = soup.find('a', href=re.compile(r'/models$'))
-    if models_link:
-        text = models_link.get_text()
-        match = re.search(r'models (\d+)', text, re.IGNORECASE)
-        if match:
-            counts['models'] = int(match.group(1))
 
-    # Look for datasets count
-    datasets_link = soup.find('a', href=re.compile(r'/datasets$'))
-    if datasets_link:
-        text = datasets_link.get_text()
-        match = re.search(r'datasets (\d+)', text, re.IGNORECASE)
-        if match:
-            counts['datasets'] = int(match.group(1))
+def fetch_author_items(url: str, org_name: str) -> List[Dict]:
+    """Fetch up to 1000 API items (models, datasets or spaces) owned by an organization."""
+    response = _SESSION.get(url, params={
+        'author': org_name,
+        'limit': 1000
+    })
+    return json_loads(response.content) if response.status_code == 200 else []
+
+
+def fetch_author_summary(url: str, org_name: str, with_downloads: bool = True) -> Dict:
+    """Fetch an organization's API listing and reduce it right away (see summarize_items)."""
+    return summarize_items(fetch_author_items(url, org_name), with_downloads)
 
-    # Look for spaces count
-    spaces_link = soup.find('a', href=re.compile(r'/spaces$'))
-    if spaces_link:
-        text = spaces_link.get_text()
-        match = re.search(r'spaces (\d+)', text, re.IGNORECASE)
-        if match:
-            counts['spaces'] = int(match.group(1))
 
-    return counts
+def summarize_items(items: List[Dict], with_downloads: bool = True) -> Dict:
+    """
+    Reduce an API listing to its count, like/download totals and a small sample, in one pass.
 
+    Args:
+        items: Models, datasets or spaces returned by the API
+        with_downloads: Include 'total_downloads' (spaces have no download counts)
 
-def get_full_organization_profile(org_name: str) -> Dict:
+    Returns:
+        Dictionary with 'count', 'total_likes', 'total_downloads' and 'items' (first SAMPLE_ITEMS)
+    """
+    total_likes = 0
+    total_downloads = 0
+    for item in items:
+        total_likes += item.get('likes', 0)
+        total_downloads += item.get('downloads', 0)
+
+    summary = {'count': len(items), 'total_likes': total_likes}
+    if with_downloads:
+        summary['total_downloads'] = total_downloads
+    summary['items'] = items[:SAMPLE_ITEMS]
+    return summary
+
+
+def get_full_organization_profile(org_name: str, keep_raw: bool = False, include_html: bool = True) -> Dict:
     """
     Get complete organization profile combining scraped metadata and API data.
 
+    Only the first SAMPLE_ITEMS models/datasets/spaces are kept as samples; the
+    full listings are reduced to counts and totals and then dropped.
+
     Args:
         org_name: Organization username
+        keep_raw: Also keep every parsed data-props blob in 'raw_data' (default: False)
+        include_html: Scrape the HTML page too; False skips that request and parse and
+            returns only a stub plus the API data (default: True)
 
     Returns:
         Complete organization profile with both scraped and API data
     """
-    # Scrape metadata from HTML
-    scraped_data = scrape_organization_metadata(org_name)
-
-    # Get content from APIs
     base_url = "https://huggingface.co/api"
 
+    # The HTML page and the three API listings are independent, so fetch all four at once
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        scraped_future = executor.submit(scrape_organization_metadata, org_name, keep_raw) if include_html else None
+        # Each listing is reduced in its worker as soon as it arrives, so the full
+        # item lists never outlive their own request
+        models_future = executor.submit(fetch_author_summary, f"{base_url}/models", org_name)
+        datasets_future = executor.submit(fetch_author_summary, f"{base_url}/datasets", org_name)
+        spaces_future = executor.submit(fetch_author_summary, f"{base_url}/spaces", org_name, False)
+
+        # Scrape metadata from HTML
+        if scraped_future is not None:
+            scraped_data = scraped_future.result()
+        else:
+            scraped_data = {'organization': org_name, 'url': f"https://huggingface.co/{org_name}"}
+
     try:
-        # Fetch models
-        models_response = requests.get(f"{base_url}/models", params={
-            'author': org_name,
-            'limit': 1000
-        })
-        models = models_response.json() if models_response.status_code == 200 else []
-
-        # Fetch datasets
-        datasets_response = requests.get(f"{base_url}/datasets", params={
-            'author': org_name,
-            'limit': 1000
-        })
-        datasets = datasets_response.json() if datasets_response.status_code == 200 else []
-
-        # Fetch spaces
-        spaces_response = requests.get(f"{base_url}/spaces", params={
-            'author': org_name,
-            'limit': 1000
-        })
-        spaces = spaces_response.json() if spaces_response.status_code == 200 else []
-
-        # Combine all data
+        # Get content from APIs and combine all data
         profile = {
             **scraped_data,
             'api_data': {
-                'models': {
-                    'count': len(models),
-                    'total_likes': sum(m.get('likes', 0) for m in models),
-                    'total_downloads': sum(m.get('downloads', 0) for m in models),
-                    'items': models
-                },
-                'datasets': {
-                    'count': len(datasets),
-                    'total_likes': sum(d.get('likes', 0) for d in datasets),
-                    'total_downloads': sum(d.get('downloads', 0) for d in datasets),
-                    'items': datasets
-                },
-                'spaces': {
-                    'count': len(spaces),
-                    'total_likes': sum(s.get('likes', 0) for s in spaces),
-                    'items': spaces
-                }
+                'models': models_future.result(),
+                'datasets': datasets_future.result(),
+                'spaces': spaces_future.result()
             }
         }
 
@@ -289,14 +432,8 @@ if __name__ == "__main__":
 
     # Save to JSON file
     output_file = f"{full_profile['basic_info'].get('name')}_profile.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        # Remove the full items list to keep file smaller
-        output_data = {**full_profile}
-        output_data['api_data']['models']['items'] = output_data['api_data']['models']['items'][:5]
-        output_data['api_data']['datasets']['items'] = output_data['api_data']['datasets']['items'][:5]
-        output_data['api_data']['spaces']['items'] = output_data['api_data']['spaces']['items'][:5]
-        output_data['raw_data'] = []  # Remove raw data
-
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        # Items are already trimmed to samples and raw data isn't kept by default
+        f.write(json_dumps_pretty(full_profile))
 
     print(f"\nFull profile saved to: {output_file}")
@@ -10,15 +10,15 @@ This script orchestrates the entire data collection and analysis pipeline:
 All logs are saved to a timestamped log file.
 """
 
+import re
 import sys
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Set
-import json
 
 from get_hf_models import get_hf_models
-from get_hf_organizations import get_hf_organizations
+from get_hf_organizations import get_hf_organizations, DEFAULT_CACHE_MAX_AGE
 from analyze_data import analyze_data
 
 
@@ -68,6 +68,11 @@ def setup_logging(log_dir: Path) -> logging.Logger:
     return logger
 
 
+# Author part of a model record's "id" (format: author/model-name). The top-level id
+# is the first "id" key in each API record, ahead of any nested objects.
+MODEL_AUTHOR_RE = re.compile(rb'"id"\s*:\s*"([^/"]*)/')
+
+
 def extract_organizations_from_models(models_file: Path) -> Set[str]:
     """
     Extract unique organization names from models data
@@ -84,19 +89,13 @@ def extract_organizations_from_models(models_file: Path) -> Set[str]:
         logging.warning(f"Models file not found: {models_file}")
         return orgs
 
-    with open(models_file, 'r') as f:
+    # Only the author is needed, so scan the raw bytes instead of decoding each record
+    search = MODEL_AUTHOR_RE.search
+    with open(models_file, 'rb') as f:
         for line in f:
-            try:
-                model = json.loads(line)
-                model_id = model.get('id', '')
-
-                # Extract author from model ID (format: author/model-name)
-                if '/' in model_id:
-                    author = model_id.split('/')[0]
-                    orgs.add(author)
-
-            except json.JSONDecodeError:
-                continue
+            match = search(line)
+            if match:
+                orgs.add(match.group(1).decode('utf-8'))
 
     return orgs
 
@@ -105,7 +104,9 @@ def run_pipeline(
     n_models: int = 100,
     requests_per_second: int = 5,
     sort: str = "downloads",
-    direction: int = -1
+    direction: int = -1,
+    rescrape: bool = False,
+    scrape_html: bool = True
 ):
     """
     Run the complete data collection and analysis pipeline
@@ -115,6 +116,10 @@ def run_pipeline(
         requests_per_second: API rate limit (default: 5)
         sort: Sort field for models (default: downloads)
         direction: Sort direction (-1 for descending, 1 for ascending)
+        rescrape: Scrape organizations again even if they are in the profile cache
+            (default: False, reuse profiles cached within the last 24h)
+        scrape_html: Scrape organization HTML pages too; False uses only the API listings,
+            leaving plan and follower counts unknown in the analysis (default: True)
     """
     # Setup paths
     script_dir = Path(__file__).parent
@@ -135,6 +140,7 @@ def run_pipeline(
         logger.info(f"  Models to fetch: {n_models}")
         logger.info(f"  Sort by: {sort} ({direction})")
         logger.info(f"  Rate limit: {requests_per_second} req/s")
+        logger.info(f"  Scrape org HTML pages: {scrape_html}")
         logger.info(f"  Data directory: {data_dir}")
 
         # Step 1: Fetch models
@@ -168,7 +174,9 @@ def run_pipeline(
         org_profiles = get_hf_organizations(
             org_names=sorted(orgs),  # Sort for consistent ordering
             requests_per_second=requests_per_second,
-            output_file=orgs_file
+            output_file=orgs_file,
+            max_age=0 if rescrape else DEFAULT_CACHE_MAX_AGE,
+            include_html=scrape_html
         )
 
         logger.info(f"✓ Scraped {len(org_profiles)} organizations")
@@ -231,6 +239,16 @@ if __name__ == "__main__":
         choices=[1, -1],
         help="Sort direction: -1 for descending, 1 for ascending (default: -1)"
     )
+    parser.add_argument(
+        "--rescrape",
+        action="store_true",
+        help="Scrape all organizations again instead of reusing recently cached profiles"
+    )
+    parser.add_argument(
+        "--no-scrape-html",
+        action="store_true",
+        help="Only use the API for organizations (skips one page fetch per org; no plan/follower data)"
+    )
 
     args = parser.parse_args()
 
@@ -238,5 +256,7 @@ if __name__ == "__main__":
         n_models=args.n_models,
         requests_per_second=args.rate_limit,
         sort=args.sort,
-        direction=args.direction
+        direction=args.direction,
+        rescrape=args.rescrape,
+        scrape_html=not args.no_scrape_html
     )
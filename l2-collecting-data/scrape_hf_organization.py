@@ -8,17 +8,332 @@ Since there is no dedicated organizations API, we must scrape HTML and combine w
 import json
 import logging
 import html
+import atexit
+import functools
 import requests
-from typing import Dict, Any
-from bs4 import BeautifulSoup
-from hf_client import get_client
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, NamedTuple, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+from hf_client import HFClient, get_client
+
+# lxml parses in C and answers the page lookups with compiled XPath, without building
+# a BeautifulSoup tree; without it we fall back to BeautifulSoup's pure-Python parser
+try:
+    from lxml import etree
+    HTML_PARSER = 'lxml'
+    DATA_PROPS_XPATH = etree.XPath('//*[@data-props]/@data-props')
+    TWITTER_HREF_XPATH = etree.XPath(
+        "(//a[contains(@href, 'twitter.com') or contains(@href, 'x.com')])[1]/@href")
+    GITHUB_HREF_XPATH = etree.XPath("(//a[contains(@href, 'github.com')])[1]/@href")
+    # bs4's attrs={'rel': 'noopener nofollow'} match, i.e. exactly those rel values in that order
+    WEBSITE_LINK_XPATH = etree.XPath("(//a[normalize-space(@rel) = 'noopener nofollow'])[1]")
+except ImportError:
+    etree = None
+    HTML_PARSER = 'html.parser'
+
+# Only <a> tags and data-props elements (with their contents) are read from an org
+# page, so the fallback BeautifulSoup tree is built for just those; the rest of the
+# page is never turned into Python objects
+if hasattr(SoupStrainer, 'allow_tag_creation'):
+    # bs4 >= 4.13 asks the strainer per start tag
+    class _OrgPageStrainer(SoupStrainer):
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            return name == 'a' or bool(attrs and 'data-props' in attrs)
+
+        def allow_string_creation(self, string) -> bool:
+            return False
+
+    ORG_PAGE_STRAINER = _OrgPageStrainer()
+else:
+    # Older bs4 calls a name function with (name, attrs) while parsing
+    ORG_PAGE_STRAINER = SoupStrainer(lambda name, attrs: name == 'a' or 'data-props' in attrs)
+
+# orjson is much faster than the stdlib parser (used for data-props and the API
+# listings, straight from the response bytes); fall back if it isn't installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Unauthenticated keep-alive session for org HTML pages, shared by every scrape so
+# each org page reuses an open connection instead of a new TLS handshake
+_HTML_SESSION = requests.Session()
+_HTML_SESSION.headers['User-Agent'] = 'HF-Data-Collection-Script/1.0'
+_HTML_SESSION.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=64))
+atexit.register(_HTML_SESSION.close)
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_client(requests_per_second: int) -> HFClient:
+    """API client reused by every call made without an explicit client (one per rate)"""
+    client = get_client(requests_per_second=requests_per_second)
+    atexit.register(client.close)
+    return client
+
+
+class OrgPageScan(NamedTuple):
+    """What scrape_org_page reads from an organization's HTML page"""
+    data_props: List[str]
+    twitter: Optional[str]
+    github: Optional[str]
+    website: Optional[str]  # href of the first rel="noopener nofollow" link ('' if it has none)
+
+
+def scan_org_page_lxml(page_html: str) -> OrgPageScan:
+    """Scan an org page with lxml and compiled XPath (no BeautifulSoup tree)"""
+    root = etree.HTML(page_html)
+    if root is None:
+        return OrgPageScan([], None, None, None)
+
+    twitter = TWITTER_HREF_XPATH(root)
+    github = GITHUB_HREF_XPATH(root)
+    website_link = WEBSITE_LINK_XPATH(root)
+    return OrgPageScan(
+        data_props=[str(value) for value in DATA_PROPS_XPATH(root)],
+        twitter=str(twitter[0]) if twitter else None,
+        github=str(github[0]) if github else None,
+        website=website_link[0].get('href', '') if website_link else None,
+    )
+
+
+def scan_org_page_bs4(page_content: bytes) -> OrgPageScan:
+    """Scan an org page with BeautifulSoup (used when lxml isn't installed)"""
+    soup = BeautifulSoup(page_content, HTML_PARSER, parse_only=ORG_PAGE_STRAINER)
+
+    twitter_link = soup.find('a', href=lambda x: x and ('twitter.com' in x or 'x.com' in x))
+    github_link = soup.find('a', href=lambda x: x and 'github.com' in x)
+    website_link = soup.find('a', attrs={'rel': 'noopener nofollow'})
+    return OrgPageScan(
+        data_props=[element['data-props'] for element in soup.find_all(attrs={'data-props': True})],
+        twitter=twitter_link.get('href') if twitter_link else None,
+        github=github_link.get('href') if github_link else None,
+        website=website_link.get('href', '') if website_link else None,
+    )
+
+
+def scrape_org_page(org_name: str, profile: Dict[str, Any]) -> bool:
+    """
+    Fill a profile's basic_info, follower_info, content and social_links from the org HTML page
+
+    Args:
+        org_name: Organization username/identifier
+        profile: Profile dictionary to fill in place
+
+    Returns:
+        False if the page could not be fetched (profile['error'] is set), True otherwise
+    """
+    # Note: HuggingFace rejects Authorization headers for HTML pages,
+    # so we use a plain shared session for HTML scraping but authenticated client for API calls
+    org_url = f"https://huggingface.co/{org_name}"
+    logger.debug(f"Fetching {org_url}")
+    response = _HTML_SESSION.get(org_url)
+
+    if response.status_code != 200:
+        logger.error(f"Failed to fetch organization page: {response.status_code}")
+        profile['error'] = f"HTTP {response.status_code}"
+        return False
+
+    # Parse HTML
+    if etree is not None:
+        page = scan_org_page_lxml(response.text)
+    else:
+        page = scan_org_page_bs4(response.content)
+
+    # Extract JSON data from data-props attributes
+    for raw in page.data_props:
+        try:
+            # Decode HTML entities (only if there are any) and parse JSON
+            props_data = json_loads(html.unescape(raw) if '&' in raw else raw)
+
+            # Extract basic info
+            if 'userProfile' in props_data:
+                user_profile = props_data['userProfile']
+                profile['basic_info'] = {
+                    'name': user_profile.get('name'),
+                    'fullname': user_profile.get('fullname'),
+                    'email': user_profile.get('email'),
+                    'plan': user_profile.get('plan'),
+                    'is_enterprise': user_profile.get('isEnterprise', False),
+                    'is_pro': user_profile.get('isPro', False),
+                    'created_at': user_profile.get('createdAt'),
+                }
+
+            # Extract follower info
+            if 'followers' in props_data:
+                followers_data = props_data['followers']
+                profile['follower_info'] = {
+                    'follower_count': followers_data.get('count', 0),
+                    'sample_followers': [
+                        {
+                            'user': f.get('user'),
+                            'fullname': f.get('fullname'),
+                            'avatarUrl': f.get('avatarUrl')
+                        }
+                        for f in followers_data.get('followers', [])[:10]  # First 10
+                    ]
+                }
+
+            # Extract card/README data
+            if 'cardData' in props_data:
+                profile['content']['card'] = props_data['cardData']
+
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.debug(f"Could not parse data-props: {e}")
+            continue
+
+    # Extract social links from HTML
+    social_links = {}
+
+    # Twitter/X and GitHub links
+    if page.twitter:
+        social_links['twitter'] = page.twitter
+    if page.github:
+        social_links['github'] = page.github
+
+    # Look for website link
+    if page.website is not None:
+        href = page.website
+        if 'http' in href and 'huggingface.co' not in href:
+            social_links['website'] = href
+
+    profile['social_links'] = social_links
+
+    return True
+
+
+# API listings are paged; each page holds up to this many items and points to the
+# next one via the Link header (orgs with more items used to be cut off at one page)
+LISTING_PAGE_SIZE = 1000
+
+
+def iter_listing(client: HFClient, kind: str, org_name: str) -> Iterator[dict]:
+    """
+    Yield every item of an organization's models/datasets/spaces API listing, page by page
+
+    Args:
+        client: API client to make the requests with
+        kind: 'models', 'datasets' or 'spaces'
+        org_name: Organization username/identifier
+
+    Returns:
+        Iterator over the listing's items; only one page is held at a time
+
+    Raises:
+        requests.HTTPError: If the first page can't be fetched (a later failing page
+            ends the listing early with a warning)
+    """
+    url = f"https://huggingface.co/api/{kind}"
+    params = {'author': org_name, 'limit': LISTING_PAGE_SIZE}
+    first_page = True
+
+    while url:
+        response = client.get(url, params=params)
+        if response.status_code != 200:
+            if first_page:
+                raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            logger.warning(f"Stopped paging {kind} for {org_name} at HTTP {response.status_code}; listing is partial")
+            return
+
+        yield from json_loads(response.content)
+
+        # Follow-up pages carry their params in the cursor URL
+        first_page = False
+        url, params = response.links.get('next', {}).get('url'), None
+
+
+def summarize_models(models: Iterable[dict]) -> Dict[str, Any]:
+    """Count and total a models listing while building its slim records (one pass)"""
+    total_likes = total_downloads = 0
+    model_rows = []
+    for m in models:
+        likes = m.get('likes', 0)
+        downloads = m.get('downloads', 0)
+        total_likes += likes
+        total_downloads += downloads
+        model_rows.append({
+            'id': m.get('id'),
+            'likes': likes,
+            'downloads': downloads,
+            'pipeline_tag': m.get('pipeline_tag'),
+            'tags': m.get('tags', [])
+        })
+    return {
+        'count': len(model_rows),
+        'total_likes': total_likes,
+        'total_downloads': total_downloads,
+        'models': model_rows
+    }
+
+
+def summarize_datasets(datasets: Iterable[dict]) -> Dict[str, Any]:
+    """Count and total a datasets listing while building its slim records (one pass)"""
+    total_likes = 0
+    dataset_rows = []
+    for d in datasets:
+        likes = d.get('likes', 0)
+        total_likes += likes
+        dataset_rows.append({
+            'id': d.get('id'),
+            'likes': likes,
+            'downloads': d.get('downloads')
+        })
+    return {
+        'count': len(dataset_rows),
+        'total_likes': total_likes,
+        'datasets': dataset_rows
+    }
+
+
+def summarize_spaces(spaces: Iterable[dict]) -> Dict[str, Any]:
+    """Count and total a spaces listing while building its slim records (one pass)"""
+    total_likes = 0
+    space_rows = []
+    for sp in spaces:
+        likes = sp.get('likes', 0)
+        total_likes += likes
+        space_rows.append({'id': sp.get('id'), 'likes': likes})
+    return {
+        'count': len(space_rows),
+        'total_likes': total_likes,
+        'spaces': space_rows
+    }
+
+
+LISTING_SUMMARIZERS = {
+    'models': summarize_models,
+    'datasets': summarize_datasets,
+    'spaces': summarize_spaces,
+}
+
+
+def fetch_listing_summary(client: HFClient, kind: str, org_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch all pages of an organization's listing and reduce them as they arrive
+
+    Args:
+        client: API client to make the requests with
+        kind: 'models', 'datasets' or 'spaces'
+        org_name: Organization username/identifier
+
+    Returns:
+        Listing summary, or None if the listing could not be fetched
+    """
+    try:
+        return LISTING_SUMMARIZERS[kind](iter_listing(client, kind, org_name))
+    except requests.HTTPError as e:
+        logger.warning(f"Failed to fetch {kind}: {e.response.status_code}")
+        return None
+
 
 def scrape_hf_organization(
     org_name: str,
-    requests_per_second: int = 5
+    requests_per_second: int = 5,
+    client: Optional[HFClient] = None,
+    include_html: bool = True
 ) -> Dict[str, Any]:
     """
     Scrape metadata for a single HuggingFace organization
@@ -26,6 +341,10 @@ def scrape_hf_organization(
     Args:
         org_name: Organization username/identifier
         requests_per_second: Rate limit for API requests (default: 5)
+        client: Shared API client (and rate limit) to use; if None, a module-level client
+            for requests_per_second is reused across calls
+        include_html: Also scrape the HTML page for basic info, followers and social
+            links; False fetches only the API listings (default: True)
 
     Returns:
         Dictionary containing organization metadata
@@ -39,167 +358,32 @@ def scrape_hf_organization(
         'social_links': {},
         'content': {},
         'api_data': {},
+        'scraped_html': include_html,
         'error': None
     }
 
-    # Note: HuggingFace rejects Authorization headers for HTML pages,
-    # so we use plain requests for HTML scraping but authenticated client for API calls
     try:
-        # Scrape organization page HTML (without auth)
-        org_url = f"https://huggingface.co/{org_name}"
-        logger.debug(f"Fetching {org_url}")
-        response = requests.get(org_url, headers={'User-Agent': 'HF-Data-Collection-Script/1.0'})
-
-        if response.status_code != 200:
-            logger.error(f"Failed to fetch organization page: {response.status_code}")
-            profile['error'] = f"HTTP {response.status_code}"
-            return profile
-
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Extract JSON data from data-props attributes
-        data_props_elements = soup.find_all(attrs={'data-props': True})
-
-        for element in data_props_elements:
-            try:
-                # Decode HTML entities and parse JSON
-                props_json = html.unescape(element['data-props'])
-                props_data = json.loads(props_json)
-
-                # Extract basic info
-                if 'userProfile' in props_data:
-                    user_profile = props_data['userProfile']
-                    profile['basic_info'] = {
-                        'name': user_profile.get('name'),
-                        'fullname': user_profile.get('fullname'),
-                        'email': user_profile.get('email'),
-                        'plan': user_profile.get('plan'),
-                        'is_enterprise': user_profile.get('isEnterprise', False),
-                        'is_pro': user_profile.get('isPro', False),
-                        'created_at': user_profile.get('createdAt'),
-                    }
-
-                # Extract follower info
-                if 'followers' in props_data:
-                    followers_data = props_data['followers']
-                    profile['follower_info'] = {
-                        'follower_count': followers_data.get('count', 0),
-                        'sample_followers': [
-                            {
-                                'user': f.get('user'),
-                                'fullname': f.get('fullname'),
-                                'avatarUrl': f.get('avatarUrl')
-                            }
-                            for f in followers_data.get('followers', [])[:10]  # First 10
-                        ]
-                    }
-
-                # Extract card/README data
-                if 'cardData' in props_data:
-                    profile['content']['card'] = props_data['cardData']
-
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.debug(f"Could not parse data-props: {e}")
-                continue
-
-        # Extract social links from HTML
-        social_links = {}
-
-        # Look for Twitter/X link
-        twitter_link = soup.find('a', href=lambda x: x and ('twitter.com' in x or 'x.com' in x))
-        if twitter_link:
-            social_links['twitter'] = twitter_link.get('href')
-
-        # Look for GitHub link
-        github_link = soup.find('a', href=lambda x: x and 'github.com' in x)
-        if github_link:
-            social_links['github'] = github_link.get('href')
-
-        # Look for website link
-        website_link = soup.find('a', attrs={'rel': 'noopener nofollow'})
-        if website_link:
-            href = website_link.get('href', '')
-            if 'http' in href and 'huggingface.co' not in href:
-                social_links['website'] = href
-
-        profile['social_links'] = social_links
-
-        # Use authenticated client for API calls
-        with get_client(requests_per_second=requests_per_second) as client:
-            # Get models via API
-            logger.debug(f"Fetching models for {org_name}")
-            models_response = client.get(
-                "https://huggingface.co/api/models",
-                params={'author': org_name, 'limit': 1000}
-            )
-
-            if models_response.status_code == 200:
-                models = models_response.json()
-                profile['api_data']['models'] = {
-                    'count': len(models),
-                    'total_likes': sum(m.get('likes', 0) for m in models),
-                    'total_downloads': sum(m.get('downloads', 0) for m in models),
-                    'models': [
-                        {
-                            'id': m.get('id'),
-                            'likes': m.get('likes', 0),
-                            'downloads': m.get('downloads', 0),
-                            'pipeline_tag': m.get('pipeline_tag'),
-                            'tags': m.get('tags', [])
-                        }
-                        for m in models
-                    ]
-                }
-            else:
-                logger.warning(f"Failed to fetch models: {models_response.status_code}")
-
-            # Get datasets via API
-            logger.debug(f"Fetching datasets for {org_name}")
-            datasets_response = client.get(
-                "https://huggingface.co/api/datasets",
-                params={'author': org_name, 'limit': 1000}
-            )
-
-            if datasets_response.status_code == 200:
-                datasets = datasets_response.json()
-                profile['api_data']['datasets'] = {
-                    'count': len(datasets),
-                    'total_likes': sum(d.get('likes', 0) for d in datasets),
-                    'datasets': [
-                        {
-                            'id': d.get('id'),
-                            'likes': d.get('likes', 0),
-                            'downloads': d.get('downloads', 0) if 'downloads' in d else None
-                        }
-                        for d in datasets
-                    ]
-                }
-            else:
-                logger.warning(f"Failed to fetch datasets: {datasets_response.status_code}")
-
-            # Get spaces via API
-            logger.debug(f"Fetching spaces for {org_name}")
-            spaces_response = client.get(
-                "https://huggingface.co/api/spaces",
-                params={'author': org_name, 'limit': 1000}
-            )
-
-            if spaces_response.status_code == 200:
-                spaces = spaces_response.json()
-                profile['api_data']['spaces'] = {
-                    'count': len(spaces),
-                    'total_likes': sum(s.get('likes', 0) for s in spaces),
-                    'spaces': [
-                        {
-                            'id': s.get('id'),
-                            'likes': s.get('likes', 0)
-                        }
-                        for s in spaces
-                    ]
-                }
-            else:
-                logger.warning(f"Failed to fetch spaces: {spaces_response.status_code}")
+        # Use authenticated client for API calls (kept open so later calls reuse its connections)
+        if client is None:
+            client = _shared_client(requests_per_second)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # The three listings are independent of each other and of the HTML page, so
+            # request them all at once and scrape the page while they are in flight
+            logger.debug(f"Fetching models, datasets and spaces for {org_name}")
+            listing_futures = {
+                kind: executor.submit(fetch_listing_summary, client, kind, org_name)
+                for kind in ('models', 'datasets', 'spaces')
+            }
+
+            # A missing org page is still an error for the whole profile
+            if include_html and not scrape_org_page(org_name, profile):
+                return profile
+
+            # Listings that could not be fetched are left out of api_data
+            for kind, future in listing_futures.items():
+                summary = future.result()
+                if summary is not None:
+                    profile['api_data'][kind] = summary
 
         logger.info(f"Successfully scraped {org_name}")
 
@@ -7,7 +7,10 @@ import os
 import sys
 import logging
 import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 # Add src directory to path
@@ -53,6 +56,23 @@ def setup_logging(log_dir):
     logging.info("="*60)
 
 
+def _init_worker_logging(log_queue):
+    """
+    Send a worker process's log records to the parent, which writes them to its handlers.
+
+    Args:
+        log_queue: Queue drained by the parent's QueueListener
+    """
+    logger = logging.getLogger()
+    logger.handlers[:] = [QueueHandler(log_queue)]
+    logger.setLevel(logging.INFO)
+
+
+def _run_stage(stage, *args):
+    """Run a stage in a worker process, dropping its return value so it isn't pickled back."""
+    stage(*args)
+
+
 def run_download(project_root):
     """
     Run download stages only.
@@ -127,20 +147,38 @@ def run_processing(project_root):
         raw_data_path = project_root / 'data' / 'raw' / 'sample_data.csv'
         clean_data_path = output_dir / 'cleaned_data.csv'
         models_parquet_path = project_root / 'data' / 'raw' / 'models.parquet'
-        models_csv_path = output_dir / 'models.csv'
+        models_output_path = output_dir / 'models.parquet'
 
         # Execute processing stages
         logging.info("Starting data processing stages...")
 
-        # Stage A: Clean models data
-        clean_models_data(models_parquet_path, models_csv_path)
-
-        # Stage B: Sample data cleaning (original pipeline)
-        process_data(raw_data_path, clean_data_path)
-
-        # Add more processing stages here as needed
-        # from stage_c_code import process_stage_c
-        # process_stage_c(models_csv_path, output_dir / 'stage_c_output.csv')
+        # Stages read and write disjoint files, so they run side by side in separate
+        # processes; worker log records go through a queue to this process's handlers
+        log_queue = multiprocessing.Queue()
+        listener = QueueListener(log_queue, *logging.getLogger().handlers)
+        listener.start()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=2,
+                initializer=_init_worker_logging,
+                initargs=(log_queue,)
+            ) as executor:
+                stages = [
+                    # Stage A: Clean models data
+                    executor.submit(_run_stage, clean_models_data, models_parquet_path, models_output_path),
+                    # Stage B: Sample data cleaning (original pipeline)
+                    executor.submit(_run_stage, process_data, raw_data_path, clean_data_path),
+                ]
+
+                # Add more independent processing stages here as needed
+                # from stage_c_code import process_stage_c
+                # stages.append(executor.submit(_run_stage, process_stage_c, raw_path, output_dir / 'stage_c_output.csv'))
+
+                # Re-raises the first stage failure
+                for stage in as_completed(stages):
+                    stage.result()
+        finally:
+            listener.stop()
 
         logging.info("="*60)
         logging.info("Processing completed successfully!")
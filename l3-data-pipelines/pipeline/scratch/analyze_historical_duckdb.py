@@ -7,28 +7,37 @@ This script processes daily snapshots of HuggingFace models data to calculate:
 
 Input: Parquet files in l3-data-pipelines/data/raw/historical/
 Output: Aggregated daily downloads by author
+
+With --input-file, it instead runs the pandas/Polars/PostgreSQL analysis (author daily
+downloads) directly on the cleaned history from clean_historical_pandas.py.
 """
+import argparse
 import duckdb
 from pathlib import Path
-import re
 import time
 
+# COPY options by output suffix: parquet is written by all threads and compresses far
+# smaller; CSV (for external consumers) is still written in parallel
+COPY_OPTIONS = {
+    '.parquet': "FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 122880",
+    '.csv': "FORMAT CSV, HEADER, DELIMITER ','",
+}
+
 
-def extract_date_from_filename(filename):
+def sql_quote(path):
     """
-    Extract date from filename like 'models-20250825-510957d.parquet'.
+    Quote a path as a SQL string literal.
+
+    COPY ... TO does not accept a bound parameter as its target in older DuckDB
+    releases, so the output path is quoted instead of interpolated raw.
 
     Args:
-        filename: Name of the parquet file
+        path: File path
 
     Returns:
-        Date string in YYYY-MM-DD format
+        Single-quoted SQL literal with embedded quotes escaped
     """
-    match = re.search(r'models-(\d{8})-', filename)
-    if match:
-        date_str = match.group(1)
-        return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-    return None
+    return "'" + str(path).replace("'", "''") + "'"
 
 
 def process_historical_data(data_dir, output_path=None):
@@ -37,7 +46,7 @@ def process_historical_data(data_dir, output_path=None):
 
     Args:
         data_dir: Path to directory containing historical parquet files
-        output_path: Optional path to save results as CSV
+        output_path: Optional path to save results (.parquet, or .csv)
 
     Returns:
         DuckDB relation with daily downloads by author
@@ -53,93 +62,66 @@ def process_historical_data(data_dir, output_path=None):
 
     print(f"Processing historical data from: {data_dir}")
 
-    # Get all parquet files sorted by date
+    # DuckDB expands the glob itself (the scan below reuses the same pattern)
     step_start = time.time()
-    parquet_files = sorted(data_dir.glob("models-*.parquet"))
+    snapshot_glob = str(data_dir / "models-*.parquet")
+    n_files = conn.execute("SELECT COUNT(*) FROM glob(?)", [snapshot_glob]).fetchone()[0]
     timings['file_discovery'] = time.time() - step_start
-    print(f"Found {len(parquet_files)} parquet files (took {timings['file_discovery']:.2f}s)")
+    print(f"Found {n_files} parquet files (took {timings['file_discovery']:.2f}s)")
 
-    if len(parquet_files) == 0:
+    if n_files == 0:
         raise ValueError(f"No parquet files found in {data_dir}")
 
-    # Step 1: Load all historical data with dates
-    print("\nStep 1: Loading historical data...")
-    step_start = time.time()
-
-    # Create a union of all files with their respective dates
-    union_queries = []
-    for file_path in parquet_files:
-        date = extract_date_from_filename(file_path.name)
-        if date:
-            # Extract author from id (format: "author/model-name")
-            query = f"""
-                SELECT
-                    '{date}'::DATE as snapshot_date,
-                    id,
-                    SPLIT_PART(id, '/', 1) as author,
-                    downloadsAllTime
-                FROM '{file_path}'
-                WHERE id IS NOT NULL
-                  AND downloadsAllTime IS NOT NULL
-                  AND SPLIT_PART(id, '/', 1) != ''
-            """
-            union_queries.append(query)
-
-    if not union_queries:
-        raise ValueError("No valid dates extracted from filenames")
-
-    # Combine all snapshots
-    full_union_query = " UNION ALL ".join(union_queries)
-
-    conn.execute(f"CREATE OR REPLACE TEMP TABLE all_snapshots AS {full_union_query}")
-
-    # Check the data
-    result = conn.execute("SELECT COUNT(*) as total_rows FROM all_snapshots").fetchdf()
-    timings['load_data'] = time.time() - step_start
-    print(f"Loaded {result['total_rows'][0]:,} total rows across all snapshots (took {timings['load_data']:.2f}s)")
-
-    # Step 2: Calculate daily downloads per model
-    print("\nStep 2: Calculating daily downloads per model...")
-    step_start = time.time()
-
-    conn.execute("""
-        CREATE OR REPLACE TEMP TABLE daily_model_downloads AS
-        SELECT
-            snapshot_date,
-            id,
-            author,
-            downloadsAllTime,
-            downloadsAllTime - LAG(downloadsAllTime) OVER (
-                PARTITION BY id
-                ORDER BY snapshot_date
-            ) as daily_downloads
-        FROM all_snapshots
-        ORDER BY id, snapshot_date
-    """)
-    timings['calculate_daily_downloads'] = time.time() - step_start
-    print(f"Calculated daily downloads per model (took {timings['calculate_daily_downloads']:.2f}s)")
-
-    # Step 3: Aggregate by author and date
-    print("\nStep 3: Aggregating by author and date...")
+    # Load, diff and aggregate in one statement: the snapshot scan and the LAG window
+    # feed the GROUP BY directly instead of materializing each intermediate as a table
+    print("\nStep 1: Loading snapshots and aggregating daily downloads by author...")
     step_start = time.time()
 
-    conn.execute("""
+    # One multi-file scan: DuckDB lists and reads the files in parallel, reads only the
+    # columns used here, and takes each row's snapshot date from its file name
+    # (files without a date in their name, e.g. models-latest.parquet, are skipped)
+    conn.execute(r"""
         CREATE OR REPLACE TEMP TABLE author_daily_downloads AS
+        WITH all_snapshots AS (
+            SELECT
+                try_strptime(regexp_extract(filename, 'models-(\d{8})-[^/\\]*$', 1), '%Y%m%d')::DATE as snapshot_date,
+                id,
+                SPLIT_PART(id, '/', 1) as author,  -- id format: "author/model-name"
+                downloadsAllTime
+            FROM read_parquet(?, filename = true, union_by_name = true, hive_partitioning = false)
+            WHERE snapshot_date IS NOT NULL
+              AND id IS NOT NULL
+              AND downloadsAllTime IS NOT NULL
+              AND SPLIT_PART(id, '/', 1) != ''
+        ),
+        daily_model_downloads AS (
+            -- id is only needed to partition the window; the aggregate gets just what it sums
+            SELECT
+                snapshot_date,
+                author,
+                downloadsAllTime,
+                downloadsAllTime - LAG(downloadsAllTime) OVER (
+                    PARTITION BY id
+                    ORDER BY snapshot_date
+                ) as daily_downloads
+            FROM all_snapshots
+        )
         SELECT
             snapshot_date,
             author,
-            COUNT(DISTINCT id) as n_models,
+            COUNT(*) as n_models,  -- one row per model per snapshot, so no DISTINCT needed
             SUM(daily_downloads) as total_daily_downloads,
             AVG(daily_downloads) as avg_daily_downloads_per_model,
             SUM(downloadsAllTime) as total_cumulative_downloads
         FROM daily_model_downloads
-        WHERE daily_downloads IS NOT NULL
-          AND daily_downloads >= 0  -- Filter out negative values (data anomalies)
+        WHERE daily_downloads >= 0  -- Drops first snapshots (NULL) and negative values (data anomalies)
         GROUP BY snapshot_date, author
         ORDER BY snapshot_date, total_daily_downloads DESC
-    """)
-    timings['aggregate_by_author'] = time.time() - step_start
-    print(f"Aggregated by author and date (took {timings['aggregate_by_author']:.2f}s)")
+    """, [snapshot_glob])
+
+    n_rows = conn.execute("SELECT COUNT(*) FROM author_daily_downloads").fetchone()[0]
+    timings['process'] = time.time() - step_start
+    print(f"Aggregated {n_rows:,} author-days (took {timings['process']:.2f}s)")
 
     # Show summary statistics
     print("\nSummary Statistics:")
@@ -178,10 +160,11 @@ def process_historical_data(data_dir, output_path=None):
 
         print(f"\nSaving results to: {output_path}")
         step_start = time.time()
+        copy_options = COPY_OPTIONS.get(output_path.suffix, COPY_OPTIONS['.csv'])
         conn.execute(f"""
             COPY author_daily_downloads
-            TO '{output_path}'
-            (HEADER, DELIMITER ',')
+            TO {sql_quote(output_path)}
+            ({copy_options})
         """)
         timings['save_output'] = time.time() - step_start
 
@@ -197,9 +180,7 @@ def process_historical_data(data_dir, output_path=None):
     print("PERFORMANCE BENCHMARKS")
     print("="*80)
     print(f"File discovery:              {timings['file_discovery']:>8.2f}s ({timings['file_discovery']/total_time*100:>5.1f}%)")
-    print(f"Load data:                   {timings['load_data']:>8.2f}s ({timings['load_data']/total_time*100:>5.1f}%)")
-    print(f"Calculate daily downloads:   {timings['calculate_daily_downloads']:>8.2f}s ({timings['calculate_daily_downloads']/total_time*100:>5.1f}%)")
-    print(f"Aggregate by author:         {timings['aggregate_by_author']:>8.2f}s ({timings['aggregate_by_author']/total_time*100:>5.1f}%)")
+    print(f"Load + daily + aggregate:    {timings['process']:>8.2f}s ({timings['process']/total_time*100:>5.1f}%)")
     if 'save_output' in timings:
         print(f"Save output:                 {timings['save_output']:>8.2f}s ({timings['save_output']/total_time*100:>5.1f}%)")
     print("-" * 80)
@@ -210,20 +191,108 @@ def process_historical_data(data_dir, output_path=None):
     return conn.execute("SELECT * FROM author_daily_downloads")
 
 
+def analyze_cleaned_data(input_path, output_path=None, limit=None):
+    """
+    Compute author daily downloads from the cleaned history (clean_historical_pandas.py output).
+
+    Same computation as the pandas, Polars and PostgreSQL analyses (first day counts
+    its downloadsAllTime, negative differences count as 0), run in-process on the
+    parquet or CSV file directly: no load phase, no index builds.
+
+    Args:
+        input_path: Path to the cleaned parquet (.parquet) or CSV file
+        output_path: Optional path to save results (.parquet, or .csv)
+        limit: Optional row limit for testing
+
+    Returns:
+        DuckDB relation with author, snapshot_date and total_daily_downloads
+    """
+    start_time = time.time()
+    input_path = Path(input_path)
+    conn = duckdb.connect()
+
+    print(f"Analyzing cleaned history from: {input_path}")
+    reader = 'read_parquet' if input_path.suffix == '.parquet' else 'read_csv'
+    source = f"(SELECT * FROM {reader}(?) LIMIT {int(limit)})" if limit else f"{reader}(?)"
+
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE author_daily_downloads AS
+        WITH daily_diffs AS (
+            SELECT
+                SPLIT_PART(id, '/', 1) AS author,
+                snapshot_date,
+                CASE
+                    WHEN LAG(downloadsAllTime) OVER w IS NULL THEN downloadsAllTime
+                    WHEN downloadsAllTime < LAG(downloadsAllTime) OVER w THEN 0
+                    ELSE downloadsAllTime - LAG(downloadsAllTime) OVER w
+                END AS daily_downloads
+            FROM {source}
+            WHERE id IS NOT NULL
+            WINDOW w AS (PARTITION BY id ORDER BY snapshot_date)
+        )
+        SELECT
+            author,
+            snapshot_date,
+            -- Author-days with no known totals sum to 0, as in pandas and Polars
+            COALESCE(SUM(daily_downloads), 0) AS total_daily_downloads
+        FROM daily_diffs
+        GROUP BY author, snapshot_date
+        ORDER BY author, snapshot_date
+    """, [str(input_path)])
+
+    n_rows = conn.execute("SELECT COUNT(*) FROM author_daily_downloads").fetchone()[0]
+    print(f"Aggregated {n_rows:,} author-days (took {time.time() - start_time:.2f}s)")
+
+    if output_path:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        copy_options = COPY_OPTIONS.get(output_path.suffix, COPY_OPTIONS['.csv'])
+        conn.execute(f"COPY author_daily_downloads TO {sql_quote(output_path)} ({copy_options})")
+        print(f"Saved {output_path.name} ({output_path.stat().st_size / (1024 * 1024):.2f} MB)")
+
+    print(f"TOTAL TIME: {time.time() - start_time:.2f}s")
+    return conn.execute("SELECT * FROM author_daily_downloads")
+
+
 def main():
     """Main execution function."""
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Compute author daily downloads with DuckDB")
+    parser.add_argument(
+        '--input-file',
+        type=Path,
+        default=None,
+        help='Cleaned history (parquet or CSV from clean_historical_pandas.py) to analyze '
+             'instead of the raw snapshots'
+    )
+    parser.add_argument(
+        '--output-file',
+        type=Path,
+        default=None,
+        help='Output file (.parquet or .csv; default: ../data/processed/author_daily_downloads.parquet, '
+             'or author_daily_downloads_duckdb.csv with --input-file)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=None,
+        help='Limit number of input rows to process (for testing; --input-file only)'
+    )
+    args = parser.parse_args()
+
     print("="*80)
     print("HISTORICAL DATA PROCESSING - DUCKDB")
     print("="*80)
     print(f"Start time: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
 
-    # Set paths
-    script_dir = Path(__file__).parent
-    data_dir = script_dir.parent / 'data' / 'raw' / 'historical'
-    output_path = script_dir.parent / 'data' / 'processed' / 'author_daily_downloads.csv'
-
     # Process the data
-    result = process_historical_data(data_dir, output_path)
+    if args.input_file:
+        output_path = args.output_file or script_dir.parent / 'data' / 'processed' / 'author_daily_downloads_duckdb.csv'
+        result = analyze_cleaned_data(args.input_file, output_path, args.limit)
+    else:
+        data_dir = script_dir.parent / 'data' / 'raw' / 'historical'
+        output_path = args.output_file or script_dir.parent / 'data' / 'processed' / 'author_daily_downloads.parquet'
+        result = process_historical_data(data_dir, output_path)
 
     print("\n" + "="*80)
     print("Processing complete!")
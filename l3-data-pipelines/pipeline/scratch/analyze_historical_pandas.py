@@ -5,7 +5,7 @@ Analyze Historical HuggingFace Downloads using Pandas
 Computes daily downloads by author using pure Pandas operations (in-memory).
 
 The task:
-- Load historical download data from CSV
+- Load historical download data from parquet (or CSV)
 - Compute daily downloads (difference in downloadsAllTime between consecutive days)
 - Aggregate by author to get total daily downloads per author
 - Output results to CSV
@@ -21,6 +21,18 @@ import time
 from pathlib import Path
 import pandas as pd
 
+# The only input columns the analysis reads
+INPUT_COLUMNS = ['id', 'downloadsAllTime', 'snapshot_date']
+
+# Precomputed author column written by clean_historical_pandas.py (parquet output);
+# read when present instead of splitting every id
+AUTHOR_COLUMN = 'author'
+
+# Text columns are held as Arrow strings (one contiguous buffer) rather than one
+# Python object per cell, which is most of the frame's memory on large inputs
+STRING_DTYPE = 'string[pyarrow]'
+TEXT_DTYPES = {'id': STRING_DTYPE, 'snapshot_date': STRING_DTYPE}
+
 
 def setup_logging(verbose: bool = False):
     """Configure logging."""
@@ -52,12 +64,45 @@ def extract_author(model_id: str) -> str:
     return model_id
 
 
+def load_input(input_path: Path, limit: int = None) -> pd.DataFrame:
+    """
+    Load the input columns from a parquet or CSV file.
+
+    Parquet is columnar, so only INPUT_COLUMNS (plus AUTHOR_COLUMN, if the file
+    has it) are read and their dtypes come from the file instead of being inferred
+    from text. Text columns are loaded as Arrow-backed strings (TEXT_DTYPES).
+
+    Args:
+        input_path: Path to input parquet (.parquet) or CSV file
+        limit: Optional row limit for testing
+
+    Returns:
+        DataFrame with INPUT_COLUMNS, and a categorical AUTHOR_COLUMN if stored
+    """
+    if input_path.suffix == '.parquet':
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(input_path)
+        columns = INPUT_COLUMNS + [c for c in [AUTHOR_COLUMN] if c in dataset.schema.names]
+        # A dictionary-encoded author column comes back as a categorical
+        if limit:
+            table = dataset.head(limit, columns=columns)
+        else:
+            table = dataset.to_table(columns=columns)
+        # Arrow strings stay Arrow strings instead of becoming Python objects
+        string_dtype = pd.StringDtype('pyarrow')
+        return table.to_pandas(
+            types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype}.get
+        )
+    return pd.read_csv(input_path, usecols=INPUT_COLUMNS, nrows=limit, dtype=TEXT_DTYPES)
+
+
 def analyze_historical_data(csv_path: Path, output_path: Path, limit: int = None):
     """
     Compute author daily downloads using pure Pandas.
 
     Args:
-        csv_path: Path to input CSV file
+        csv_path: Path to input parquet or CSV file
         output_path: Path to output CSV file
         limit: Optional row limit for testing
     """
@@ -71,33 +116,36 @@ def analyze_historical_data(csv_path: Path, output_path: Path, limit: int = None
 
     if limit:
         logging.info(f"Loading first {limit:,} rows for testing...")
-        df = pd.read_csv(csv_path, nrows=limit)
     else:
         logging.info("Loading full dataset (this may take a while)...")
-        df = pd.read_csv(csv_path)
+    df_subset = load_input(csv_path, limit)
 
     load_time = time.time() - start_load
-    logging.info(f"✓ Data loaded: {len(df):,} rows in {load_time:.2f}s")
-    logging.info(f"  Memory usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+    logging.info(f"✓ Data loaded: {len(df_subset):,} rows in {load_time:.2f}s")
+    logging.info(f"  Memory usage: {df_subset.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
 
     # Compute daily downloads
     logging.info("Computing daily downloads by author...")
     start_compute = time.time()
 
-    # Select required columns
-    df_subset = df[['id', 'downloadsAllTime', 'snapshot_date']].copy()
-
-    # Extract author from id
+    # Extract author from id (vectorized; same result as extract_author per row),
+    # unless the input already stores it
     logging.info("  Extracting authors from model IDs...")
-    df_subset['author'] = df_subset['id'].apply(extract_author)
-
-    # Sort by id and snapshot_date to ensure correct ordering
-    logging.info("  Sorting data by model ID and date...")
-    df_subset = df_subset.sort_values(['id', 'snapshot_date'])
+    # Authors repeat across many models and days, so a categorical stores each name
+    # once and lets the author/date groupby hash small integer codes
+    if AUTHOR_COLUMN not in df_subset.columns:
+        df_subset['author'] = df_subset['id'].str.split('/', n=1).str[0].astype('category')
+
+    # The diff only needs each model's rows in date order, not the frame grouped by id.
+    # Cleaned snapshots are concatenated in date order already, so usually nothing is
+    # sorted; otherwise a stable sort on the date alone is enough
+    if not df_subset['snapshot_date'].is_monotonic_increasing:
+        logging.info("  Sorting data by date...")
+        df_subset = df_subset.sort_values('snapshot_date', kind='stable')
 
     # Compute daily downloads as difference between consecutive days for same model
     logging.info("  Computing daily download differences...")
-    df_subset['daily_downloads'] = df_subset.groupby('id')['downloadsAllTime'].diff()
+    df_subset['daily_downloads'] = df_subset.groupby('id', sort=False)['downloadsAllTime'].diff()
 
     # Fill NaN (first day for each model) with the downloadsAllTime value
     df_subset['daily_downloads'] = df_subset['daily_downloads'].fillna(df_subset['downloadsAllTime'])
@@ -108,7 +156,10 @@ def analyze_historical_data(csv_path: Path, output_path: Path, limit: int = None
 
     # Aggregate by author and snapshot_date
     logging.info("  Aggregating by author and date...")
-    author_daily = df_subset.groupby(['author', 'snapshot_date'])['daily_downloads'].sum().reset_index()
+    # observed=True: only author/date pairs that occur, not every category combination
+    author_daily = df_subset.groupby(
+        ['author', 'snapshot_date'], observed=True
+    )['daily_downloads'].sum().reset_index()
     author_daily = author_daily.rename(columns={'daily_downloads': 'total_daily_downloads'})
 
     compute_time = time.time() - start_compute
@@ -156,7 +207,7 @@ Examples:
 
   # Custom input/output paths
   uv run python scratch/analyze_historical_pandas.py \\
-    --input-file data/processed/model_historical_downloads.csv \\
+    --input-file data/processed/model_historical_downloads.parquet \\
     --output-file data/processed/author_daily_downloads.csv
         """
     )
@@ -164,8 +215,8 @@ Examples:
     parser.add_argument(
         '--input-file',
         type=Path,
-        default=Path(__file__).parent.parent / 'data' / 'processed' / 'model_historical_downloads.csv',
-        help='Input CSV file path (default: ../data/processed/model_historical_downloads.csv)'
+        default=Path(__file__).parent.parent / 'data' / 'processed' / 'model_historical_downloads.parquet',
+        help='Input parquet or CSV file path (default: ../data/processed/model_historical_downloads.parquet)'
     )
 
     parser.add_argument(
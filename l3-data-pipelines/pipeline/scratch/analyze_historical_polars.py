@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Analyze Historical HuggingFace Downloads using Polars
+
+Computes daily downloads by author using the Polars lazy API (multi-threaded, streaming).
+
+The task:
+- Scan historical download data from parquet or CSV (lazily, never fully in memory)
+- Compute daily downloads (difference in downloadsAllTime between consecutive days)
+- Aggregate by author to get total daily downloads per author
+- Output results to CSV
+
+Same computation as analyze_historical_pandas.py, but the per-model diff and the
+author/date aggregation run in parallel across cores inside one query plan.
+
+Usage:
+    uv run python scratch/analyze_historical_polars.py
+    uv run python scratch/analyze_historical_polars.py --limit 1000000  # For testing
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+import polars as pl
+
+
+def setup_logging(verbose: bool = False):
+    """Configure logging."""
+    log_level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(
+        level=log_level,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+
+def build_query(csv_path: Path, limit: int = None) -> pl.LazyFrame:
+    """
+    Build the lazy author daily downloads query.
+
+    Args:
+        csv_path: Path to input parquet (.parquet) or CSV file
+        limit: Optional row limit for testing
+
+    Returns:
+        LazyFrame with author, snapshot_date and total_daily_downloads
+    """
+    # Parquet scans read only the selected columns, with their stored dtypes
+    lf = pl.scan_parquet(csv_path) if csv_path.suffix == '.parquet' else pl.scan_csv(csv_path)
+    if limit:
+        lf = lf.head(limit)
+
+    # Parquet written by clean_historical_pandas.py already stores the author
+    columns = ['id', 'downloadsAllTime', 'snapshot_date']
+    if 'author' in lf.collect_schema().names():
+        columns.append('author')
+        author = pl.col('author')
+    else:
+        author = pl.col('id').str.split('/').list.first()
+
+    return (
+        lf.select(columns)
+        .filter(pl.col('id').is_not_null())
+        # Rows of each model must be in date order for the diff
+        .sort(['id', 'snapshot_date'])
+        .with_columns(
+            author=author,
+            # First day of each model counts its downloadsAllTime; negative
+            # differences (noisy data, deleted/reset models) count as 0
+            daily_downloads=pl.col('downloadsAllTime').diff().over('id')
+            .fill_null(pl.col('downloadsAllTime'))
+            .clip(lower_bound=0),
+        )
+        .group_by(['author', 'snapshot_date'])
+        .agg(total_daily_downloads=pl.col('daily_downloads').sum())
+        .sort(['author', 'snapshot_date'])
+    )
+
+
+def analyze_historical_data(csv_path: Path, output_path: Path, limit: int = None):
+    """
+    Compute author daily downloads using Polars.
+
+    Args:
+        csv_path: Path to input parquet or CSV file
+        output_path: Path to output CSV file
+        limit: Optional row limit for testing
+    """
+    logging.info("=" * 60)
+    logging.info("POLARS ANALYSIS: Author Daily Downloads")
+    logging.info("=" * 60)
+
+    # Loading and computing happen in one streamed query plan, so they're timed together
+    logging.info(f"Scanning data from {csv_path}...")
+    if limit:
+        logging.info(f"Using first {limit:,} rows for testing...")
+    start_compute = time.time()
+
+    author_daily = build_query(csv_path, limit).collect(engine='streaming')
+
+    compute_time = time.time() - start_compute
+    logging.info(f"✓ Load + computation complete in {compute_time:.2f}s")
+    logging.info(f"  Result: {author_daily.height:,} author-date combinations")
+    logging.info(f"  Unique authors: {author_daily['author'].n_unique():,}")
+    logging.info(f"  Date range: {author_daily['snapshot_date'].min()} to {author_daily['snapshot_date'].max()}")
+
+    # Save results
+    logging.info(f"Saving results to {output_path}...")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    author_daily.write_csv(output_path)
+    file_size_mb = output_path.stat().st_size / (1024 * 1024)
+    logging.info(f"✓ Results saved: {file_size_mb:.2f} MB")
+
+    # Show sample results
+    logging.info("\nSample results (top 10 by total downloads):")
+    sample = author_daily.top_k(10, by='total_daily_downloads')
+    for row in sample.iter_rows(named=True):
+        logging.info(f"  {row['author']}: {row['total_daily_downloads']:,.0f} downloads on {row['snapshot_date']}")
+
+    # Print summary
+    logging.info("\n" + "=" * 60)
+    logging.info("PERFORMANCE SUMMARY")
+    logging.info("=" * 60)
+    logging.info(f"Total Time:   {compute_time:>8.2f}s")
+    logging.info("\n✓ Analysis complete!")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Analyze historical HuggingFace downloads using Polars",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Process full dataset
+  uv run python scratch/analyze_historical_polars.py
+
+  # Process first 1M rows only
+  uv run python scratch/analyze_historical_polars.py --limit 1000000
+
+  # Custom input/output paths
+  uv run python scratch/analyze_historical_polars.py \\
+    --input-file data/processed/model_historical_downloads.parquet \\
+    --output-file data/processed/author_daily_downloads.csv
+        """
+    )
+
+    parser.add_argument(
+        '--input-file',
+        type=Path,
+        default=Path(__file__).parent.parent / 'data' / 'processed' / 'model_historical_downloads.parquet',
+        help='Input parquet or CSV file path (default: ../data/processed/model_historical_downloads.parquet)'
+    )
+
+    parser.add_argument(
+        '--output-file',
+        type=Path,
+        default=Path(__file__).parent.parent / 'data' / 'processed' / 'author_daily_downloads_polars.csv',
+        help='Output CSV file path (default: ../data/processed/author_daily_downloads_polars.csv)'
+    )
+
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=None,
+        help='Limit number of rows to process (for testing)'
+    )
+
+    parser.add_argument(
+        '--verbose',
+        '-v',
+        action='store_true',
+        help='Enable verbose logging'
+    )
+
+    args = parser.parse_args()
+
+    setup_logging(args.verbose)
+
+    try:
+        analyze_historical_data(
+            csv_path=args.input_file,
+            output_path=args.output_file,
+            limit=args.limit
+        )
+    except Exception as e:
+        logging.error(f"Analysis failed: {e}")
+        raise
+
+
+if __name__ == '__main__':
+    main()
@@ -4,20 +4,44 @@ Clean Historical HuggingFace Hub Data using Pandas
 
 This script processes daily snapshots of HuggingFace Hub model data from parquet files,
 extracting key metrics (id, likes, downloads, downloadsAllTime) and creating a
-historical time series dataset.
+historical time series dataset. Parquet output also carries an author column.
 
 Usage:
     uv run python src/clean_historical_pandas.py
-    uv run python src/clean_historical_pandas.py --input-dir ../data/raw/historical --output-file ../data/clean/model_historical_downloads.csv
+    uv run python src/clean_historical_pandas.py --input-dir ../data/raw/historical --output-file ../data/clean/model_historical_downloads.parquet
 """
 
 import argparse
 import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import pandas as pd
+from typing import Iterator, List, Tuple
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from tqdm import tqdm
 import re
-from datetime import datetime
+from datetime import date
+
+# Snapshot file names: models-YYYYMMDD-{sha}.parquet
+SNAPSHOT_FILENAME_RE = re.compile(r'models-(\d{8})-[a-f0-9]+\.parquet')
+
+# Columns read from each snapshot; the counts are optional in older snapshots
+SNAPSHOT_COLUMNS = ['id', 'likes', 'downloads', 'downloadsAllTime']
+COUNT_COLUMNS = ['likes', 'downloads', 'downloadsAllTime']
+
+# Every snapshot is cast to one schema so they can be streamed into a single file
+OUTPUT_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('likes', pa.int64()),
+    ('downloads', pa.int64()),
+    ('downloadsAllTime', pa.int64()),
+    ('snapshot_date', pa.string()),
+])
+PARQUET_OUTPUT_SCHEMA = OUTPUT_SCHEMA.append(pa.field('author', pa.dictionary(pa.int32(), pa.string())))
 
 
 def parse_snapshot_date(filename: str) -> str:
@@ -37,70 +61,147 @@ def parse_snapshot_date(filename: str) -> str:
         '2025-08-25'
     """
     # Extract YYYYMMDD from filename
-    match = re.match(r'models-(\d{8})-[a-f0-9]+\.parquet', filename)
+    match = SNAPSHOT_FILENAME_RE.match(filename)
     if not match:
         raise ValueError(f"Filename {filename} does not match expected format")
 
     date_str = match.group(1)
-    # Convert YYYYMMDD to YYYY-MM-DD
-    date_obj = datetime.strptime(date_str, "%Y%m%d")
-    return date_obj.strftime("%Y-%m-%d")
+    # Convert YYYYMMDD to YYYY-MM-DD (fromisoformat still rejects impossible dates)
+    return date.fromisoformat(f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}").isoformat()
+
 
+def _to_int64(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Cast a count column to int64, treating float NaN as missing."""
+    if pa.types.is_floating(column.type):
+        column = pc.if_else(pc.is_nan(column), pa.scalar(None, column.type), column)
+    return column.cast(pa.int64())
 
-def process_snapshot_file(file_path: Path, snapshot_date: str) -> pd.DataFrame:
+
+def iter_snapshot_row_groups(parquet_files: List[Path]) -> Iterator[Tuple[Path, str, pq.FileMetaData, int]]:
     """
-    Process a single snapshot file and extract relevant fields.
+    List the row groups of each snapshot file, in file order (only footers are read).
+
+    Args:
+        parquet_files: Snapshot files, in date order
+
+    Yields:
+        (file path, snapshot date, file metadata, row group index)
+    """
+    for file_path in parquet_files:
+        try:
+            # Extract date from filename
+            snapshot_date = parse_snapshot_date(file_path.name)
+            metadata = pq.read_metadata(file_path)
+
+            # Required column
+            if 'id' not in metadata.schema.to_arrow_schema().names:
+                raise ValueError(f"File {file_path} missing required 'id' column")
+        except Exception as e:
+            logging.error(f"Error processing {file_path.name}: {e}")
+            raise
+
+        for row_group in range(metadata.num_row_groups):
+            yield file_path, snapshot_date, metadata, row_group
+
+
+def process_snapshot_row_group(
+    file_path: Path,
+    snapshot_date: str,
+    metadata: pq.FileMetaData,
+    row_group: int
+) -> pa.Table:
+    """
+    Process one row group of a snapshot file and extract relevant fields.
+
+    Only the needed columns of the row group are read, as an Arrow table (no pandas
+    objects), so memory is bounded by the row group rather than the whole snapshot.
 
     Args:
         file_path: Path to the parquet file
         snapshot_date: Date string for this snapshot (YYYY-MM-DD)
+        metadata: The file's metadata (saves re-reading the footer)
+        row_group: Index of the row group to read
 
     Returns:
-        DataFrame with columns: id, likes, downloads, downloadsAllTime, snapshot_date
+        Table with columns: id, likes, downloads, downloadsAllTime, snapshot_date
     """
-    # Read parquet file
-    df = pd.read_parquet(file_path)
+    available = set(metadata.schema.to_arrow_schema().names)
 
-    # Select relevant columns
-    # Note: We need to check which columns exist in the data
-    columns_to_extract = []
+    # Optional columns are read if present and filled with nulls otherwise
+    table = pq.ParquetFile(file_path, metadata=metadata).read_row_group(
+        row_group, columns=[c for c in SNAPSHOT_COLUMNS if c in available]
+    )
+    columns = [table.column('id').cast(pa.string())]
+    for col in COUNT_COLUMNS:
+        if col in available:
+            columns.append(_to_int64(table.column(col)))
+        else:
+            columns.append(pa.nulls(table.num_rows, pa.int64()))
+
+    # Add snapshot date
+    columns.append(pa.array([snapshot_date] * table.num_rows, pa.string()))
 
-    # Required column
-    if 'id' not in df.columns:
-        raise ValueError(f"File {file_path} missing required 'id' column")
-    columns_to_extract.append('id')
+    return pa.Table.from_arrays(columns, schema=OUTPUT_SCHEMA)
 
-    # Optional columns with defaults
-    if 'likes' in df.columns:
-        columns_to_extract.append('likes')
 
-    if 'downloads' in df.columns:
-        columns_to_extract.append('downloads')
+def with_author(table: pa.Table) -> pa.Table:
+    """Append the author (id prefix) as a dictionary-encoded column."""
+    author = pc.list_element(pc.split_pattern(table.column('id'), '/', max_splits=1), 0)
+    return table.append_column('author', pc.dictionary_encode(author))
 
-    if 'downloadsAllTime' in df.columns:
-        columns_to_extract.append('downloadsAllTime')
 
-    # Extract columns
-    result_df = df[columns_to_extract].copy()
+def load_row_group(part: Tuple[Path, str, pq.FileMetaData, int], add_author: bool = False) -> pa.Table:
+    """
+    Read one snapshot row group as a table ready to write.
 
-    # Add missing columns with NaN if they don't exist
-    for col in ['likes', 'downloads', 'downloadsAllTime']:
-        if col not in result_df.columns:
-            result_df[col] = pd.NA
+    Args:
+        part: (file path, snapshot date, file metadata, row group index)
+        add_author: Whether to append the author column (parquet output)
 
-    # Add snapshot date
-    result_df['snapshot_date'] = snapshot_date
+    Returns:
+        Table to write
+    """
+    table = process_snapshot_row_group(*part)
+    if add_author:
+        table = with_author(table)
+    return table
+
+
+def count_unique_ids(output_file: Path) -> int:
+    """
+    Count the distinct non-null model ids in a written output file.
+
+    Counting once over the finished file's id column is cheaper than keeping a running
+    set of ids up to date after every row group.
+
+    Args:
+        output_file: Parquet or CSV file written by clean_historical_data
 
-    return result_df
+    Returns:
+        Number of distinct model ids
+    """
+    if output_file.suffix == '.parquet':
+        ids = pq.read_table(output_file, columns=['id']).column('id')
+    else:
+        ids = pa_csv.read_csv(
+            output_file,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=['id'], column_types={'id': pa.string()}, strings_can_be_null=True
+            )
+        ).column('id')
+    return pc.count_distinct(ids).as_py()
 
 
 def clean_historical_data(input_dir: Path, output_file: Path, verbose: bool = False):
     """
-    Process all historical snapshot files and combine into a single CSV.
+    Process all historical snapshot files and combine into a single file.
+
+    Snapshots are streamed into the output row group by row group, so memory holds a
+    few row groups rather than the whole history.
 
     Args:
         input_dir: Directory containing historical parquet files
-        output_file: Path to output CSV file
+        output_file: Path to output file (.parquet is written as parquet, anything else as CSV)
         verbose: Whether to show detailed logging
     """
     # Setup logging
@@ -125,40 +226,68 @@ def clean_historical_data(input_dir: Path, output_file: Path, verbose: bool = Fa
 
     logging.info(f"Found {len(parquet_files)} snapshot files")
 
-    # Process each file
-    all_data = []
-
-    for file_path in tqdm(parquet_files, desc="Processing snapshots", unit="file"):
-        try:
-            # Extract date from filename
-            snapshot_date = parse_snapshot_date(file_path.name)
-
-            # Process the file
-            df = process_snapshot_file(file_path, snapshot_date)
-
-            all_data.append(df)
-
-            if verbose:
-                logging.debug(f"Processed {file_path.name}: {len(df)} records, date={snapshot_date}")
-
-        except Exception as e:
-            logging.error(f"Error processing {file_path.name}: {e}")
-            raise
-
-    # Combine all dataframes
-    logging.info("Combining all snapshots...")
-    combined_df = pd.concat(all_data, ignore_index=True)
-
-    logging.info(f"Total records: {len(combined_df):,}")
-    logging.info(f"Date range: {combined_df['snapshot_date'].min()} to {combined_df['snapshot_date'].max()}")
-    logging.info(f"Unique models: {combined_df['id'].nunique():,}")
-
     # Ensure output directory exists
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # Save to CSV
-    logging.info(f"Writing to {output_file}...")
-    combined_df.to_csv(output_file, index=False)
+    # Parquet (columnar, typed; what the analysis scripts read by default) also persists
+    # the author once here so analyses don't re-split every id on each run; dictionary
+    # encoded, it costs a small index per row. CSV keeps the five columns COPY expects
+    if output_file.suffix == '.parquet':
+        writer = pq.ParquetWriter(output_file, PARQUET_OUTPUT_SCHEMA, compression='zstd', use_dictionary=True)
+    else:
+        writer = pa_csv.CSVWriter(output_file, OUTPUT_SCHEMA)
+
+    # Snapshot row groups are read and converted on worker threads (Arrow releases the
+    # GIL while decoding), at most `workers` ahead of the writer, and written in order
+    total_records = 0
+    dates = []
+    add_author = output_file.suffix == '.parquet'
+    workers = os.cpu_count() or 1
+
+    logging.info(f"Writing to {output_file} ({workers} reader threads)...")
+    remaining_parts = iter_snapshot_row_groups(parquet_files)
+    pending = deque()
+    with writer, ThreadPoolExecutor(max_workers=workers) as executor, \
+            tqdm(total=len(parquet_files), desc="Processing snapshots", unit="file") as progress:
+
+        def submit_next():
+            part = next(remaining_parts, None)
+            if part is not None:
+                pending.append((part, executor.submit(load_row_group, part, add_author)))
+
+        for _ in range(workers):
+            submit_next()
+
+        file_records = 0
+        while pending:
+            (file_path, snapshot_date, metadata, row_group), future = pending.popleft()
+            submit_next()
+            try:
+                table = future.result()
+            except Exception as e:
+                logging.error(f"Error processing {file_path.name}: {e}")
+                raise
+
+            writer.write_table(table)
+
+            file_records += table.num_rows
+
+            # Last row group of this snapshot
+            if row_group == metadata.num_row_groups - 1:
+                progress.update()
+                total_records += file_records
+                dates.append(snapshot_date)
+
+                if verbose:
+                    logging.debug(f"Processed {file_path.name}: {file_records} records, date={snapshot_date}")
+                file_records = 0
+
+    logging.info(f"Total records: {total_records:,}")
+    if dates:
+        logging.info(f"Date range: {min(dates)} to {max(dates)}")
+    else:
+        logging.warning("No snapshot row groups found, the output is empty")
+    logging.info(f"Unique models: {count_unique_ids(output_file):,}")
 
     # Print summary statistics
     file_size_mb = output_file.stat().st_size / (1024 * 1024)
@@ -179,6 +308,10 @@ Examples:
     # Specify custom paths
     uv run python src/clean_historical_pandas.py \\
         --input-dir ../data/raw/historical \\
+        --output-file ../data/processed/model_historical_downloads.parquet
+
+    # CSV output (for the PostgreSQL COPY analysis)
+    uv run python src/clean_historical_pandas.py \\
         --output-file ../data/processed/model_historical_downloads.csv
 
     # Verbose output
@@ -196,8 +329,8 @@ Examples:
     parser.add_argument(
         '--output-file',
         type=Path,
-        default=Path(__file__).parent.parent.parent / 'data' / 'processed' / 'model_historical_downloads.csv',
-        help='Output CSV file path (default: ../data/processed/model_historical_downloads.csv)'
+        default=Path(__file__).parent.parent.parent / 'data' / 'processed' / 'model_historical_downloads.parquet',
+        help='Output parquet or CSV file path (default: ../data/processed/model_historical_downloads.parquet)'
     )
 
     parser.add_argument(
@@ -5,12 +5,16 @@ Deep analysis of specific data concepts in models.parquet:
 3. Parameter counts (safetensors)
 """
 import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import json
+import sys
 from pathlib import Path
 
-# Load the data
+# Load the data (only the columns used below; parquet skips decoding the rest).
+# The nested baseModels and safetensors columns are read as Arrow in analyses 2 and 3
 data_path = Path(__file__).parent.parent / 'data' / 'raw' / 'models.parquet'
-df = pd.read_parquet(data_path)
+df = pd.read_parquet(data_path, columns=['id', 'downloads', 'downloadsAllTime', 'createdAt', 'likes'])
 
 print("="*80)
 print("ANALYSIS 1: DOWNLOADS vs DOWNLOADSALLTIME")
@@ -39,28 +43,37 @@ old_but_inactive = df[
     (df['downloads'] > 0)
 ].sort_values('downloadsAllTime', ascending=False).head(5)
 
-print("\n  Models with high all-time downloads but low recent downloads:")
-print("  (Models that were popular in the past but less used now)")
-for idx, row in old_but_inactive.iterrows():
-    print(f"    - {row['id']}")
-    print(f"      Recent downloads (30 days): {row['downloads']:,}")
-    print(f"      All-time downloads: {row['downloadsAllTime']:,}")
-    print(f"      Ratio (recent/total): {row['download_ratio']:.4f}")
-    print()
+# Each listing is built as lines and written once instead of one print per field
+lines = [
+    "\n  Models with high all-time downloads but low recent downloads:",
+    "  (Models that were popular in the past but less used now)",
+]
+for row in old_but_inactive.itertuples(index=False):
+    lines += [
+        f"    - {row.id}",
+        f"      Recent downloads (30 days): {row.downloads:,}",
+        f"      All-time downloads: {row.downloadsAllTime:,}",
+        f"      Ratio (recent/total): {row.download_ratio:.4f}",
+        "",
+    ]
+sys.stdout.write("\n".join(lines) + "\n")
 
 # Find models with high recent activity
 recent_popular = df[
     (df['downloads'] > 100000)
 ].sort_values('downloads', ascending=False).head(5)
 
-print("\n  Models with very high recent download activity:")
-for idx, row in recent_popular.iterrows():
-    print(f"    - {row['id']}")
-    print(f"      Recent downloads (30 days): {row['downloads']:,}")
-    print(f"      All-time downloads: {row['downloadsAllTime']:,}")
-    created_date = row['createdAt'].strftime('%Y-%m-%d') if pd.notna(row['createdAt']) else 'Unknown'
-    print(f"      Created: {created_date}")
-    print()
+lines = ["\n  Models with very high recent download activity:"]
+for row in recent_popular.itertuples(index=False):
+    created_date = f"{row.createdAt:%Y-%m-%d}" if pd.notna(row.createdAt) else 'Unknown'
+    lines += [
+        f"    - {row.id}",
+        f"      Recent downloads (30 days): {row.downloads:,}",
+        f"      All-time downloads: {row.downloadsAllTime:,}",
+        f"      Created: {created_date}",
+        "",
+    ]
+sys.stdout.write("\n".join(lines) + "\n")
 
 print("\n1.3 Summary Statistics:")
 print("-" * 80)
@@ -81,8 +94,13 @@ print("="*80)
 print("\n2.1 BaseModels Structure:")
 print("-" * 80)
 
+# Models with baseModels, as Arrow columns so the nested structs can be
+# searched with compute kernels instead of a Python loop over rows
+base_table = pq.read_table(data_path, columns=['id', 'baseModels', 'downloadsAllTime', 'createdAt'])
+base_table = base_table.filter(pc.is_valid(base_table['baseModels'])).combine_chunks()
+
 # Count models with baseModels
-models_with_base = df['baseModels'].notna().sum()
+models_with_base = base_table.num_rows
 print(f"Models with baseModels field populated: {models_with_base:,}")
 print(f"Percentage: {(models_with_base/len(df)*100):.2f}%")
 
@@ -100,8 +118,8 @@ print("  - Edges represent relationships (fine-tuning, adapters, merges)")
 print("\n2.3 Examples of Model Trees:")
 print("-" * 80)
 
-# Find models with baseModels
-models_with_base_data = df[df['baseModels'].notna()].copy()
+base_models = base_table['baseModels'].combine_chunks()
+base_relations = pc.struct_field(base_models, 'relation')
 
 print("\nExample 1: Qwen3-VL-8B-Instruct and its derivatives")
 qwen_base = df[df['id'] == 'Qwen/Qwen3-VL-8B-Instruct'].iloc[0]
@@ -110,34 +128,28 @@ print(f"  All-time downloads: {qwen_base['downloadsAllTime']:,}")
 print(f"  Created: {qwen_base['createdAt'].strftime('%Y-%m-%d')}")
 print(f"  Likes: {qwen_base['likes']}")
 
-# Find models that have Qwen3-VL-8B-Instruct as base
-qwen_derivatives = []
-for idx, row in models_with_base_data.iterrows():
-    if row['baseModels'] and isinstance(row['baseModels'], dict):
-        models_list = row['baseModels'].get('models', [])
-        if models_list is not None and len(models_list) > 0:
-            for base_model in models_list:
-                if isinstance(base_model, dict) and base_model.get('id') == 'Qwen/Qwen3-VL-8B-Instruct':
-                    qwen_derivatives.append({
-                        'id': row['id'],
-                        'relation': row['baseModels'].get('relation', 'unknown'),
-                        'downloads': row['downloadsAllTime'],
-                        'created': row['createdAt']
-                    })
-
-print(f"\nFound {len(qwen_derivatives)} models derived from Qwen3-VL-8B-Instruct:")
+# Find models that have Qwen3-VL-8B-Instruct as base: flatten every model's list of
+# base models, match the ids, and map the matches back to their rows
+parent_lists = pc.struct_field(base_models, 'models')
+parent_ids = pc.struct_field(pc.list_flatten(parent_lists), 'id')
+derived_rows = pc.filter(pc.list_parent_indices(parent_lists), pc.equal(parent_ids, 'Qwen/Qwen3-VL-8B-Instruct'))
+qwen_derivatives = base_table.take(derived_rows).append_column(
+    'relation', base_relations.take(derived_rows)
+).to_pylist()
+
+lines = [f"\nFound {len(qwen_derivatives)} models derived from Qwen3-VL-8B-Instruct:"]
 for i, deriv in enumerate(qwen_derivatives[:10], 1):  # Show first 10
-    print(f"  {i}. {deriv['id']}")
-    print(f"     Relation: {deriv['relation']}")
-    print(f"     Downloads: {deriv['downloads']:,}")
+    lines += [
+        f"  {i}. {deriv['id']}",
+        f"     Relation: {deriv['relation']}",
+        f"     Downloads: {deriv['downloadsAllTime']:,}",
+    ]
+sys.stdout.write("\n".join(lines) + "\n")
 
 print("\n2.4 Relation Types Distribution:")
 print("-" * 80)
-relation_types = {}
-for idx, row in models_with_base_data.iterrows():
-    if row['baseModels'] and isinstance(row['baseModels'], dict):
-        relation = row['baseModels'].get('relation', 'unknown')
-        relation_types[relation] = relation_types.get(relation, 0) + 1
+relation_counts = pc.value_counts(base_relations)
+relation_types = dict(zip(relation_counts.field('values').to_pylist(), relation_counts.field('counts').to_pylist()))
 
 print("Distribution of relationship types:")
 for relation, count in sorted(relation_types.items(), key=lambda x: x[1], reverse=True):
@@ -161,7 +173,9 @@ print("    },")
 print("    'total': total_parameter_count")
 print("  }")
 
-models_with_params = df['safetensors'].notna().sum()
+# safetensors is a struct column, so its fields are read as Arrow arrays directly
+params_table = pq.read_table(data_path, columns=['id', 'safetensors', 'downloadsAllTime', 'likes'])
+models_with_params = params_table.num_rows - params_table['safetensors'].null_count
 print(f"\nModels with parameter information: {models_with_params:,}")
 print(f"Percentage: {(models_with_params/len(df)*100):.2f}%")
 
@@ -169,20 +183,15 @@ print("\n3.2 Extracting Parameter Counts:")
 print("-" * 80)
 
 # Extract total parameters
-param_counts = []
-for idx, row in df[df['safetensors'].notna()].iterrows():
-    if isinstance(row['safetensors'], dict):
-        total = row['safetensors'].get('total')
-        if total and total > 0:
-            param_counts.append({
-                'id': row['id'],
-                'params': total,
-                'params_billions': total / 1e9,
-                'downloads': row['downloadsAllTime'],
-                'likes': row['likes']
-            })
-
-param_df = pd.DataFrame(param_counts)
+totals = pc.struct_field(params_table['safetensors'], 'total')
+has_params = pc.fill_null(pc.greater(totals, 0), False)
+param_df = pd.DataFrame({
+    'id': pc.filter(params_table['id'], has_params).to_pandas(),
+    'params': pc.filter(totals, has_params).to_pandas(),
+    'downloads': pc.filter(params_table['downloadsAllTime'], has_params).to_pandas(),
+    'likes': pc.filter(params_table['likes'], has_params).to_pandas(),
+})
+param_df['params_billions'] = param_df['params'] / 1e9
 
 if len(param_df) > 0:
     print(f"Models with valid parameter counts: {len(param_df):,}")
@@ -195,7 +204,7 @@ if len(param_df) > 0:
 
     print("\n3.3 Example: Qwen3-VL-8B-Instruct Parameter Details:")
     print("-" * 80)
-    qwen_params = df[df['id'] == 'Qwen/Qwen3-VL-8B-Instruct'].iloc[0]['safetensors']
+    qwen_params = params_table.filter(pc.equal(params_table['id'], 'Qwen/Qwen3-VL-8B-Instruct'))['safetensors'][0].as_py()
     if qwen_params:
         print(f"Total parameters: {qwen_params['total']:,.0f}")
         print(f"                 = {qwen_params['total']/1e9:.2f} billion")
@@ -215,15 +224,18 @@ if len(param_df) > 0:
         labels=['<1B', '1-3B', '3-7B', '7-15B', '15-30B', '30-100B', '100B+']
     )
 
-    print("\nTop 3 most downloaded models in each size category:")
+    lines = ["\nTop 3 most downloaded models in each size category:"]
     for category in ['<1B', '1-3B', '3-7B', '7-15B', '15-30B', '30-100B', '100B+']:
         cat_models = param_df[param_df['size_category'] == category].nlargest(3, 'downloads')
         if len(cat_models) > 0:
-            print(f"\n  {category}:")
-            for _, model in cat_models.iterrows():
-                print(f"    - {model['id']}")
-                print(f"      Parameters: {model['params_billions']:.2f}B")
-                print(f"      Downloads: {model['downloads']:,}")
+            lines.append(f"\n  {category}:")
+            for model in cat_models.itertuples(index=False):
+                lines += [
+                    f"    - {model.id}",
+                    f"      Parameters: {model.params_billions:.2f}B",
+                    f"      Downloads: {model.downloads:,}",
+                ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 print("\n" + "="*80)
 print("SUMMARY")
@@ -1,166 +1,309 @@
 """
 Clean Models Data
-Processes the raw models.parquet file and creates a cleaned CSV with essential columns.
+Processes the raw models.parquet file and creates a cleaned parquet (or CSV) file with
+essential columns.
 """
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import logging
 from pathlib import Path
 
-
-def extract_model_name(model_id):
+# The only models.parquet columns the cleaning reads (parquet skips the rest on load)
+MODEL_COLUMNS = [
+    '_id', 'author', 'id', 'createdAt', 'likes', 'downloads', 'downloadsAllTime',
+    'safetensors', 'pipeline_tag', 'baseModels',
+]
+
+# Cleaned column -> models.parquet column it is taken from (its type is kept)
+PASSTHROUGH_COLUMNS = {
+    '_id': '_id',
+    'author': 'author',
+    'created_at': 'createdAt',
+    'likes': 'likes',
+    'downloads_last30': 'downloads',
+    'downloads_all_time': 'downloadsAllTime',
+    'pipeline_tag': 'pipeline_tag',
+}
+
+# Pass-through counts stored in a narrower type than the source's int64 (both stay far
+# below 2**32; the cast is checked, so an out-of-range value fails loudly).
+# downloads_all_time keeps its source type
+DOWNCAST_TYPES = {
+    'likes': pa.uint32(),
+    'downloads_last30': pa.uint32(),
+}
+
+# Cleaned columns the author-year statistics read
+AUTHOR_YEAR_COLUMNS = ['_id', 'author', 'created_at', 'likes', 'downloads_last30', 'downloads_all_time']
+
+# Rows cleaned per batch while streaming models.parquet (peak memory is about one batch)
+BATCH_SIZE = 200_000
+
+
+def model_names(model_ids):
     """
-    Extract model name from the full model ID.
+    Extract model names (everything after the first slash) from a column of model IDs.
 
     Args:
-        model_id: Full model ID in format "author/model-name"
+        model_ids: Arrow array of model IDs in format "author/model-name"
 
     Returns:
-        Model name or None if invalid format
+        Arrow array of model names (IDs without a slash are kept as-is, missing IDs
+        stay missing)
     """
-    if pd.isna(model_id):
-        return None
-
-    parts = str(model_id).split('/')
-    if len(parts) >= 2:
-        return '/'.join(parts[1:])  # Everything after the first slash
-    return model_id  # Return as-is if no slash found
+    # Dropping everything up to the first slash, in C over the whole column
+    return pc.replace_substring_regex(model_ids, '^[^/]*/', '', max_replacements=1)
 
 
-def extract_base_model_info(base_models_dict):
+def base_model_info(base_models):
     """
-    Extract base model ID and relation from baseModels field.
+    Extract the first base model ID and the relation from the baseModels column.
 
     Args:
-        base_models_dict: Dictionary with 'models' list and 'relation' string
+        base_models: Arrow baseModels array (struct with 'models' list and 'relation')
 
     Returns:
-        Tuple of (base_model_id, relation) or (None, None)
+        Tuple of (base_model_id, relation) Arrow arrays, null where the field is absent
     """
-    if pd.isna(base_models_dict) or not isinstance(base_models_dict, dict):
-        return None, None
+    relation = pc.struct_field(base_models, 'relation')
+    models = pc.struct_field(base_models, 'models')
+    # list_element can't index empty lists, so those become null first
+    has_models = pc.fill_null(pc.greater(pc.list_value_length(models), 0), False)
+    first_model = pc.list_element(pc.if_else(has_models, models, None), 0)
+    return pc.struct_field(first_model, 'id'), relation
 
-    # Extract relation
-    relation = base_models_dict.get('relation', None)
 
-    # Extract first base model ID
-    models_list = base_models_dict.get('models', [])
+def parameter_counts(safetensors):
+    """
+    Extract total parameter counts from the safetensors column.
 
-    # Check if models_list exists and is not empty
-    if models_list is not None and len(models_list) > 0:
-        first_model = models_list[0]
-        if isinstance(first_model, dict):
-            base_model_id = first_model.get('id', None)
-            return base_model_id, relation
+    Args:
+        safetensors: Arrow safetensors array (struct with 'total' and 'parameters')
 
-    return None, relation
+    Returns:
+        Int64 Arrow array of totals, null where the field is absent or not positive
+    """
+    total = pc.struct_field(safetensors, 'total')
+    total = pc.if_else(pc.greater(total, 0), total, pa.scalar(None, total.type))
+    return pc.cast(total, pa.int64())
 
 
-def extract_parameters(safetensors_dict):
+def clean_models_batch(batch, schema):
     """
-    Extract total parameter count from safetensors field.
+    Clean one record batch of models.parquet.
+
+    Every column is built as an Arrow array (pass-through columns are reused, or cast
+    to their DOWNCAST_TYPES) and assembled into one table, with no intermediate
+    DataFrame.
 
     Args:
-        safetensors_dict: Dictionary with 'total' and 'parameters' fields
+        batch: Arrow record batch with MODEL_COLUMNS
+        schema: Cleaned schema from cleaned_schema
 
     Returns:
-        Total parameter count or None
+        Arrow table of the batch's cleaned models
     """
-    if pd.isna(safetensors_dict) or not isinstance(safetensors_dict, dict):
-        return None
+    columns = {
+        name: batch.column(source) for name, source in PASSTHROUGH_COLUMNS.items()
+    }
+    for name, dtype in DOWNCAST_TYPES.items():
+        columns[name] = pc.cast(columns[name], dtype)
+    columns['model_name'] = model_names(batch.column('id'))
+    # Struct columns are read with compute kernels instead of as a Python dict per row
+    columns['n_parameters'] = parameter_counts(batch.column('safetensors'))
+    columns['base_model_id'], columns['base_model_relation'] = base_model_info(batch.column('baseModels'))
+
+    return pa.Table.from_arrays([columns[name] for name in schema.names], schema=schema)
 
-    total = safetensors_dict.get('total', None)
 
-    # Ensure it's a valid number
-    if total is not None and total > 0:
-        return total
+def cleaned_schema(models_schema):
+    """
+    Build the Arrow schema of the cleaned models table.
 
-    return None
+    Args:
+        models_schema: Arrow schema of the raw models.parquet file
+
+    Returns:
+        Schema with the cleaned columns in output order
+    """
+    def passthrough(name):
+        dtype = DOWNCAST_TYPES.get(name, models_schema.field(PASSTHROUGH_COLUMNS[name]).type)
+        return pa.field(name, dtype)
+
+    return pa.schema([
+        passthrough('_id'),
+        passthrough('author'),
+        pa.field('model_name', pa.string()),
+        passthrough('created_at'),
+        passthrough('likes'),
+        passthrough('downloads_last30'),
+        passthrough('downloads_all_time'),
+        pa.field('n_parameters', pa.int64()),
+        passthrough('pipeline_tag'),
+        pa.field('base_model_id', pa.string()),
+        pa.field('base_model_relation', pa.string()),
+    ])
 
 
 def clean_models_data(input_path, output_path):
     """
-    Clean and transform models.parquet into a simplified CSV.
+    Clean and transform models.parquet into a simplified parquet (or CSV) file.
+
+    The file is streamed in batches of BATCH_SIZE rows: each batch is cleaned,
+    appended to the output and folded into the author-year partial sums, so only one
+    batch is in memory at a time. A .parquet output (Snappy) keeps column types and
+    skips text formatting; any other suffix writes CSV.
 
     Args:
         input_path: Path to raw models.parquet file
-        output_path: Path to save cleaned models.csv file
+        output_path: Path to save cleaned models file (.parquet, or .csv)
     """
     logging.info(f"Starting models data cleaning from {input_path}")
 
-    # Read the parquet file
-    logging.info("Loading models.parquet...")
-    df = pd.read_parquet(input_path)
-    logging.info(f"Loaded {len(df):,} models")
-
-    # Create the cleaned dataframe
-    logging.info("Extracting and transforming columns...")
-
-    cleaned_df = pd.DataFrame({
-        '_id': df['_id'],
-        'author': df['author'],
-        'model_name': df['id'].apply(extract_model_name),
-        'created_at': df['createdAt'],
-        'likes': df['likes'],
-        'downloads_last30': df['downloads'],
-        'downloads_all_time': df['downloadsAllTime'],
-        'n_parameters': df['safetensors'].apply(extract_parameters),
-        'pipeline_tag': df['pipeline_tag'],
-    })
-
-    # Extract base model information (requires two columns)
-    logging.info("Extracting base model relationships...")
-    base_model_info = df['baseModels'].apply(extract_base_model_info)
-    cleaned_df['base_model_id'] = base_model_info.apply(lambda x: x[0])
-    cleaned_df['base_model_relation'] = base_model_info.apply(lambda x: x[1])
+    parquet_file = pq.ParquetFile(input_path)
+    logging.info(f"Streaming {parquet_file.metadata.num_rows:,} models from models.parquet...")
+
+    summary = dict.fromkeys(
+        ['total', 'author', 'likes', 'downloads', 'parameters', 'base_model', 'pipeline_tag'], 0
+    )
+    partials = []
+
+    logging.info(f"Cleaning and saving data to {output_path}")
+    schema = cleaned_schema(parquet_file.schema_arrow)
+    parquet_output = output_path.suffix == '.parquet'
+    if parquet_output:
+        writer = pq.ParquetWriter(output_path, schema, compression='snappy')
+    else:
+        # Arrow's CSV writer encodes in C, and formats every batch the same way
+        writer = pa_csv.CSVWriter(output_path, schema)
+    with writer:
+        batches = parquet_file.iter_batches(batch_size=BATCH_SIZE, columns=MODEL_COLUMNS)
+        for batch in batches:
+            cleaned = clean_models_batch(batch, schema)
+            writer.write_table(cleaned)
+            # Only the stats columns are converted to pandas
+            partials.append(author_year_partials(cleaned.select(AUTHOR_YEAR_COLUMNS).to_pandas()))
+
+            summary['total'] += cleaned.num_rows
+            summary['author'] += pc.count(cleaned['author']).as_py()
+            summary['likes'] += pc.sum(pc.greater(cleaned['likes'], 0), min_count=0).as_py()
+            summary['downloads'] += pc.sum(pc.greater(cleaned['downloads_last30'], 0), min_count=0).as_py()
+            summary['parameters'] += pc.count(cleaned['n_parameters']).as_py()
+            summary['base_model'] += pc.count(cleaned['base_model_id']).as_py()
+            summary['pipeline_tag'] += pc.count(cleaned['pipeline_tag']).as_py()
 
     # Log statistics about the cleaned data
     logging.info("Cleaning complete. Data summary:")
-    logging.info(f"  Total models: {len(cleaned_df):,}")
-    logging.info(f"  Models with author: {cleaned_df['author'].notna().sum():,}")
-    logging.info(f"  Models with likes: {(cleaned_df['likes'] > 0).sum():,}")
-    logging.info(f"  Models with recent downloads: {(cleaned_df['downloads_last30'] > 0).sum():,}")
-    logging.info(f"  Models with parameter counts: {cleaned_df['n_parameters'].notna().sum():,}")
-    logging.info(f"  Models with base model info: {cleaned_df['base_model_id'].notna().sum():,}")
-    logging.info(f"  Models with pipeline tags: {cleaned_df['pipeline_tag'].notna().sum():,}")
-
-    # Save to CSV
-    logging.info(f"Saving cleaned data to {output_path}")
-    cleaned_df.to_csv(output_path, index=False)
+    logging.info(f"  Total models: {summary['total']:,}")
+    logging.info(f"  Models with author: {summary['author']:,}")
+    logging.info(f"  Models with likes: {summary['likes']:,}")
+    logging.info(f"  Models with recent downloads: {summary['downloads']:,}")
+    logging.info(f"  Models with parameter counts: {summary['parameters']:,}")
+    logging.info(f"  Models with base model info: {summary['base_model']:,}")
+    logging.info(f"  Models with pipeline tags: {summary['pipeline_tag']:,}")
 
     # Log file size
     file_size_mb = output_path.stat().st_size / (1024 * 1024)
-    logging.info(f"Saved models.csv ({file_size_mb:.2f} MB)")
+    logging.info(f"Saved {output_path.name} ({file_size_mb:.2f} MB)")
+
+    # Generate author-year aggregated statistics (same format as the models output)
+    author_year_stats_path = output_path.with_name('author_year_stats' + output_path.suffix)
+    create_author_year_stats(partials, author_year_stats_path)
 
-    # Generate author-year aggregated statistics
-    author_year_stats_path = output_path.parent / 'author_year_stats.csv'
-    create_author_year_stats(cleaned_df, author_year_stats_path)
 
-    return cleaned_df
+def author_year_partials(cleaned_df):
+    """
+    Compute one batch's sums and counts by author and year.
 
+    Rows are sorted once by a combined (author code, year) key, and every sum and
+    count is one np.add.reduceat over the contiguous groups, instead of a hash
+    groupby per aggregate. Rows missing the author or year are dropped, as in groupby.
 
-def create_author_year_stats(cleaned_df, output_path):
+    Args:
+        cleaned_df: DataFrame of one batch's AUTHOR_YEAR_COLUMNS
+
+    Returns:
+        DataFrame indexed by (author, year) with per-column sums and counts
+    """
+    # Extract year from created_at; parquet timestamps are already datetimes, so only
+    # text dates are parsed
+    created_at = cleaned_df['created_at']
+    if not pd.api.types.is_datetime64_any_dtype(created_at):
+        created_at = pd.to_datetime(created_at, format='ISO8601')
+    year = created_at.dt.year
+    # As a categorical, each author is an integer code (-1 when missing)
+    author = cleaned_df['author'].astype('category')
+
+    valid = (author.cat.codes.to_numpy() >= 0) & year.notna().to_numpy()
+    if not valid.any():
+        return pd.DataFrame()
+    years = year.to_numpy(dtype=np.int64, na_value=0)[valid]
+    first_year = years.min()
+    n_years = years.max() - first_year + 1
+    keys = author.cat.codes.to_numpy().astype(np.int64)[valid] * n_years + (years - first_year)
+
+    # Group boundaries in the key-sorted rows
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+
+    def group_sums(values):
+        # Integer sums accumulate in int64, whatever the column's (downcast) type
+        if values.dtype.kind in 'iu':
+            values = values.astype(np.int64)
+        return np.add.reduceat(values[valid][order], starts)
+
+    partials = {'n_models': group_sums(cleaned_df['_id'].notna().to_numpy(dtype=np.int64))}
+    for name in ['likes', 'downloads_last30', 'downloads_all_time']:
+        values = cleaned_df[name]
+        partials[f'total_{name}'] = group_sums(values.fillna(0).to_numpy())
+        partials[f'n_{name}'] = group_sums(values.notna().to_numpy(dtype=np.int64))
+
+    author_codes, year_offsets = np.divmod(sorted_keys[starts], n_years)
+    index = pd.MultiIndex.from_arrays(
+        [author.cat.categories[author_codes], (year_offsets + first_year).astype(np.int16)],
+        names=['author', 'year']
+    )
+    return pd.DataFrame(partials, index=index)
+
+
+def create_author_year_stats(partials, output_path):
     """
     Create aggregated statistics by author and year.
 
     Args:
-        cleaned_df: Cleaned models DataFrame
-        output_path: Path to save author_year_stats.csv file
+        partials: Per-batch sums and counts from author_year_partials
+        output_path: Path to save author_year_stats file (.parquet, or .csv)
     """
     logging.info("Creating author-year aggregated statistics...")
 
-    # Extract year from created_at
-    cleaned_df['year'] = pd.to_datetime(cleaned_df['created_at']).dt.year
-
-    # Group by author and year
-    grouped = cleaned_df.groupby(['author', 'year']).agg(
-        n_models=('_id', 'count'),
-        total_likes=('likes', 'sum'),
-        avg_likes=('likes', 'mean'),
-        total_downloads_last30=('downloads_last30', 'sum'),
-        avg_downloads_last30=('downloads_last30', 'mean'),
-        total_downloads_all_time=('downloads_all_time', 'sum'),
-        avg_downloads_all_time=('downloads_all_time', 'mean')
-    ).reset_index()
+    # Combine the batches' partial sums; averages are total / non-null count. Batches
+    # without a single author and year contribute nothing
+    partials = [partial for partial in partials if len(partial)]
+    if partials:
+        totals = pd.concat(partials).groupby(level=['author', 'year']).sum()
+    else:
+        columns = ['n_models'] + [f'{prefix}_{name}' for name in ['likes', 'downloads_last30', 'downloads_all_time']
+                                  for prefix in ['total', 'n']]
+        totals = pd.DataFrame(
+            {column: pd.Series(dtype=np.int64) for column in columns},
+            index=pd.MultiIndex.from_arrays(
+                [pd.Series(dtype=str), pd.Series(dtype=np.int16)], names=['author', 'year']
+            ),
+        )
+    grouped = pd.DataFrame({
+        'n_models': totals['n_models'],
+        'total_likes': totals['total_likes'],
+        'avg_likes': totals['total_likes'] / totals['n_likes'],
+        'total_downloads_last30': totals['total_downloads_last30'],
+        'avg_downloads_last30': totals['total_downloads_last30'] / totals['n_downloads_last30'],
+        'total_downloads_all_time': totals['total_downloads_all_time'],
+        'avg_downloads_all_time': totals['total_downloads_all_time'] / totals['n_downloads_all_time'],
+    }).reset_index()
 
     # Sort by year and total downloads (descending)
     grouped = grouped.sort_values(['year', 'total_downloads_all_time'],
@@ -168,15 +311,19 @@ def create_author_year_stats(cleaned_df, output_path):
 
     # Log statistics
     logging.info(f"  Total author-year combinations: {len(grouped):,}")
-    logging.info(f"  Years covered: {grouped['year'].min():.0f} - {grouped['year'].max():.0f}")
+    if len(grouped):
+        logging.info(f"  Years covered: {grouped['year'].min():.0f} - {grouped['year'].max():.0f}")
     logging.info(f"  Unique authors: {grouped['author'].nunique():,}")
 
     # Save to CSV
     logging.info(f"Saving author-year statistics to {output_path}")
-    grouped.to_csv(output_path, index=False)
+    if output_path.suffix == '.parquet':
+        grouped.to_parquet(output_path, compression='snappy', index=False)
+    else:
+        pa_csv.write_csv(pa.Table.from_pandas(grouped, preserve_index=False), output_path)
 
     # Log file size
     file_size_mb = output_path.stat().st_size / (1024 * 1024)
-    logging.info(f"Saved author_year_stats.csv ({file_size_mb:.2f} MB)")
+    logging.info(f"Saved {output_path.name} ({file_size_mb:.2f} MB)")
 
     return grouped
@@ -3,25 +3,119 @@ Download HuggingFace Hub Stats Data
 Downloads the models.parquet file from the cfahlgren1/hub-stats dataset.
 """
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
 from huggingface_hub import hf_hub_download, HfApi
 from tqdm import tqdm
 import shutil
 import hashlib
+import json
 import requests
 
 
+# Concurrent historical-version downloads (each is mostly waiting on the network)
+DOWNLOAD_WORKERS = 16
+
+# Sidecar file in the historical directory mapping file name -> size, mtime and hash
+HASH_CACHE_FILENAME = ".hashes.json"
+
+# Read buffer for hashing on Pythons without hashlib.file_digest (3.11+)
+HASH_BUFFER_SIZE = 1024 * 1024
+
+
 def _compute_file_hash(filepath):
     """Compute SHA256 hash of a file."""
-    sha256_hash = hashlib.sha256()
     with open(filepath, "rb") as f:
-        # Read in chunks to handle large files
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+        # file_digest reads into one reusable buffer and hashes it in C
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+        # Otherwise read large chunks into a preallocated buffer (no per-chunk bytes)
+        sha256_hash = hashlib.sha256()
+        buffer = memoryview(bytearray(HASH_BUFFER_SIZE))
+        while n := f.readinto(buffer):
+            sha256_hash.update(buffer[:n])
     return sha256_hash.hexdigest()
 
 
+def _load_hash_cache(historical_dir):
+    """
+    Load the saved hashes of the historical files.
+
+    Args:
+        historical_dir: Directory historical files are saved to
+
+    Returns:
+        Dict of file name -> {"size", "mtime_ns", "sha256"} (empty if none saved yet)
+    """
+    try:
+        with open(historical_dir / HASH_CACHE_FILENAME) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_hash_cache(historical_dir, hash_cache):
+    """
+    Save the hashes of the historical files, replacing the cache file atomically.
+
+    Args:
+        historical_dir: Directory historical files are saved to
+        hash_cache: Dict of file name -> {"size", "mtime_ns", "sha256"}
+    """
+    cache_path = historical_dir / HASH_CACHE_FILENAME
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(hash_cache, f)
+    os.replace(tmp_path, cache_path)
+
+
+def _hash_cache_entry(filepath, file_hash):
+    """Build the hash cache entry of a file whose hash is known."""
+    stat = os.stat(filepath)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_hash}
+
+
+def _existing_file_hash(filepath, hash_cache):
+    """
+    Hash a saved historical file, reusing its cached hash if it is unchanged.
+
+    Args:
+        filepath: Path to the historical file
+        hash_cache: Dict loaded by _load_hash_cache
+
+    Returns:
+        SHA256 hex digest of the file
+    """
+    entry = hash_cache.get(filepath.name)
+    stat = os.stat(filepath)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+    return _compute_file_hash(filepath)
+
+
+def _save_cached_file(cached_file_path, output_path):
+    """
+    Save a downloaded file from the HuggingFace cache to output_path.
+
+    The file is hard-linked rather than read and written a second time (hub downloads
+    replace cache files instead of modifying them); a copy is only made when linking
+    fails (e.g. the cache is on another filesystem). An existing output file is
+    removed first, so an earlier link's cache blob is never written through.
+
+    Args:
+        cached_file_path: Path returned by hf_hub_download
+        output_path: Destination path
+    """
+    Path(output_path).unlink(missing_ok=True)
+    try:
+        os.link(cached_file_path, output_path)
+    except OSError:
+        shutil.copy(cached_file_path, output_path)
+
+
 def _fetch_all_commits_with_pagination(repo_id, repo_type="dataset", days_back=None):
     """
     Fetch all commits from a HuggingFace repository using git commands.
@@ -59,19 +153,40 @@ def _fetch_all_commits_with_pagination(repo_id, repo_type="dataset", days_back=N
         try:
             logging.info(f"Fetching commit history via git (this may take a moment)...")
 
-            # Do a shallow clone with no files, just git history
+            # Clone with no files, just git history
             # Use --filter=blob:none to avoid downloading file contents
-            subprocess.run(
-                ["git", "clone", "--filter=blob:none", "--no-checkout", git_url, tmpdir],
-                check=True,
-                capture_output=True,
-                text=True
-            )
+            clone_cmd = [
+                "git", "-c", "protocol.version=2", "clone",
+                "--filter=blob:none", "--no-checkout", "--no-tags"
+            ]
+            clone_dir = None
+            if cutoff_date:
+                # Only fetch the commits since the cutoff, not the whole history
+                try:
+                    shallow_dir = os.path.join(tmpdir, "shallow")
+                    subprocess.run(
+                        clone_cmd + [f"--shallow-since={cutoff_date.strftime('%Y-%m-%d')}", git_url, shallow_dir],
+                        check=True,
+                        capture_output=True,
+                        text=True
+                    )
+                    clone_dir = shallow_dir
+                except subprocess.CalledProcessError as e:
+                    logging.warning(f"Shallow clone failed, cloning full history: {e.stderr}")
+
+            if clone_dir is None:
+                clone_dir = os.path.join(tmpdir, "full")
+                subprocess.run(
+                    clone_cmd + [git_url, clone_dir],
+                    check=True,
+                    capture_output=True,
+                    text=True
+                )
 
             # Get commit log with specific format
             # Format: commit_hash|author_date|subject|body
             git_log_cmd = [
-                "git", "-C", tmpdir, "log",
+                "git", "-C", clone_dir, "log",
                 "--pretty=format:%H|%aI|%s|%b",
                 "--date=iso-strict"
             ]
@@ -161,8 +276,8 @@ def download_models_data(output_dir):
         # Copy to our raw data directory
         output_path = output_dir / filename
 
-        # Read and write to move from cache to our directory
-        shutil.copy(cached_file_path, output_path)
+        # Link (or copy) from the cache to our directory
+        _save_cached_file(cached_file_path, output_path)
 
         logging.info(f"Successfully downloaded {filename} to {output_path}")
         logging.info(f"File size: {output_path.stat().st_size / (1024*1024):.2f} MB")
@@ -174,6 +289,92 @@ def download_models_data(output_dir):
         raise
 
 
+def _resolve_commit_version(commit, api, repo_id, historical_dir, hash_cache):
+    """
+    Find the models file of one commit and its hash, without downloading it.
+
+    The hash of a file stored in LFS comes with the file metadata, so unchanged
+    versions can be skipped before any bytes are transferred.
+
+    Args:
+        commit: Commit with commit_id and created_at
+        api: HfApi instance
+        repo_id: Repository ID (e.g., "cfahlgren1/hub-stats")
+        historical_dir: Directory historical files are saved to
+        hash_cache: Saved hashes of the historical files (read only)
+
+    Returns:
+        Tuple of (status, output_path, file_hash, source_filename), where status is
+        "existing" (already saved), "remote" (to download; file_hash is None if the
+        hub doesn't report it) or "missing" (no models file)
+    """
+    try:
+        commit_sha = commit.commit_id
+        commit_date = commit.created_at
+
+        # Format date as YYYYMMDD
+        date_str = commit_date.strftime("%Y%m%d")
+        short_sha = commit_sha[:7]
+
+        # Already downloaded (either format)
+        for file_format in ["parquet", "csv"]:
+            output_path = historical_dir / f"models-{date_str}-{short_sha}.{file_format}"
+            if output_path.exists():
+                return "existing", output_path, _existing_file_hash(output_path, hash_cache), None
+
+        # One metadata call for both formats; paths missing at this commit are omitted
+        paths_info = api.get_paths_info(
+            repo_id=repo_id,
+            paths=["models.parquet", "models.csv"],
+            revision=commit_sha,
+            repo_type="dataset"
+        )
+        files = {info.path: info for info in paths_info}
+
+        # Prefer parquet (more recent format); the repo switched from CSV to
+        # Parquet at some point
+        for file_format in ["parquet", "csv"]:
+            source_filename = f"models.{file_format}"
+            if source_filename in files:
+                lfs = getattr(files[source_filename], "lfs", None)
+                output_path = historical_dir / f"models-{date_str}-{short_sha}.{file_format}"
+                return "remote", output_path, lfs.sha256 if lfs else None, source_filename
+
+        logging.debug(f"Skipping commit {short_sha} (neither models.csv nor models.parquet found)")
+
+    except Exception as e:
+        # Unexpected error
+        logging.debug(f"Skipping commit {commit.commit_id[:7]}: {str(e)}")
+
+    return "missing", None, None, None
+
+
+def _download_version(repo_id, commit_sha, source_filename, file_hash):
+    """
+    Download the models file of one commit, hashing it if its hash isn't known.
+
+    Args:
+        repo_id: Repository ID (e.g., "cfahlgren1/hub-stats")
+        commit_sha: Commit to download the file at
+        source_filename: File name in the repository
+        file_hash: SHA256 reported by the hub, or None
+
+    Returns:
+        Tuple of (cached_file_path, file_hash), or (None, None) if the download failed
+    """
+    try:
+        cached_file_path = hf_hub_download(
+            repo_id=repo_id,
+            filename=source_filename,
+            repo_type="dataset",
+            revision=commit_sha
+        )
+        return cached_file_path, file_hash or _compute_file_hash(cached_file_path)
+    except Exception as e:
+        logging.debug(f"Error with {source_filename} at {commit_sha[:7]}: {str(e)}")
+        return None, None
+
+
 def download_historical_models_data(output_dir, days_back=None):
     """
     Download all historical versions of model data from HuggingFace hub-stats dataset.
@@ -241,85 +442,83 @@ def download_historical_models_data(output_dir, days_back=None):
         # Track seen file hashes to detect duplicates
         seen_hashes = set()
 
-        # Download each version with progress bar and time estimate
-        for commit in tqdm(relevant_commits, desc="Downloading historical versions", unit="commit"):
-            try:
-                commit_sha = commit.commit_id
-                commit_date = commit.created_at
-
-                # Format date as YYYYMMDD
-                date_str = commit_date.strftime("%Y%m%d")
-                short_sha = commit_sha[:7]
-
-                # Try to determine which file format exists (CSV or Parquet)
-                # The repo switched from CSV to Parquet at some point
-                file_downloaded = False
-
-                # Try parquet first (more recent format)
-                for file_format in ["parquet", "csv"]:
-                    try:
-                        source_filename = f"models.{file_format}"
-                        output_filename = f"models-{date_str}-{short_sha}.{file_format}"
-                        output_path = historical_dir / output_filename
-
-                        # Skip if already downloaded
-                        if output_path.exists():
-                            # Still need to track its hash to avoid duplicates
-                            file_hash = _compute_file_hash(output_path)
-                            seen_hashes.add(file_hash)
-                            logging.debug(f"Skipping {output_filename} (already exists)")
-                            skipped_existing += 1
-                            file_downloaded = True
-                            break
-
-                        # Download the file at this specific commit
-                        cached_file_path = hf_hub_download(
-                            repo_id=repo_id,
-                            filename=source_filename,
-                            repo_type="dataset",
-                            revision=commit_sha
-                        )
-
-                        # Compute hash to check if file changed
-                        file_hash = _compute_file_hash(cached_file_path)
-
-                        # Skip if we've already seen this exact file content
-                        if file_hash in seen_hashes:
-                            logging.debug(f"Skipping commit {short_sha} (no file changes)")
-                            skipped_no_change += 1
-                            file_downloaded = True
-                            break
-
-                        # This is a new version - save it
-                        seen_hashes.add(file_hash)
-                        shutil.copy(cached_file_path, output_path)
-
-                        downloaded_files.append(output_path)
-                        successful_downloads += 1
-
-                        logging.debug(f"Downloaded {output_filename}")
-                        file_downloaded = True
-                        break
-
-                    except Exception as e:
-                        # Try the other format
-                        error_msg = str(e)
-                        if "404" in error_msg or "not found" in error_msg.lower():
-                            continue  # Try next format
-                        else:
-                            logging.debug(f"Error with {source_filename}: {error_msg}")
-                            continue
-
-                if not file_downloaded:
-                    logging.debug(f"Skipping commit {short_sha} (neither models.csv nor models.parquet found)")
+        # Hashes of files saved by earlier runs, so unchanged files aren't re-read;
+        # rebuilt below with an entry per file seen or saved in this run
+        hash_cache = _load_hash_cache(historical_dir)
+        updated_hash_cache = {}
+
+        # Metadata lookups and downloads run concurrently, but versions are deduplicated
+        # in one pass in commit order at the end, so the same version is kept as in a
+        # serial run even when only some versions have a hub-reported hash
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            # Find each commit's file and hash. A version whose hash matches an earlier
+            # version's known hash is a duplicate whatever else happens, so it is
+            # skipped before downloading; versions without a hash are always downloaded
+            versions = []
+            to_download = []
+            known_hashes = set()
+            results = executor.map(
+                lambda commit: _resolve_commit_version(commit, api, repo_id, historical_dir, hash_cache),
+                relevant_commits
+            )
+            for commit, (status, output_path, file_hash, source_filename) in zip(
+                relevant_commits,
+                tqdm(results, total=len(relevant_commits), desc="Checking historical versions", unit="commit")
+            ):
+                if status == "missing":
                     skipped_no_file += 1
+                    continue
+                if status == "remote":
+                    if file_hash in known_hashes:
+                        logging.debug(f"Skipping {output_path.name} (no file changes)")
+                        skipped_no_change += 1
+                        continue
+                    to_download.append((commit.commit_id, source_filename, file_hash, len(versions)))
+                if file_hash:
+                    known_hashes.add(file_hash)
+                versions.append([status, output_path, file_hash, None])
+
+            results = executor.map(
+                lambda item: _download_version(repo_id, item[0], item[1], item[2]),
+                to_download
+            )
+            for (_, _, _, index), (cached_file_path, file_hash) in zip(
+                to_download,
+                tqdm(results, total=len(to_download), desc="Downloading historical versions", unit="file")
+            ):
+                versions[index][2:] = [file_hash, cached_file_path]
+
+        # Keep the first version of each file content, in commit order
+        for status, output_path, file_hash, cached_file_path in versions:
+            if status == "existing":
+                # Still need to track its hash to avoid duplicates
+                seen_hashes.add(file_hash)
+                updated_hash_cache[output_path.name] = _hash_cache_entry(output_path, file_hash)
+                logging.debug(f"Skipping {output_path.name} (already exists)")
+                skipped_existing += 1
+                continue
 
-            except Exception as e:
-                # Unexpected error
-                logging.debug(f"Skipping commit {commit.commit_id[:7]}: {str(e)}")
+            if cached_file_path is None:
                 skipped_no_file += 1
                 continue
 
+            # Skip if we've already seen this exact file content
+            if file_hash in seen_hashes:
+                logging.debug(f"Skipping {output_path.name} (no file changes)")
+                skipped_no_change += 1
+                continue
+            seen_hashes.add(file_hash)
+
+            # This is a new version - save it
+            _save_cached_file(cached_file_path, output_path)
+            updated_hash_cache[output_path.name] = _hash_cache_entry(output_path, file_hash)
+
+            downloaded_files.append(output_path)
+            successful_downloads += 1
+            logging.debug(f"Downloaded {output_path.name}")
+
+        _save_hash_cache(historical_dir, updated_hash_cache)
+
         logging.info(f"Successfully downloaded {successful_downloads} new historical versions")
         logging.info(f"Skipped {skipped_existing} existing files")
         logging.info(f"Skipped {skipped_no_change} commits (no file changes)")
@@ -2,33 +2,50 @@
 Stage A: Data Cleaning and Filtering
 Reads raw CSV data and performs basic cleaning operations.
 """
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 import logging
 
+# status is read dictionary-encoded, so the filter compares int32 codes, not strings
+STATUS_TYPE = pa.dictionary(pa.int32(), pa.string())
+
 
 def process_data(input_path, output_path):
     """
     Process raw data: filter active records and calculate metrics.
 
+    Reading, filtering, the computed column and writing all run as Arrow kernels,
+    without a pandas DataFrame or an intermediate copy of the filtered rows.
+
     Args:
         input_path: Path to raw CSV file
         output_path: Path to save cleaned CSV file
+
+    Returns:
+        Arrow table of the cleaned records
     """
     logging.info(f"Stage A: Reading data from {input_path}")
 
-    # Read raw data
-    df = pd.read_csv(input_path)
-    logging.info(f"Loaded {len(df)} records")
+    # Read raw data (empty fields are missing values, as in pandas)
+    table = pa_csv.read_csv(
+        input_path,
+        convert_options=pa_csv.ConvertOptions(
+            column_types={'status': STATUS_TYPE},
+            strings_can_be_null=True
+        )
+    )
+    logging.info(f"Loaded {table.num_rows} records")
 
     # Filter for active status only
-    df_clean = df[df['status'] == 'active'].copy()
-    logging.info(f"Filtered to {len(df_clean)} active records")
+    table = table.filter(pc.equal(table['status'], 'active'))
+    logging.info(f"Filtered to {table.num_rows} active records")
 
     # Add computed column
-    df_clean['value_doubled'] = df_clean['value'] * 2
+    table = table.append_column('value_doubled', pc.multiply(table['value'], 2))
 
     # Save cleaned data
-    df_clean.to_csv(output_path, index=False)
+    pa_csv.write_csv(table, output_path)
     logging.info(f"Stage A: Saved cleaned data to {output_path}")
 
-    return df_clean
+    return table